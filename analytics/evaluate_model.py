@@ -2,8 +2,9 @@
 import matplotlib.pyplot as plt
 import pandas as pd
 import os
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import sys
+import json
+import argparse
 from sklearn.metrics import (
     accuracy_score,
     precision_recall_fscore_support,
@@ -12,6 +13,19 @@ from sklearn.metrics import (
 import seaborn as sns
 import numpy as np
 
+# Add src to the path so we can import the calibration and inference helpers
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(current_dir), "src"))
+
+from batch_inference import load_classifier, predict_logits, summarize_logits
+from calibration import (
+    DEFAULT_THRESHOLD,
+    Calibration,
+    expected_calibration_error,
+    negative_log_likelihood,
+    softmax,
+)
+
 
 def load_data():
     """Load train and test datasets"""
@@ -20,47 +34,23 @@ def load_data():
     return train_df, test_df
 
 
-def evaluate_model(model_path, test_df):
+def evaluate_model(model_path, test_df, batch_size=32, num_workers=0):
     """Evaluate model on test data"""
     # Load model and tokenizer
-    tokenizer = AutoTokenizer.from_pretrained(model_path)
-    model = AutoModelForSequenceClassification.from_pretrained(model_path)
-
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model.to(device)
-
-    # Setup outputs
-    y_true = []
-    y_pred = []
-    confidences = []
-
-    # Generate predictions
-    model.eval()
-    with torch.no_grad():
-        for idx, row in test_df.iterrows():
-            # Tokenize
-            inputs = tokenizer(
-                row["query"],
-                return_tensors="pt",
-                padding="max_length",
-                truncation=True,
-                max_length=128,
-            ).to(device)
-
-            # Predict
-            outputs = model(**inputs)
-            probs = torch.softmax(outputs.logits, dim=1)
-            pred_class = torch.argmax(probs, dim=1).item()
-            confidence = probs[0][pred_class].item()
-
-            # Store
-            y_true.append(row["label"])
-            y_pred.append(pred_class)
-            confidences.append(confidence)
-
-            # Show progress
-            if (idx + 1) % 50 == 0:
-                print(f"Evaluated {idx+1}/{len(test_df)} examples")
+    tokenizer, model, device = load_classifier(model_path)
+
+    # Generate predictions in dynamically padded batches
+    logits = predict_logits(
+        model,
+        tokenizer,
+        test_df["query"].tolist(),
+        batch_size=batch_size,
+        num_workers=num_workers,
+        device=device,
+        progress_every=50,
+    )
+    y_pred, confidences, _ = summarize_logits(logits)
+    y_true = test_df["label"].to_numpy()
 
     # Calculate metrics
     accuracy = accuracy_score(y_true, y_pred)
@@ -74,7 +64,66 @@ def evaluate_model(model_path, test_df):
     for metric, value in metrics.items():
         print(f"{metric}: {value:.4f}")
 
-    return y_true, y_pred, confidences, metrics
+    return y_true, y_pred, confidences, metrics, logits
+
+
+def evaluate_calibration(logits, y_true, calibration):
+    """
+    Expected calibration error, NLL and keyword-fallback rate of the raw
+    softmax (with the old fixed 0.5 threshold) against the calibrated one.
+    """
+    y_true = np.asarray(y_true)
+    results = {"temperature": calibration.temperature}
+    reliability = {}
+    for name, temperature in [("raw", 1.0), ("calibrated", calibration.temperature)]:
+        probabilities = softmax(logits, temperature)
+        predictions = probabilities.argmax(axis=1)
+        confidences = probabilities.max(axis=1)
+        correct = predictions == y_true
+        ece, bins = expected_calibration_error(confidences, correct)
+
+        if name == "raw":
+            thresholds = np.full(len(predictions), DEFAULT_THRESHOLD)
+        else:
+            thresholds = np.array([calibration.threshold(p) for p in predictions])
+        accepted = confidences >= thresholds
+
+        results[f"ece_{name}"] = ece
+        results[f"nll_{name}"] = negative_log_likelihood(logits, y_true, temperature)
+        results[f"fallback_rate_{name}"] = float(1 - accepted.mean())
+        results[f"accepted_accuracy_{name}"] = (
+            float(correct[accepted].mean()) if accepted.any() else None
+        )
+        reliability[name] = bins
+
+    print("\nCalibration Results:")
+    for metric, value in results.items():
+        print(f"{metric}: {value:.4f}" if value is not None else f"{metric}: n/a")
+    return results, reliability
+
+
+def plot_reliability(
+    reliability, output_file="analytics/graphs/reliability_diagram.png"
+):
+    """Accuracy against confidence per bin, before and after calibration"""
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    plt.figure(figsize=(8, 8))
+    plt.plot([0, 1], [0, 1], "k--", label="Perfectly calibrated")
+    for name, bins in reliability.items():
+        plt.plot(
+            [b["confidence"] for b in bins],
+            [b["accuracy"] for b in bins],
+            marker="o",
+            label=name,
+        )
+    plt.title("Reliability Diagram")
+    plt.xlabel("Confidence")
+    plt.ylabel("Accuracy")
+    plt.legend()
+    plt.grid(True, linestyle="--", alpha=0.7)
+    plt.tight_layout()
+    plt.savefig(output_file)
+    plt.close()
 
 
 def visualize_results(train_df, test_df, y_true, y_pred, confidences, metrics):
@@ -139,6 +188,26 @@ def visualize_results(train_df, test_df, y_true, y_pred, confidences, metrics):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the intent classifier")
+    parser.add_argument("--model-path", default="./fine-tuned-model")
+    parser.add_argument(
+        "--calibrate",
+        action="store_true",
+        help="Fit temperature and per-intent thresholds on the test set and "
+        "save them to MODEL_PATH/calibration.json",
+    )
+    parser.add_argument(
+        "--target-precision",
+        type=float,
+        default=0.9,
+        help="Precision each intent must reach above its fallback threshold",
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument(
+        "--num-workers", type=int, default=0, help="DataLoader tokenization workers"
+    )
+    args = parser.parse_args()
+
     print("Starting model evaluation...")
 
     # Load data
@@ -146,7 +215,24 @@ if __name__ == "__main__":
     print(f"Loaded {len(train_df)} training examples and {len(test_df)} test examples")
 
     # Evaluate model
-    y_true, y_pred, confidences, metrics = evaluate_model("./fine-tuned-model", test_df)
+    y_true, y_pred, confidences, metrics, logits = evaluate_model(
+        args.model_path, test_df, args.batch_size, args.num_workers
+    )
 
     # Visualize results
     visualize_results(train_df, test_df, y_true, y_pred, confidences, metrics)
+
+    # Calibration: the saved one, or a new fit on the held-out test set
+    if args.calibrate:
+        calibration = Calibration.fit(
+            logits, y_true, target_precision=args.target_precision
+        )
+        print(f"Calibration saved to {calibration.save(args.model_path)}")
+    else:
+        calibration = Calibration.load(args.model_path)
+    calibration_results, reliability = evaluate_calibration(
+        logits, y_true, calibration
+    )
+    plot_reliability(reliability)
+    with open("analytics/graphs/calibration_metrics.json", "w") as f:
+        json.dump(calibration_results, f, indent=2)
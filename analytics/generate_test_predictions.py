@@ -1,64 +1,45 @@
 # analytics/generate_test_predictions.py
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import pandas as pd
-import numpy as np
 import os
+import sys
+import argparse
 
+# Add src to the path so we can import the shared inference helpers
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(current_dir), "src"))
 
-def generate_test_predictions(model_path, test_file, output_file):
+from batch_inference import load_classifier, predict_logits, summarize_logits
+
+
+def generate_test_predictions(
+    model_path, test_file, output_file, batch_size=32, num_workers=0
+):
     """Generate predictions for test dataset and save results"""
     print(f"Generating predictions using model from {model_path}")
 
     # Load model and tokenizer
-    tokenizer = AutoTokenizer.from_pretrained(model_path)
-    model = AutoModelForSequenceClassification.from_pretrained(model_path)
-
-    # Set device
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model.to(device)
+    tokenizer, model, device = load_classifier(model_path)
 
     # Load test data
     test_df = pd.read_csv(test_file)
 
-    # Initialize lists for results
-    true_labels = []
-    predicted_labels = []
-    confidence_scores = []
-
-    # Generate predictions
-    model.eval()
-    with torch.no_grad():
-        for idx, row in test_df.iterrows():
-            # Prepare input
-            inputs = tokenizer(
-                row["query"],
-                return_tensors="pt",
-                padding="max_length",
-                truncation=True,
-                max_length=128,
-            ).to(device)
-
-            # Get prediction
-            outputs = model(**inputs)
-            predictions = torch.softmax(outputs.logits, dim=1)
-            predicted_label = torch.argmax(predictions, dim=1).item()
-            confidence = predictions[0][predicted_label].item()
-
-            # Store results
-            true_labels.append(row["label"])
-            predicted_labels.append(predicted_label)
-            confidence_scores.append(confidence)
-
-            # Print progress
-            if (idx + 1) % 100 == 0:
-                print(f"Processed {idx + 1}/{len(test_df)} examples")
+    # Generate predictions in dynamically padded batches
+    logits = predict_logits(
+        model,
+        tokenizer,
+        test_df["query"].tolist(),
+        batch_size=batch_size,
+        num_workers=num_workers,
+        device=device,
+        progress_every=100,
+    )
+    predicted_labels, confidence_scores, _ = summarize_logits(logits)
 
     # Create results dataframe
     results_df = pd.DataFrame(
         {
             "query": test_df["query"],
-            "true_label": true_labels,
+            "true_label": test_df["label"],
             "predicted_label": predicted_labels,
             "confidence": confidence_scores,
         }
@@ -77,10 +58,21 @@ def generate_test_predictions(model_path, test_file, output_file):
 
 
 if __name__ == "__main__":
-    # Paths
-    model_path = "./fine-tuned-model"
-    test_file = "data/processed/test_dataset.csv"
-    output_file = "results/test_predictions.csv"
+    parser = argparse.ArgumentParser(description="Predict intents for a test set")
+    parser.add_argument("--model-path", default="./fine-tuned-model")
+    parser.add_argument("--test-file", default="data/processed/test_dataset.csv")
+    parser.add_argument("--output-file", default="results/test_predictions.csv")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument(
+        "--num-workers", type=int, default=0, help="DataLoader tokenization workers"
+    )
+    args = parser.parse_args()
 
     # Generate predictions
-    predictions_df = generate_test_predictions(model_path, test_file, output_file)
+    predictions_df = generate_test_predictions(
+        args.model_path,
+        args.test_file,
+        args.output_file,
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
+    )
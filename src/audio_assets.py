@@ -0,0 +1,261 @@
+# src/audio_assets.py
+import os
+import json
+import wave
+import hashlib
+import logging
+import threading
+import numpy as np
+
+DEFAULT_CACHE_DIR = "audio_cache"
+INDEX_FILE = "index.json"
+FRAME_SECONDS = 0.02
+
+logger = logging.getLogger(__name__)
+
+
+def _decode_wav(path):
+    """Decode a PCM WAV file to mono float32 samples in [-1, 1]"""
+    with wave.open(path, "rb") as wav_file:
+        channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        sample_rate = wav_file.getframerate()
+        frames = wav_file.readframes(wav_file.getnframes())
+
+    if sample_width == 1:
+        samples = np.frombuffer(frames, dtype=np.uint8).astype(np.float32)
+        samples = (samples - 128) / 128
+    elif sample_width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768
+    elif sample_width == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((len(raw), 4), dtype=np.uint8)
+        padded[:, 1:] = raw
+        samples = padded.view("<i4").ravel().astype(np.float32) / 2**31
+    elif sample_width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2**31
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+def _decode_with_pydub(path):
+    """Fallback for compressed or unusual files; needs pydub and ffmpeg"""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(path).set_channels(1)
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
+    return samples / float(1 << (8 * audio.sample_width - 1)), audio.frame_rate
+
+
+def _resample(samples, source_rate, target_rate):
+    if source_rate == target_rate:
+        return samples
+    try:
+        from scipy.signal import resample_poly
+
+        divisor = np.gcd(source_rate, target_rate)
+        resampled = resample_poly(
+            samples, target_rate // divisor, source_rate // divisor
+        )
+    except ImportError:
+        duration = len(samples) / source_rate
+        target_times = np.arange(int(duration * target_rate)) / target_rate
+        source_times = np.arange(len(samples)) / source_rate
+        resampled = np.interp(target_times, source_times, samples)
+    return resampled.astype(np.float32)
+
+
+class AudioAsset:
+    """Decoded audio of one file plus the measurements the tests use"""
+
+    def __init__(self, path, content_hash, samples, sample_rate):
+        self.path = path
+        self.content_hash = content_hash
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self._resampled = {}
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self):
+        return len(self.samples) / float(self.sample_rate)
+
+    def frame_power(self, frame_seconds=FRAME_SECONDS):
+        """Mean power of consecutive frames; a partial last frame is dropped"""
+        samples = np.asarray(self.samples, dtype=np.float64)
+        if len(samples) == 0:
+            return np.zeros(1)
+        frame_length = min(max(int(self.sample_rate * frame_seconds), 1), len(samples))
+        frame_count = len(samples) // frame_length
+        frames = samples[: frame_count * frame_length].reshape(frame_count, -1)
+        return np.square(frames).mean(axis=1)
+
+    def rms(self):
+        if len(self.samples) == 0:
+            return 0.0
+        return float(np.sqrt(np.mean(np.square(self.samples, dtype=np.float64))))
+
+    def rms_dbfs(self):
+        rms = self.rms()
+        return 20 * np.log10(rms) if rms > 0 else float("-inf")
+
+    def snr_db(self):
+        """
+        Estimated signal-to-noise ratio. The quietest 10% of frames are taken
+        as the noise floor and the loudest half as speech.
+        """
+        power = np.sort(self.frame_power())
+        noise = power[: max(len(power) // 10, 1)].mean()
+        speech = power[len(power) // 2 :].mean()
+        if noise <= 0:
+            return float("inf")
+        return float(10 * np.log10(max(speech - noise, 1e-12) / noise))
+
+    def resampled(self, target_rate):
+        """Samples at another rate; computed once per rate"""
+        with self._lock:
+            if target_rate not in self._resampled:
+                self._resampled[target_rate] = _resample(
+                    np.asarray(self.samples), self.sample_rate, target_rate
+                )
+            return self._resampled[target_rate]
+
+
+class AudioAssetManager:
+    """
+    Decodes each audio file once and shares the result.
+
+    Decoded samples are stored in `cache_dir` as .npy files named by the
+    SHA-256 of the file contents and memory-mapped on later loads, so
+    re-running a test or metadata update does not decode anything again.
+    A small index of (size, mtime) per path avoids re-hashing unchanged files.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._assets = {}
+        self._lock = threading.Lock()
+        self._index = {}
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "decodes": 0}
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            try:
+                with open(os.path.join(cache_dir, INDEX_FILE)) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+
+    def content_hash(self, path):
+        """SHA-256 of the file, reused while its size and mtime are unchanged"""
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        key = os.path.abspath(path)
+
+        with self._lock:
+            entry = self._index.get(key)
+            if entry and entry["signature"] == signature:
+                return entry["hash"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        content_hash = digest.hexdigest()
+
+        with self._lock:
+            self._index[key] = {"signature": signature, "hash": content_hash}
+        return content_hash
+
+    def load(self, path):
+        """AudioAsset for a file, decoding it only if it is not cached"""
+        content_hash = self.content_hash(path)
+
+        with self._lock:
+            asset = self._assets.get(content_hash)
+            if asset is not None:
+                self.stats["memory_hits"] += 1
+                return asset
+
+        asset = self._load_from_disk(path, content_hash)
+        if asset is None:
+            asset = self._decode(path, content_hash)
+
+        with self._lock:
+            self._assets[content_hash] = asset
+        return asset
+
+    def _cache_paths(self, content_hash):
+        base = os.path.join(self.cache_dir, content_hash)
+        return f"{base}.npy", f"{base}.json"
+
+    def _load_from_disk(self, path, content_hash):
+        if not self.cache_dir:
+            return None
+        samples_path, info_path = self._cache_paths(content_hash)
+        try:
+            with open(info_path) as f:
+                info = json.load(f)
+            samples = np.load(samples_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self.stats["disk_hits"] += 1
+        return AudioAsset(path, content_hash, samples, info["sample_rate"])
+
+    def _decode(self, path, content_hash):
+        try:
+            samples, sample_rate = _decode_wav(path)
+        except (wave.Error, ValueError, EOFError):
+            samples, sample_rate = _decode_with_pydub(path)
+
+        with self._lock:
+            self.stats["decodes"] += 1
+
+        if self.cache_dir:
+            samples_path, info_path = self._cache_paths(content_hash)
+            tmp_path = f"{samples_path}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    np.save(f, samples)
+                os.replace(tmp_path, samples_path)
+                with open(info_path, "w") as f:
+                    json.dump({"sample_rate": sample_rate, "source": path}, f)
+                samples = np.load(samples_path, mmap_mode="r")
+            except OSError as e:
+                logger.warning("Error writing audio cache for %s: %s", path, e)
+
+        return AudioAsset(path, content_hash, samples, sample_rate)
+
+    def duration(self, path):
+        return self.load(path).duration
+
+    def save_index(self):
+        """Persist the path -> content hash index for the next run"""
+        if not self.cache_dir:
+            return
+        with self._lock:
+            index = dict(self._index)
+        index_path = os.path.join(self.cache_dir, INDEX_FILE)
+        tmp_path = f"{index_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+
+
+_default_manager = None
+_default_lock = threading.Lock()
+
+
+def get_audio_manager(cache_dir=DEFAULT_CACHE_DIR):
+    """Process-wide AudioAssetManager shared by tests and metadata updaters"""
+    global _default_manager
+    with _default_lock:
+        if _default_manager is None:
+            _default_manager = AudioAssetManager(cache_dir)
+        return _default_manager
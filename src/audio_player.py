@@ -0,0 +1,100 @@
+# src/audio_player.py
+import io
+import os
+import sys
+import tempfile
+import threading
+import wave
+
+
+class AudioPlayer:
+    """
+    Plays WAV bytes on the local speakers.
+
+    Uses winsound on Windows and simpleaudio elsewhere when it is installed.
+    If neither is available `available` is False and callers should fall
+    back to playing through the speech synthesizer.
+    """
+
+    def __init__(self):
+        self._backend = None
+        self._play_obj = None
+        # One stop event per clip, replaced when play() is entered so a stop()
+        # issued while the clip is still being set up is not lost
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+        if sys.platform == "win32":
+            import winsound
+
+            self._backend = "winsound"
+            self._winsound = winsound
+        else:
+            try:
+                import simpleaudio
+
+                self._backend = "simpleaudio"
+                self._simpleaudio = simpleaudio
+            except ImportError:
+                self._backend = None
+
+    @property
+    def available(self):
+        return self._backend is not None
+
+    def play(self, audio_data):
+        """Play WAV bytes and block until playback ends or stop() is called"""
+        stopped = threading.Event()
+        with self._lock:
+            self._stopped = stopped
+
+        if self._backend == "winsound":
+            self._play_winsound(audio_data, stopped)
+        elif self._backend == "simpleaudio":
+            with wave.open(io.BytesIO(audio_data), "rb") as wav_file:
+                frames = wav_file.readframes(wav_file.getnframes())
+                with self._lock:
+                    if stopped.is_set():
+                        return
+                    self._play_obj = play_obj = self._simpleaudio.play_buffer(
+                        frames,
+                        wav_file.getnchannels(),
+                        wav_file.getsampwidth(),
+                        wav_file.getframerate(),
+                    )
+            play_obj.wait_done()
+            with self._lock:
+                self._play_obj = None
+        else:
+            raise RuntimeError("No audio playback backend available")
+
+    def _play_winsound(self, audio_data, stopped):
+        # A synchronous SND_MEMORY clip cannot be interrupted and winsound
+        # rejects SND_MEMORY | SND_ASYNC, so play a temporary file
+        # asynchronously and wait out its length here instead.
+        with wave.open(io.BytesIO(audio_data), "rb") as wav_file:
+            seconds = wav_file.getnframes() / wav_file.getframerate()
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio_data)
+            with self._lock:
+                if stopped.is_set():
+                    return
+                self._winsound.PlaySound(
+                    path, self._winsound.SND_FILENAME | self._winsound.SND_ASYNC
+                )
+            stopped.wait(seconds)
+        finally:
+            self._winsound.PlaySound(None, 0)
+            os.remove(path)
+
+    def stop(self):
+        """Stop the clip that is playing or about to start"""
+        with self._lock:
+            self._stopped.set()
+            play_obj = self._play_obj
+        if self._backend == "winsound":
+            self._winsound.PlaySound(None, 0)
+        elif play_obj is not None:
+            play_obj.stop()
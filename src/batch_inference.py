@@ -0,0 +1,130 @@
+# src/batch_inference.py
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from calibration import softmax
+
+
+class TextDataset(Dataset):
+    """Texts with their original position, so sorted batches can be put back"""
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __getitem__(self, index):
+        return index, self.texts[index]
+
+
+class DynamicPaddingCollator:
+    """Tokenizes a batch and pads it to its longest text, not to max_length"""
+
+    def __init__(self, tokenizer, max_length=128):
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+
+    def __call__(self, batch):
+        indices, texts = zip(*batch)
+        encoding = self.tokenizer(
+            list(texts),
+            add_special_tokens=True,
+            max_length=self.max_length,
+            padding=True,
+            truncation=True,
+            return_tensors="pt",
+        )
+        return list(indices), encoding
+
+
+def load_classifier(model_path, device=None):
+    """
+    Tokenizer and model in eval mode on `device` (CUDA when available).
+    Joint intent + slot models are loaded as such; their "logits" are the
+    intent logits.
+    """
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+    from joint_model import JointIntentSlotModel, is_joint_model
+
+    if device is None:
+        device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    if is_joint_model(model_path):
+        model = JointIntentSlotModel.from_pretrained(model_path)
+    else:
+        model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.to(device)
+    model.eval()
+    return tokenizer, model, device
+
+
+def predict_logits(
+    model,
+    tokenizer,
+    texts,
+    batch_size=32,
+    num_workers=0,
+    max_length=128,
+    sort_by_length=True,
+    device=None,
+    progress_every=None,
+):
+    """
+    Intent logits for every text, in the order of `texts`.
+
+    Texts are grouped by length before batching (sort_by_length) so each
+    batch carries little padding; tokenization runs in the DataLoader, in
+    `num_workers` worker processes if set.
+
+    Returns:
+        np.ndarray: (len(texts), num_labels) logits
+    """
+    if device is None:
+        device = next(model.parameters()).device
+    dataset = TextDataset(texts)
+    order = list(range(len(dataset)))
+    if sort_by_length:
+        order.sort(key=lambda i: len(dataset.texts[i]))
+    loader = DataLoader(
+        torch.utils.data.Subset(dataset, order),
+        batch_size=batch_size,
+        shuffle=False,
+        num_workers=num_workers,
+        collate_fn=DynamicPaddingCollator(tokenizer, max_length),
+        pin_memory=device.type == "cuda",
+    )
+
+    logits = None
+    done = 0
+    with torch.no_grad():
+        for indices, encoding in loader:
+            encoding = encoding.to(device)
+            batch_logits = model(**encoding)["logits"].float().cpu().numpy()
+            if logits is None:
+                logits = np.empty((len(dataset), batch_logits.shape[1]), np.float32)
+            logits[indices] = batch_logits
+
+            done += len(indices)
+            if progress_every and (
+                done // progress_every > (done - len(indices)) // progress_every
+            ):
+                print(f"Evaluated {done}/{len(dataset)} examples")
+
+    if logits is None:
+        return np.empty((0, 0), np.float32)
+    return logits
+
+
+def summarize_logits(logits, temperature=1.0):
+    """
+    Vectorized predictions and confidences.
+
+    Returns:
+        tuple: (predictions, confidences, probabilities) as numpy arrays
+    """
+    probabilities = softmax(logits, temperature)
+    predictions = probabilities.argmax(axis=1)
+    confidences = probabilities[np.arange(len(predictions)), predictions]
+    return predictions, confidences, probabilities
@@ -0,0 +1,216 @@
+# src/benchmark.py
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+import subprocess
+import contextlib
+from datetime import datetime
+
+DEFAULT_RESULTS_DIR = os.path.join("test_results", "benchmarks")
+BASELINE_FILE = "baseline.json"
+
+
+class Benchmark:
+    """One named, timed operation; `setup` builds the state passed to `func`"""
+
+    def __init__(
+        self, name, func, group="default", setup=None, requires_model=False
+    ):
+        self.name = name
+        self.func = func
+        self.group = group
+        self.setup = setup
+        self.requires_model = requires_model
+
+
+def time_function(func, min_rounds=5, min_time=0.5, round_time=0.02, warmup=1):
+    """
+    Time func() in rounds, asv-style.
+
+    The number of calls per round is calibrated so each round lasts about
+    `round_time` seconds, which keeps timer resolution out of fast
+    benchmarks. At least `min_rounds` rounds and `min_time` seconds are run.
+
+    Returns:
+        dict: Per-call statistics in seconds plus rounds and iterations
+    """
+    for _ in range(warmup):
+        func()
+
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= round_time or iterations >= 1_000_000:
+            break
+        iterations *= 10 if elapsed < round_time / 10 else 2
+
+    samples = [elapsed / iterations]
+    total = elapsed
+    while len(samples) < min_rounds or total < min_time:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed / iterations)
+        total += elapsed
+
+    if len(samples) > 1:
+        quartiles = statistics.quantiles(samples, n=4)
+    else:
+        quartiles = samples * 3
+    return {
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "iqr": quartiles[2] - quartiles[0],
+        "rounds": len(samples),
+        "iterations": iterations,
+    }
+
+
+def machine_info():
+    """Identifies where numbers came from; results only compare on one machine"""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    if "torch" in sys.modules:
+        torch = sys.modules["torch"]
+        info["torch"] = torch.__version__
+        info["torch_threads"] = torch.get_num_threads()
+        info["cuda"] = torch.cuda.is_available()
+    return info
+
+
+def git_commit():
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(benchmarks, context, pattern=None, **timing_options):
+    """
+    Run benchmarks whose name contains `pattern`.
+
+    Args:
+        benchmarks (list): Benchmark objects
+        context (dict): Shared objects for setup functions (e.g. the processor);
+            benchmarks with requires_model are skipped if it has no "processor"
+        pattern (str): Substring filter on benchmark names
+
+    Returns:
+        dict: Run metadata and per-benchmark statistics
+    """
+    results = {}
+    for bench in benchmarks:
+        if pattern and pattern not in bench.name:
+            continue
+        if bench.requires_model and context.get("processor") is None:
+            print(f"Skipping {bench.name} (no model loaded)")
+            continue
+
+        state = bench.setup(context) if bench.setup else None
+        func = (lambda: bench.func(state)) if bench.setup else bench.func
+        # Benchmarked code may print; keep console I/O out of the timings
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            stats = time_function(func, **timing_options)
+        stats["group"] = bench.group
+        results[bench.name] = stats
+        print(
+            f"{bench.name:<40} median {stats['median'] * 1000:10.4f} ms"
+            f"  (iqr {stats['iqr'] * 1000:.4f} ms, {stats['rounds']} rounds)"
+        )
+
+    return {
+        "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+        "commit": git_commit(),
+        "machine": machine_info(),
+        "benchmarks": results,
+    }
+
+
+def save_results(run, results_dir=DEFAULT_RESULTS_DIR, as_baseline=False):
+    """Write the run to results_dir (and to the baseline file if requested)"""
+    os.makedirs(results_dir, exist_ok=True)
+    name = f"benchmark_{run['timestamp']}_{run['commit'] or 'nocommit'}.json"
+    paths = [os.path.join(results_dir, name)]
+    if as_baseline:
+        paths.append(os.path.join(results_dir, BASELINE_FILE))
+    for path in paths:
+        with open(path, "w") as f:
+            json.dump(run, f, indent=2)
+    return paths[0]
+
+
+def load_baseline(results_dir=DEFAULT_RESULTS_DIR, path=None):
+    path = path or os.path.join(results_dir, BASELINE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_to_baseline(run, baseline, threshold=0.10):
+    """
+    Compare medians with a baseline run.
+
+    A benchmark regresses when its median is more than `threshold` slower
+    than the baseline and the slowdown is larger than the noise in both
+    runs (sum of their interquartile ranges).
+
+    Returns:
+        list: Dicts with name, baseline, current, ratio and status
+              ("regression", "improvement", "ok" or "new")
+    """
+    comparisons = []
+    baseline_results = baseline.get("benchmarks", {}) if baseline else {}
+    for name, stats in run["benchmarks"].items():
+        previous = baseline_results.get(name)
+        if previous is None:
+            comparisons.append(
+                {
+                    "name": name,
+                    "baseline": None,
+                    "current": stats["median"],
+                    "ratio": None,
+                    "status": "new",
+                }
+            )
+            continue
+
+        ratio = stats["median"] / previous["median"] if previous["median"] else None
+        noise = stats.get("iqr", 0.0) + previous.get("iqr", 0.0)
+        difference = stats["median"] - previous["median"]
+        if ratio is not None and ratio > 1 + threshold and difference > noise:
+            status = "regression"
+        elif ratio is not None and ratio < 1 - threshold and -difference > noise:
+            status = "improvement"
+        else:
+            status = "ok"
+        comparisons.append(
+            {
+                "name": name,
+                "baseline": previous["median"],
+                "current": stats["median"],
+                "ratio": ratio,
+                "status": status,
+            }
+        )
+    return comparisons
@@ -0,0 +1,166 @@
+# src/calibration.py
+import os
+import json
+import math
+import numpy as np
+
+CALIBRATION_FILE = "calibration.json"
+DEFAULT_THRESHOLD = 0.5
+
+
+def softmax(logits, temperature=1.0):
+    logits = np.asarray(logits, dtype=np.float64) / temperature
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def negative_log_likelihood(logits, labels, temperature=1.0):
+    probabilities = softmax(logits, temperature)
+    picked = probabilities[np.arange(len(labels)), np.asarray(labels)]
+    return float(-np.log(np.clip(picked, 1e-12, None)).mean())
+
+
+def fit_temperature(logits, labels, low=0.05, high=20.0, iterations=60):
+    """
+    Temperature that minimises the negative log likelihood of `labels`.
+
+    The NLL is unimodal in log(temperature), so a golden-section search over
+    [low, high] is enough; no optimiser dependency is needed.
+    """
+    ratio = (math.sqrt(5) - 1) / 2
+    a, b = math.log(low), math.log(high)
+    c = b - ratio * (b - a)
+    d = a + ratio * (b - a)
+    nll_c = negative_log_likelihood(logits, labels, math.exp(c))
+    nll_d = negative_log_likelihood(logits, labels, math.exp(d))
+    for _ in range(iterations):
+        if nll_c < nll_d:
+            b, d, nll_d = d, c, nll_c
+            c = b - ratio * (b - a)
+            nll_c = negative_log_likelihood(logits, labels, math.exp(c))
+        else:
+            a, c, nll_c = c, d, nll_d
+            d = a + ratio * (b - a)
+            nll_d = negative_log_likelihood(logits, labels, math.exp(d))
+    return math.exp((a + b) / 2)
+
+
+def expected_calibration_error(confidences, correct, n_bins=15):
+    """
+    Expected calibration error: the gap between confidence and accuracy,
+    averaged over equal-width confidence bins weighted by their size.
+
+    Returns:
+        tuple: (ece, bins) where bins is a list of dicts with lower, upper,
+               count, confidence and accuracy, for a reliability diagram
+    """
+    confidences = np.asarray(confidences, dtype=np.float64)
+    correct = np.asarray(correct, dtype=np.float64)
+    edges = np.linspace(0.0, 1.0, n_bins + 1)
+    ece = 0.0
+    bins = []
+    for lower, upper in zip(edges[:-1], edges[1:]):
+        in_bin = (confidences > lower) & (confidences <= upper)
+        count = int(in_bin.sum())
+        if count == 0:
+            continue
+        confidence = float(confidences[in_bin].mean())
+        accuracy = float(correct[in_bin].mean())
+        ece += count / len(confidences) * abs(confidence - accuracy)
+        bins.append(
+            {
+                "lower": float(lower),
+                "upper": float(upper),
+                "count": count,
+                "confidence": confidence,
+                "accuracy": accuracy,
+            }
+        )
+    return float(ece), bins
+
+
+def fit_class_thresholds(probabilities, labels, target_precision=0.9, min_support=5):
+    """
+    Per predicted class, the lowest confidence at which predictions of that
+    class are right at least `target_precision` of the time. Predictions
+    below their class's threshold go to the keyword fallback.
+
+    Classes predicted fewer than `min_support` times, or that never reach
+    the target precision, are left out and keep the default threshold.
+    """
+    probabilities = np.asarray(probabilities)
+    labels = np.asarray(labels)
+    predictions = probabilities.argmax(axis=1)
+    confidences = probabilities.max(axis=1)
+
+    thresholds = {}
+    for class_id in np.unique(predictions):
+        mask = predictions == class_id
+        if mask.sum() < min_support:
+            continue
+        order = np.argsort(-confidences[mask])
+        class_confidences = confidences[mask][order]
+        class_correct = (labels[mask] == class_id)[order]
+        # Precision of the top-k most confident predictions, for every k
+        precision = np.cumsum(class_correct) / np.arange(1, len(order) + 1)
+        passing = np.nonzero(precision >= target_precision)[0]
+        if len(passing):
+            thresholds[int(class_id)] = float(class_confidences[passing[-1]])
+    return thresholds
+
+
+class Calibration:
+    """
+    Temperature and fallback thresholds for a classifier, stored as
+    calibration.json next to the model. Without the file the model is used
+    as before: temperature 1 and a 0.5 threshold for every class.
+    """
+
+    def __init__(self, temperature=1.0, thresholds=None, default_threshold=None):
+        self.temperature = temperature
+        self.thresholds = thresholds or {}
+        self.default_threshold = (
+            DEFAULT_THRESHOLD if default_threshold is None else default_threshold
+        )
+
+    def threshold(self, class_id):
+        return self.thresholds.get(class_id, self.default_threshold)
+
+    def probabilities(self, logits):
+        return softmax(logits, self.temperature)
+
+    def to_dict(self):
+        return {
+            "temperature": self.temperature,
+            "default_threshold": self.default_threshold,
+            "thresholds": {str(k): v for k, v in sorted(self.thresholds.items())},
+        }
+
+    def save(self, model_path):
+        path = os.path.join(model_path, CALIBRATION_FILE)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, model_path):
+        path = os.path.join(model_path, CALIBRATION_FILE)
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            data = json.load(f)
+        return cls(
+            temperature=data.get("temperature", 1.0),
+            thresholds={int(k): v for k, v in data.get("thresholds", {}).items()},
+            default_threshold=data.get("default_threshold"),
+        )
+
+    @classmethod
+    def fit(cls, logits, labels, target_precision=0.9, min_support=5):
+        """Temperature first, then thresholds on the calibrated probabilities"""
+        temperature = fit_temperature(logits, labels)
+        thresholds = fit_class_thresholds(
+            softmax(logits, temperature), labels, target_precision, min_support
+        )
+        return cls(temperature, thresholds)
@@ -1,130 +1,532 @@
 # src/chatbot_azure.py
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import azure.cognitiveservices.speech as speechsdk
-from dotenv import load_dotenv
-from language_model import IndoBERTFashionProcessor
+import tracing
+import profiling
+from metrics import REGISTRY, SpanMetricsExporter
+from language_model import IndoBERTFashionProcessor, normalize_utterance
+from speech_streaming import ContinuousListener, split_sentences
+from turn_timing import TurnTimer, save_turn_timings
+from conversation_state import DEFAULT_HISTORY_TURNS, TurnHistory
+from tts_cache import TTSCache
+from speech_backend import AzureSpeechBackend, VOICE_NAME, create_speech_backend
+from audio_assets import get_audio_manager
+from vad import detect_speech
+from structured_logging import (
+    LOG_LEVELS_ENV,
+    configure_logging,
+    log_event,
+    parse_module_levels,
+    request_context,
+)
 import logging
 
+WELCOME_MESSAGE = "Halo! Saya asisten fashion Anda. Apa jenis pakaian yang Anda cari?"
+FAREWELL_MESSAGE = "Terima kasih telah menggunakan Fashion Chatbot. Sampai jumpa!"
+REPEAT_MESSAGE = "Maaf, bisakah Anda mengulangi?"
+
+# Phrases synthesized into the TTS cache at startup
+FIXED_PHRASES = [
+    WELCOME_MESSAGE,
+    FAREWELL_MESSAGE,
+    REPEAT_MESSAGE,
+    "Maaf, bisakah Anda mengulangi pertanyaan Anda?",
+]
+
+logger = logging.getLogger(__name__)
+
+REQUESTS = REGISTRY.counter(
+    "chatbot_requests_total", "Processed user inputs by outcome", ["status"]
+)
+REQUESTS_IN_PROGRESS = REGISTRY.gauge(
+    "chatbot_requests_in_progress", "User inputs currently being processed"
+)
+REQUEST_LATENCY = REGISTRY.histogram(
+    "chatbot_process_input_seconds", "Time from user text to reply and JSON"
+)
+TTS_QUEUE_DEPTH = REGISTRY.gauge(
+    "tts_queue_depth", "Replies waiting for or in background synthesis"
+)
+# Read from the chatbot's cache when metrics are collected
+TTS_CACHE_HIT_RATIO = REGISTRY.gauge("tts_cache_hit_ratio", "TTS cache hit rate")
+TTS_CACHE_MEMORY = REGISTRY.gauge(
+    "tts_cache_memory_bytes", "Audio bytes held in the in-memory TTS cache"
+)
+
 
 class AzureFashionChatbot:
-    def __init__(self):
-        try:
-            load_dotenv()
+    def __init__(
+        self,
+        continuous=False,
+        use_tts_cache=True,
+        chunked_tts=False,
+        backend=None,
+        nlp_processor=None,
+        model_path="./fine-tuned-model",
+        tts_cache=None,
+        vad=True,
+        end_silence_timeout_ms=None,
+        history_turns=DEFAULT_HISTORY_TURNS,
+    ):
+        """
+        Args:
+            continuous (bool): Use continuous recognition with partial results
+            use_tts_cache (bool): Replay cached audio for repeated phrases
+            chunked_tts (bool): Synthesize long replies sentence by sentence
+            backend (SpeechBackend): Speech backend (default: Azure from .env)
+            nlp_processor: Shared IndoBERTFashionProcessor (default: load model_path)
+            model_path (str): Fine-tuned model directory
+            tts_cache (TTSCache): Shared audio cache (default: tts_cache/ on disk)
+            vad (bool): Trim silence from audio files before recognizing them
+            end_silence_timeout_ms (int): Silence that ends a microphone
+                utterance for the default Azure backend
+            history_turns (int): Recent user/assistant turns kept in self.history
+        """
+        self.vad = vad
+        self.continuous = continuous
+        self.chunked_tts = chunked_tts
+        self._listener = None
+        self._prewarm_executor = ThreadPoolExecutor(max_workers=1)
+        self._prewarm_future = None
+        self._prewarm_running = False
+        self._latest_partial = None
+        self._prewarmed_intents = {}
+        # Guards the fields above; the prewarm worker runs on its own thread
+        self._prewarm_lock = threading.Lock()
 
-            if not os.getenv("AZURE_SPEECH_KEY") or not os.getenv(
-                "AZURE_SPEECH_REGION"
-            ):
-                print("Error: Missing required Azure credentials in .env file")
-                return
+        # Pipelined mode: replies are spoken on a background thread
+        self._tts_executor = ThreadPoolExecutor(max_workers=1)
+        self._speaking_future = None
+        self._speaking_turn = None
+        self._current_turn = None
+        self.barge_in = False
+        self.history = TurnHistory(history_turns)
+        self.turn_timings = []
+        self.last_tts_timer = None
+        # One cancel token per reply not yet finished; stop_speaking sets them
+        self._cancel_tokens = set()
+        self._cancel_lock = threading.Lock()
 
-            self.speech_key = os.getenv("AZURE_SPEECH_KEY")
-            self.speech_region = os.getenv("AZURE_SPEECH_REGION")
+        # Chunked mode: later sentences are synthesized while earlier ones play
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=1)
+        self._silent_synthesizer = None
+        self._silent_lock = threading.Lock()
 
-            self.speech_config = speechsdk.SpeechConfig(
-                subscription=self.speech_key, region=self.speech_region
-            )
+        self.audio_player = None
+        self.tts_cache = None
 
-            self.speech_config.speech_recognition_language = "id-ID"
-            self.speech_config.speech_synthesis_language = "id-ID"
-            self.speech_config.speech_synthesis_voice_name = "id-ID-GadisNeural"
+        try:
+            if backend is None:
+                try:
+                    backend = AzureSpeechBackend(
+                        end_silence_timeout_ms=end_silence_timeout_ms
+                    )
+                except ValueError:
+                    logger.error("Missing required Azure credentials in .env file")
+                    return
+            self.backend = backend
 
-            self.speech_recognizer = speechsdk.SpeechRecognizer(
-                speech_config=self.speech_config
-            )
-            self.speech_synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=self.speech_config
-            )
+            self.speech_recognizer = backend.create_recognizer()
+            self.speech_synthesizer = backend.create_synthesizer()
+            self.speech_synthesizer.synthesizing.connect(self._on_synthesizing)
 
-            self.nlp_processor = IndoBERTFashionProcessor(
-                model_path="./fine-tuned-model"
-            )
+            # Cache of synthesized audio; only useful if we can play it back locally
+            self.audio_player = backend.create_audio_player()
+            if use_tts_cache and self.audio_player.available:
+                self.tts_cache = tts_cache if tts_cache is not None else TTSCache()
+            elif use_tts_cache:
+                logger.warning(
+                    "No local audio player (install simpleaudio); TTS cache disabled"
+                )
+
+            if nlp_processor is None:
+                nlp_processor = IndoBERTFashionProcessor(model_path=model_path)
+            self.nlp_processor = nlp_processor
+
+            if self.tts_cache is not None:
+                TTS_CACHE_HIT_RATIO.function = self.tts_cache.hit_rate
+                TTS_CACHE_MEMORY.function = lambda: self.tts_cache.memory_bytes
+                threading.Thread(target=self.prewarm_tts_cache, daemon=True).start()
         except Exception as e:
-            print(f"Initialization error: {str(e)}")
+            logger.error("Initialization error: %s", e)
             raise
 
-    def speech_to_text(self):
+    def speech_to_text(self, audio_file=None):
+        """
+        Recognize one utterance from the microphone, or from an audio file.
+
+        Files go through local voice activity detection first so leading and
+        trailing silence is never sent. For the microphone, end of speech is
+        detected by the service (see end_silence_timeout_ms).
+        """
         try:
-            print("Mendengarkan... (Mulai berbicara)")
-            result = self.speech_recognizer.recognize_once()
+            if audio_file:
+                segment = None
+                if self.vad:
+                    asset = get_audio_manager().load(audio_file)
+                    segment = detect_speech(asset.samples, asset.sample_rate)
+                recognizer = self.backend.create_recognizer(
+                    audio_file=audio_file, segment=segment
+                )
+            else:
+                logger.info("Mendengarkan... (Mulai berbicara)")
+                recognizer = self.speech_recognizer
+            result = recognizer.recognize_once()
             if result.reason == speechsdk.ResultReason.RecognizedSpeech:
                 text = result.text
-                print(f"Anda mengatakan: {text}")
+                log_event(
+                    logger, logging.INFO, "Anda mengatakan: %s", text, chars=len(text)
+                )
                 return text.lower()
             elif result.reason == speechsdk.ResultReason.NoMatch:
-                print("Tidak dapat mengenali suara")
+                logger.info("Tidak dapat mengenali suara")
                 return ""
             elif result.reason == speechsdk.ResultReason.Canceled:
-                print("Speech recognition dibatalkan")
+                logger.warning("Speech recognition dibatalkan")
                 return ""
         except Exception as e:
-            print(f"Error in speech_to_text: {str(e)}")
+            logger.error("Error in speech_to_text: %s", e)
+            return ""
+
+    def speech_to_text_continuous(self, timeout=None):
+        """
+        Get the next utterance using continuous recognition.
+
+        Interim hypotheses start intent classification in the background so the
+        result is usually ready by the time the final transcript arrives.
+        """
+        try:
+            if self._listener is None:
+                self._listener = ContinuousListener(
+                    self.speech_recognizer, on_partial=self._handle_partial
+                )
+                logger.info("Mendengarkan... (Mulai berbicara)")
+
+            text = self._listener.listen(timeout=timeout)
+            if text:
+                log_event(
+                    logger, logging.INFO, "Anda mengatakan: %s", text, chars=len(text)
+                )
+                return text.lower()
+            if text == "":
+                logger.info("Tidak dapat mengenali suara")
+            return ""
+        except Exception as e:
+            logger.error("Error in speech_to_text_continuous: %s", e)
             return ""
 
-    def text_to_speech(self, text, is_error=False):
-        """Convert text to speech using Azure Speech Service"""
+    def stop_listening(self):
+        """Stop continuous recognition if it is running"""
+        if self._listener is not None:
+            self._listener.stop()
+
+    def _handle_partial(self, partial_text):
+        """Interim hypothesis: timestamp it, barge in on playback, pre-warm NLP"""
+        if self._current_turn is not None:
+            self._current_turn.mark("speech_start")
+        if self.barge_in and self.is_speaking():
+            self.stop_speaking()
+            if self._current_turn is not None:
+                self._current_turn.barge_in = True
+        self._prewarm_intent(partial_text)
+
+    def _prewarm_intent(self, partial_text):
+        """Classify interim hypotheses in the background, always the latest one first"""
+        with self._prewarm_lock:
+            self._latest_partial = partial_text
+            if not self._prewarm_running:
+                self._prewarm_running = True
+                self._prewarm_future = self._prewarm_executor.submit(self._run_prewarm)
+
+    def _run_prewarm(self):
+        while True:
+            with self._prewarm_lock:
+                text = self._latest_partial
+                intents = self._prewarmed_intents
+                key = normalize_utterance(text) if text is not None else None
+                if key is None or key in intents:
+                    # Decided under the lock, so a new partial starts a new run
+                    self._prewarm_running = False
+                    return
+            intent_id = self.nlp_processor.classify_intent(text)
+            with self._prewarm_lock:
+                # After a reset this writes into the old, discarded dict
+                intents[key] = intent_id
+
+    def _classify_intent(self, text):
+        """Reuse the pre-warmed classification when it matches the final text"""
+        key = normalize_utterance(text)
+        with self._prewarm_lock:
+            future = self._prewarm_future
+            partial = self._latest_partial
+            if partial is None or normalize_utterance(partial) != key:
+                # Stale hypothesis: the worker stops after its current text
+                self._latest_partial = None
+        if future is not None and not future.cancel():
+            future.result()
+
+        with self._prewarm_lock:
+            intent_id = self._prewarmed_intents.get(key)
+            self._latest_partial = None
+            self._prewarm_future = None
+            self._prewarm_running = False
+            self._prewarmed_intents = {}
+
+        if intent_id is None:
+            intent_id = self.nlp_processor.classify_intent(text)
+        return intent_id
+
+    def text_to_speech(self, text, is_error=False, wait=True, timer=None):
+        """
+        Convert text to speech using Azure Speech Service.
+
+        With wait=False synthesis and playback run on a background thread and
+        the returned future completes when playback has finished.
+        """
         # Don't convert error messages to speech
         if is_error:
-            print(text)
-            return
+            logger.info(text)
+            return None
+
+        # Registered before the reply is queued, so a barge-in while it
+        # waits for the executor still cancels it
+        cancel = threading.Event()
+        with self._cancel_lock:
+            self._cancel_tokens.add(cancel)
 
+        if not wait:
+            TTS_QUEUE_DEPTH.inc()
+            self._speaking_future = self._tts_executor.submit(
+                self._speak, text, timer, cancel
+            )
+            self._speaking_future.add_done_callback(lambda _: TTS_QUEUE_DEPTH.dec())
+            return self._speaking_future
+
+        self._speak(text, timer, cancel)
+        return None
+
+    def is_speaking(self):
+        """True while an asynchronous reply is still being synthesized or played"""
+        return self._speaking_future is not None and not self._speaking_future.done()
+
+    def stop_speaking(self):
+        """Interrupt the playing reply and any queued ones (barge-in)"""
+        with self._cancel_lock:
+            for cancel in self._cancel_tokens:
+                cancel.set()
         try:
-            ssml = f"""
+            if self.tts_cache is not None:
+                self.audio_player.stop()
+            self.speech_synthesizer.stop_speaking_async().get()
+        except Exception as e:
+            logger.error("Error stopping speech: %s", e)
+
+    def _on_synthesizing(self, evt):
+        if self._speaking_turn is not None:
+            self._speaking_turn.mark("tts_first_audio")
+
+    def _speak(self, text, timer=None, cancel=None):
+        if timer is None:
+            timer = TurnTimer(0)
+        if cancel is None:
+            cancel = threading.Event()
+        self.last_tts_timer = timer
+        self._speaking_turn = timer
+        timer.mark("tts_start")
+
+        with tracing.span("tts.speak", characters=len(text)) as tts_span:
+            try:
+                chunks = split_sentences(text) if self.chunked_tts else [text]
+                tts_span.set_attribute("chunks", len(chunks))
+                if len(chunks) > 1 and self.tts_cache is None:
+                    completed = self._speak_queued(chunks)
+                else:
+                    completed = self._speak_chunks(chunks, timer, cancel)
+
+                if completed:
+                    log_event(
+                        logger, logging.INFO, "Asisten: %s", text, chunks=len(chunks)
+                    )
+            except Exception as e:
+                logger.error("Error dalam text_to_speech: %s", e)
+            finally:
+                timer.mark("tts_done")
+                self._speaking_turn = None
+                with self._cancel_lock:
+                    self._cancel_tokens.discard(cancel)
+
+    def _speak_chunks(self, chunks, timer, cancel):
+        """
+        Speak sentence chunks in order. The first chunk is synthesized straight
+        to the speaker; the rest are synthesized into the cache in the
+        background while earlier chunks play.
+        """
+        prefetched = [
+            self._prefetch_executor.submit(self._prefetch_chunk, chunk, cancel)
+            for chunk in chunks[1:]
+        ]
+
+        for i, chunk in enumerate(chunks):
+            if cancel.is_set():
+                return False
+            if i > 0:
+                prefetched[i - 1].result()
+            if not self._speak_chunk(chunk, timer):
+                return False
+        return True
+
+    def _speak_queued(self, chunks):
+        """Without a local player, queue every chunk on the synthesizer at once"""
+        futures = [
+            self.speech_synthesizer.speak_ssml_async(self._build_ssml(chunk))
+            for chunk in chunks
+        ]
+        completed = True
+        for future in futures:
+            result = future.get()
+            if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
+                self._report_synthesis_error(result)
+                completed = False
+        return completed
+
+    def _speak_chunk(self, text, timer):
+        """Play one piece of text from the cache or synthesize it to the speaker"""
+        ssml = self._build_ssml(text)
+
+        if self.tts_cache is not None:
+            cache_key = TTSCache.make_key(ssml, VOICE_NAME)
+            audio_data = self.tts_cache.get(cache_key)
+            if audio_data:
+                timer.mark("tts_first_audio")
+                with tracing.span("tts.play_cached"):
+                    self.audio_player.play(audio_data)
+                return True
+
+        with tracing.span("tts.synthesize"):
+            result = self.speech_synthesizer.speak_ssml_async(ssml).get()
+        if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+            if self.tts_cache is not None:
+                self.tts_cache.put(cache_key, result.audio_data)
+            return True
+
+        self._report_synthesis_error(result)
+        return False
+
+    def _prefetch_chunk(self, text, cancel):
+        if cancel.is_set():
+            return
+        ssml = self._build_ssml(text)
+        cache_key = TTSCache.make_key(ssml, VOICE_NAME)
+        if not self.tts_cache.contains(cache_key):
+            audio_data = self._synthesize_silent(ssml)
+            if audio_data:
+                self.tts_cache.put(cache_key, audio_data)
+
+    def _synthesize_silent(self, ssml):
+        """Synthesize SSML to bytes without playing it"""
+        with self._silent_lock:
+            if self._silent_synthesizer is None:
+                self._silent_synthesizer = self.backend.create_synthesizer(
+                    play_audio=False
+                )
+            try:
+                result = self._silent_synthesizer.speak_ssml_async(ssml).get()
+            except Exception as e:
+                logger.error("Error dalam sintesis suara: %s", e)
+                return None
+
+        if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+            return result.audio_data
+        self._report_synthesis_error(result)
+        return None
+
+    def _report_synthesis_error(self, result):
+        fields = {"reason": str(result.reason)}
+        if result.reason == speechsdk.ResultReason.Canceled:
+            cancellation_details = result.cancellation_details
+            fields["cancellation_reason"] = str(cancellation_details.reason)
+            if cancellation_details.reason == speechsdk.CancellationReason.Error:
+                fields["error_details"] = cancellation_details.error_details
+        log_event(
+            logger,
+            logging.ERROR,
+            "Error dalam sintesis suara: %s",
+            "; ".join(str(value) for value in fields.values()),
+            **fields,
+        )
+
+    def _build_ssml(self, text):
+        return f"""
             <speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="id-ID">
-                <voice name="id-ID-GadisNeural">
+                <voice name="{VOICE_NAME}">
                     {text}
                 </voice>
             </speak>
             """
 
-            result = self.speech_synthesizer.speak_ssml_async(ssml).get()
-            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-                print("Asisten: " + text)
-            else:
-                error_msg = f"Error dalam sintesis suara: {result.reason}"
-                print(error_msg)
-                if result.reason == speechsdk.ResultReason.Canceled:
-                    cancellation_details = result.cancellation_details
-                    print(f"CancellationReason: {cancellation_details.reason}")
-                    if (
-                        cancellation_details.reason
-                        == speechsdk.CancellationReason.Error
-                    ):
-                        print(f"ErrorDetails: {cancellation_details.error_details}")
-        except Exception as e:
-            print(f"Error dalam text_to_speech: {str(e)}")
+    def prewarm_tts_cache(self, phrases=None):
+        """Synthesize fixed phrases into the TTS cache without playing them"""
+        if self.tts_cache is None:
+            return
+
+        for text in phrases or FIXED_PHRASES:
+            ssml = self._build_ssml(text)
+            cache_key = TTSCache.make_key(ssml, VOICE_NAME)
+            if self.tts_cache.contains(cache_key):
+                continue
+            audio_data = self._synthesize_silent(ssml)
+            if audio_data:
+                self.tts_cache.put(cache_key, audio_data)
 
     def process_input(self, text):
         if not text:
-            return "Maaf, bisakah Anda mengulangi?", True, None
+            REQUESTS.inc(status="empty")
+            return REPEAT_MESSAGE, True, None
 
         if any(
             word in text.lower()
             for word in ["keluar", "selesai", "quit", "exit", "stop"]
         ):
+            REQUESTS.inc(status="exit")
             return "KELUAR", False, None
 
+        REQUESTS_IN_PROGRESS.inc()
         try:
-            intent_id = self.nlp_processor.classify_intent(text)
-            sentiment = self.nlp_processor.analyze_sentiment(text)
-            text_response, clothing_json = self.nlp_processor.generate_response(
-                text, intent_id, sentiment
-            )
+            with request_context() as request_id, REQUEST_LATENCY.time():
+                with profiling.profile_request():
+                    response = self._process_request(text, request_id)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+        REQUESTS.inc(status="error" if response[1] else "ok")
+        self.history.append("user", text)
+        self.history.append("assistant", response[0])
+        return response
 
-            # Save the JSON to a file
-            with open("last_recommendation.json", "w") as f:
-                f.write(clothing_json)
+    def _process_request(self, text, request_id=None):
+        with tracing.span("chatbot.process_input", request_id=request_id):
+            try:
+                intent_id = self._classify_intent(text)
+                with tracing.span("nlp.sentiment"):
+                    sentiment = self.nlp_processor.analyze_sentiment(text)
+                text_response, clothing_json = self.nlp_processor.generate_response(
+                    text, intent_id, sentiment
+                )
 
-            return text_response, False, clothing_json
-        except Exception as e:
-            error_msg = "Maaf, terjadi kesalahan dalam memproses permintaan Anda."
-            print(f"Error in process_input: {str(e)}")
-            return error_msg, True, None
+                # Save the JSON to a file
+                with tracing.span("chatbot.write_json"):
+                    with open("last_recommendation.json", "w") as f:
+                        f.write(clothing_json)
+
+                return text_response, False, clothing_json
+            except Exception as e:
+                error_msg = "Maaf, terjadi kesalahan dalam memproses permintaan Anda."
+                logger.exception("Error in process_input: %s", e)
+                return error_msg, True, None
 
     def run(self):
         try:
-            welcome_message = (
-                "Halo! Saya asisten fashion Anda. Apa jenis pakaian yang Anda cari?"
-            )
+            welcome_message = WELCOME_MESSAGE
             print("\n" + "=" * 50)
             print("Fashion Chatbot Indonesia")
             print("Katakan 'keluar' untuk mengakhiri percakapan")
@@ -133,35 +535,252 @@ class AzureFashionChatbot:
             self.text_to_speech(welcome_message)
 
             while True:
-                user_input = self.speech_to_text()
+                if self.continuous:
+                    user_input = self.speech_to_text_continuous()
+                else:
+                    user_input = self.speech_to_text()
                 if not user_input:
                     continue
 
+                with tracing.span("chatbot.turn"):
+                    response, is_error, clothing_json = self.process_input(user_input)
+
+                    if clothing_json:
+                        # Print the JSON separately, not for speech
+                        print("\nOutput JSON for 3D visualization:")
+                        print(clothing_json)
+
+                    if response == "KELUAR":
+                        farewell = FAREWELL_MESSAGE
+                        self.stop_listening()
+                        self.text_to_speech(farewell)
+                        break
+
+                    print(f"Asisten: {response}")
+
+                    self.text_to_speech(response, is_error)
+
+        except Exception as e:
+            print(f"Error in main loop: {str(e)}")
+
+    def run_pipelined(self, barge_in=True):
+        """
+        Conversation loop that overlaps speaking with listening.
+
+        Replies are synthesized in the background while continuous recognition
+        is already listening for the next utterance, and NLP starts on interim
+        hypotheses. With barge_in the reply stops as soon as the user speaks;
+        use a headset or echo cancellation so the assistant does not hear itself.
+        Stage timestamps for every turn are saved to test_results/.
+        """
+        self.barge_in = barge_in
+        self.turn_timings = []
+        welcome_message = WELCOME_MESSAGE
+        print("\n" + "=" * 50)
+        print("Fashion Chatbot Indonesia")
+        print("Katakan 'keluar' untuk mengakhiri percakapan")
+        print("=" * 50 + "\n")
+
+        try:
+            self.text_to_speech(welcome_message, wait=False)
+
+            turn_id = 0
+            while True:
+                timer = TurnTimer(turn_id + 1)
+                self._current_turn = timer
+                timer.mark("listen_start")
+
+                user_input = self.speech_to_text_continuous()
+                if not user_input:
+                    continue
+                timer.mark("stt_final")
+                turn_id += 1
+
                 response, is_error, clothing_json = self.process_input(user_input)
+                timer.mark("nlp_done")
 
                 if clothing_json:
-                    # Print the JSON separately, not for speech
                     print("\nOutput JSON for 3D visualization:")
                     print(clothing_json)
 
                 if response == "KELUAR":
-                    farewell = (
-                        "Terima kasih telah menggunakan Fashion Chatbot. Sampai jumpa!"
-                    )
+                    farewell = FAREWELL_MESSAGE
+                    self.stop_listening()
+                    if self.is_speaking():
+                        self.stop_speaking()
                     self.text_to_speech(farewell)
                     break
 
                 print(f"Asisten: {response}")
-
-                self.text_to_speech(response, is_error)
+                self.text_to_speech(response, is_error, wait=False, timer=timer)
+                self.turn_timings.append(timer)
 
         except Exception as e:
             print(f"Error in main loop: {str(e)}")
+        finally:
+            self._current_turn = None
+            if self._speaking_future is not None:
+                self._speaking_future.result()
+            if self.turn_timings:
+                timings_file = save_turn_timings(self.turn_timings)
+                print(f"Turn timings saved to: {timings_file}")
 
 
 if __name__ == "__main__":
+    import os
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the Azure fashion chatbot")
+    parser.add_argument(
+        "--continuous",
+        action="store_true",
+        help="Use continuous recognition with partial results instead of recognize_once",
+    )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Speak replies in the background while listening for the next turn",
+    )
+    parser.add_argument(
+        "--no-barge-in",
+        action="store_true",
+        help="In pipelined mode, let replies finish even if the user starts talking",
+    )
+    parser.add_argument(
+        "--no-tts-cache",
+        action="store_true",
+        help="Always synthesize replies instead of replaying cached audio",
+    )
+    parser.add_argument(
+        "--chunked-tts",
+        action="store_true",
+        help="Split replies into sentences and start playback after the first one",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["azure", "local"],
+        default="azure",
+        help="Speech backend; 'local' replays test_data transcripts offline",
+    )
+    parser.add_argument(
+        "--end-silence-ms",
+        type=int,
+        default=None,
+        help="Silence (ms) after which the service ends an utterance",
+    )
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="console",
+        default=None,
+        metavar="console|otel|FILE.jsonl",
+        help="Trace pipeline stages per turn and print them, send them to "
+        "OpenTelemetry or append them to a JSON lines file",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics on this port (/metrics and /metrics.json)",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        default="127.0.0.1",
+        help="Interface for the metrics server (0.0.0.0 exposes it to the network)",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        default=None,
+        help="Write a JSON snapshot of all metrics to this file on exit",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="WARNING",
+        help="Level for modules without an override (default: WARNING)",
+    )
+    parser.add_argument(
+        "--log-levels",
+        default="",
+        help="Per-module levels, e.g. language_model=DEBUG,chatbot_azure=INFO "
+        "(also read from CHATBOT_LOG_LEVELS)",
+    )
+    parser.add_argument(
+        "--log-json",
+        default=None,
+        help="Also write structured JSON lines logs to this file",
+    )
+    parser.add_argument(
+        "--profile-signal",
+        action="store_true",
+        help="Profile for --profile-seconds whenever the process gets SIGUSR2",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=profiling.MODES,
+        default="sample",
+        help="Profiler used by SIGUSR2 (POST /profile takes ?mode=)",
+    )
+    parser.add_argument("--profile-seconds", type=float, default=10)
+    parser.add_argument(
+        "--enable-profile-endpoint",
+        action="store_true",
+        help="Accept POST /profile on the metrics server to start profiling "
+        "(unauthenticated; keep --metrics-host on localhost)",
+    )
+    args = parser.parse_args()
+
+    # The conversation itself ("Anda mengatakan", "Asisten") is logged at INFO
+    module_levels = {"chatbot_azure": "INFO"}
+    module_levels.update(parse_module_levels(os.getenv(LOG_LEVELS_ENV)))
+    module_levels.update(parse_module_levels(args.log_levels))
+    configure_logging(
+        level=args.log_level.upper(),
+        module_levels=module_levels,
+        json_file=args.log_json,
+    )
+
+    exporters = []
+    if args.trace == "console":
+        exporters.append(tracing.ConsoleExporter())
+    elif args.trace == "otel":
+        exporters.append(tracing.OpenTelemetryExporter())
+    elif args.trace:
+        exporters.append(tracing.JSONLinesExporter(args.trace))
+    if args.metrics_port is not None or args.metrics_json:
+        # Per-stage latency histograms are fed by the tracing spans
+        exporters.append(SpanMetricsExporter())
+    if exporters:
+        tracing.enable(*exporters)
+    if args.metrics_port is not None:
+        post_routes = {}
+        if args.enable_profile_endpoint:
+            post_routes["/profile"] = profiling.http_route
+        REGISTRY.serve(
+            args.metrics_port, host=args.metrics_host, post_routes=post_routes
+        )
+        print(f"Metrics: http://{args.metrics_host}:{args.metrics_port}/metrics")
+    if args.profile_signal and profiling.install_signal_handler(
+        args.profile_seconds, args.profile_mode
+    ):
+        print(f"Profiling: kill -USR2 {os.getpid()}")
+
     try:
-        chatbot = AzureFashionChatbot()
-        chatbot.run()
+        backend = None
+        if args.backend == "local":
+            backend = create_speech_backend("local", time_scale=1.0)
+        chatbot = AzureFashionChatbot(
+            continuous=args.continuous or args.pipelined,
+            use_tts_cache=not args.no_tts_cache,
+            chunked_tts=args.chunked_tts,
+            backend=backend,
+            end_silence_timeout_ms=args.end_silence_ms,
+        )
+        if args.pipelined:
+            chatbot.run_pipelined(barge_in=not args.no_barge_in)
+        else:
+            chatbot.run()
     except Exception as e:
         print(f"Critical error: {str(e)}")
+    finally:
+        if args.metrics_json:
+            print(f"Metrics saved to: {REGISTRY.dump_json(args.metrics_json)}")
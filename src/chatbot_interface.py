@@ -1,30 +1,52 @@
 # src/chatbot_interface.py
 
-from src.language_model import IndoBERTFashionProcessor
-from src.response_generator import FashionResponseGenerator
-from src.clarification_module import ClarificationModule
+from response_generator import ResponseGenerator
+from clarification_module import ClarificationModule
 from color_selector import ColorSelector
+from session_store import InMemorySessionStore, new_session_state
+
+DEFAULT_SESSION_ID = "default"
 
 
 class FashionChatbot:
-    def __init__(self, model_path="./fine-tuned-model"):
-        self.processor = IndoBERTFashionProcessor(model_path)
-        self.response_generator = FashionResponseGenerator()
+    def __init__(
+        self, model_path="./fine-tuned-model", session_store=None, nlp_processor=None
+    ):
+        """
+        Args:
+            model_path (str): Fine-tuned model directory
+            session_store (SessionStore): Conversation state per session
+                (default: in memory, 30 minute TTL)
+            nlp_processor: Shared IndoBERTFashionProcessor (default: load model_path)
+        """
+        if nlp_processor is None:
+            from language_model import IndoBERTFashionProcessor
+
+            nlp_processor = IndoBERTFashionProcessor(model_path)
+        self.processor = nlp_processor
+        self.response_generator = ResponseGenerator()
         self.clarification = ClarificationModule()
         self.color_selector = ColorSelector()
 
-        # For maintaining conversation context
-        self.conversation_state = {
-            "awaiting_clarification": False,
-            "pending_params": {},
-            "clarification_type": None,
-        }
+        # Conversation context, one entry per user session
+        self.sessions = session_store or InMemorySessionStore()
+
+    def end_session(self, session_id=DEFAULT_SESSION_ID):
+        self.sessions.delete(session_id)
 
-    def process_query(self, text: str) -> str:
+    def process_query(self, text: str, session_id: str = DEFAULT_SESSION_ID) -> str:
         """Process user query and generate appropriate response"""
+        state = self.sessions.get(session_id) or new_session_state()
+        state.history.append("user", text)
+        response = self._respond(text, state)
+        state.history.append("assistant", response)
+        self.sessions.put(session_id, state)
+        return response
+
+    def _respond(self, text: str, state) -> str:
         # Check if we're waiting for clarification
-        if self.conversation_state["awaiting_clarification"]:
-            return self._handle_clarification(text)
+        if state.awaiting_clarification:
+            return self._handle_clarification(text, state)
 
         # Classify intent
         intent = self.processor.classify_intent(text)
@@ -35,63 +57,42 @@ class FashionChatbot:
         # Check if we need clarification
         missing_param = self.clarification.get_clarification_question(params)
         if missing_param:
-            self.conversation_state["awaiting_clarification"] = True
-            self.conversation_state["pending_params"] = params
-            self.conversation_state["clarification_type"] = next(
+            state.awaiting_clarification = True
+            state.pending_params = params
+            state.clarification_type = next(
                 key for key, value in params.items() if value is None
             )
             return missing_param
 
         # Generate response with complete parameters
-        response = self.response_generator.generate_response(
-            params["gender"], params["skin_tone"], params["occasion"]
-        )
+        state.last_params = params
+        response, _ = self.response_generator.generate_response(params)
 
         return response
 
-    def _handle_clarification(self, text: str) -> str:
+    def _handle_clarification(self, text: str, state) -> str:
         """Handle user's response to clarification question"""
-        clarification_type = self.conversation_state["clarification_type"]
-        params = self.conversation_state["pending_params"]
-
-        if clarification_type == "gender":
-            if any(
-                keyword in text.lower()
-                for keyword in self.clarification.gender_keywords["pria"]
-            ):
-                params["gender"] = "pria"
-            elif any(
-                keyword in text.lower()
-                for keyword in self.clarification.gender_keywords["wanita"]
-            ):
-                params["gender"] = "wanita"
-
-        elif clarification_type == "skin_tone":
-            for tone, keywords in self.clarification.skin_tone_keywords.items():
-                if any(keyword in text.lower() for keyword in keywords):
-                    params["skin_tone"] = tone
-                    break
-
-        elif clarification_type == "occasion":
-            for occasion, keywords in self.clarification.occasion_keywords.items():
-                if any(keyword in text.lower() for keyword in keywords):
-                    params["occasion"] = occasion
-                    break
+        params = state.pending_params
+
+        # Fill every missing slot the reply mentions, not only the one asked
+        # about, so "cowok, kulit sawo matang, buat kerja" needs no more questions
+        for key, value in self.clarification.extract_parameters(text).items():
+            if value is not None and params.get(key) is None:
+                params[key] = value
 
         # Check if we still need clarification
         missing_param = self.clarification.get_clarification_question(params)
         if missing_param:
-            self.conversation_state["clarification_type"] = next(
+            state.clarification_type = next(
                 key for key, value in params.items() if value is None
             )
             return missing_param
 
         # Reset state
-        self.conversation_state["awaiting_clarification"] = False
+        state.reset_clarification()
+        state.last_params = params
 
         # Generate response
-        response = self.response_generator.generate_response(
-            params["gender"], params["skin_tone"], params["occasion"]
-        )
+        response, _ = self.response_generator.generate_response(params)
 
         return response
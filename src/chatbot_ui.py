@@ -2,9 +2,20 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import threading
-from chatbot_azure import AzureFashionChatbot
+from collections import deque
+from chatbot_azure import AzureFashionChatbot, WELCOME_MESSAGE, FAREWELL_MESSAGE
+from turn_timing import TurnTimer, save_turn_timings
+from conversation_state import TurnHistory
+from metrics import REGISTRY
 import os
 
+HISTORY_TURNS = 200
+TIMED_TURNS = 1000
+
+
+def _history_entry(turn):
+    return f"[{turn.speaker}]: {turn.text}\n\n"
+
 
 class FashionChatbotUI:
     def __init__(self, root):
@@ -18,6 +29,14 @@ class FashionChatbotUI:
         self.is_listening = False
         self.conversation_active = False
 
+        # The history tab shows only the last turns so a long session does not
+        # keep growing the text widget
+        self.history = TurnHistory(max_turns=HISTORY_TURNS)
+
+        # Latency of the most recent turns, saved when the window closes
+        self.turn_timings = deque(maxlen=TIMED_TURNS)
+        self.turn_count = 0
+
         # Configure style
         self.setup_styles()
 
@@ -224,20 +243,19 @@ class FashionChatbotUI:
         self.stop_button.config(state="normal")
 
         # Add welcome message
-        welcome_msg = (
-            "Halo! Saya asisten fashion Anda. Apa jenis pakaian yang Anda cari?"
-        )
+        welcome_msg = WELCOME_MESSAGE
         self.add_to_response(welcome_msg)
         self.add_to_history("Asisten", welcome_msg)
 
         # Use text-to-speech for welcome message
         if self.chatbot:
-            threading.Thread(
-                target=lambda: self.chatbot.text_to_speech(welcome_msg), daemon=True
-            ).start()
+            self.chatbot.text_to_speech(welcome_msg, wait=False)
 
     def stop_chatbot(self):
         """Stop the chatbot"""
+        if self.chatbot and self.chatbot.is_speaking():
+            self.chatbot.stop_speaking()
+
         self.conversation_active = False
         self.is_listening = False
         self.chatbot = None
@@ -254,14 +272,23 @@ class FashionChatbotUI:
         if not self.chatbot or self.is_listening:
             return
 
+        # Barge-in: clicking listen interrupts the reply that is still playing
+        if self.chatbot.is_speaking():
+            self.chatbot.stop_speaking()
+
         self.is_listening = True
         self.listen_button.config(state="disabled", text="🎤 Mendengarkan...")
         self.update_status("Mendengarkan... Silakan berbicara.")
 
+        self.turn_count += 1
+        timer = TurnTimer(self.turn_count)
+        timer.mark("listen_start")
+
         def listen():
             try:
                 # Get speech input
                 user_input = self.chatbot.speech_to_text()
+                timer.mark("stt_final")
 
                 if user_input:
                     # Update UI with user input
@@ -272,10 +299,11 @@ class FashionChatbotUI:
                     response, is_error, clothing_json = self.chatbot.process_input(
                         user_input
                     )
+                    timer.mark("nlp_done")
 
                     # Check if user wants to exit
                     if response == "KELUAR":
-                        farewell = "Terima kasih telah menggunakan Fashion Chatbot. Sampai jumpa!"
+                        farewell = FAREWELL_MESSAGE
                         self.root.after(0, lambda: self.add_to_response(farewell))
                         self.root.after(
                             0, lambda: self.add_to_history("Asisten", farewell)
@@ -288,9 +316,11 @@ class FashionChatbotUI:
                     self.root.after(0, lambda: self.add_to_response(response))
                     self.root.after(0, lambda: self.add_to_history("Asisten", response))
 
-                    # Speak the response (don't speak error messages)
+                    # Speak the response in the background so the user can
+                    # start the next turn while it plays
                     if not is_error:
-                        self.chatbot.text_to_speech(response)
+                        self.chatbot.text_to_speech(response, wait=False, timer=timer)
+                    self.turn_timings.append(timer)
 
                 else:
                     self.root.after(
@@ -341,13 +371,19 @@ class FashionChatbotUI:
 
     def add_to_history(self, speaker, text):
         """Add to conversation history"""
+        dropped = self.history.append(speaker, text)
         self.history_text.config(state="normal")
-        self.history_text.insert(tk.END, f"[{speaker}]: {text}\n\n")
+        if dropped is not None:
+            self.history_text.delete(
+                "1.0", f"1.0 + {len(_history_entry(dropped))} chars"
+            )
+        self.history_text.insert(tk.END, _history_entry(self.history[-1]))
         self.history_text.see(tk.END)
         self.history_text.config(state="disabled")
 
     def clear_history(self):
         """Clear conversation history"""
+        self.history.clear()
         self.history_text.config(state="normal")
         self.history_text.delete(1.0, tk.END)
         self.history_text.config(state="disabled")
@@ -373,11 +409,27 @@ class FashionChatbotUI:
     def on_closing(self):
         """Handle window closing"""
         if self.conversation_active:
-            if messagebox.askokcancel("Keluar", "Apakah Anda yakin ingin keluar?"):
-                self.stop_chatbot()
-                self.root.destroy()
-        else:
-            self.root.destroy()
+            if not messagebox.askokcancel("Keluar", "Apakah Anda yakin ingin keluar?"):
+                return
+            self.stop_chatbot()
+        self.save_metrics()
+        self.root.destroy()
+
+    def save_metrics(self):
+        """Write the turn timings and, if CHATBOT_METRICS_FILE is set, metrics"""
+        if self.turn_timings:
+            try:
+                timings_file = save_turn_timings(self.turn_timings)
+                print(f"Turn timings saved to: {timings_file}")
+            except OSError as e:
+                print(f"Error saving turn timings: {str(e)}")
+
+        metrics_file = os.getenv("CHATBOT_METRICS_FILE")
+        if metrics_file:
+            try:
+                REGISTRY.dump_json(metrics_file)
+            except OSError as e:
+                print(f"Error saving metrics: {str(e)}")
 
 
 def main():
@@ -1,4 +1,5 @@
 # src/clarification_module.py
+import re
 
 
 class ClarificationModule:
@@ -21,30 +22,48 @@ class ClarificationModule:
             "casual": ["santai", "casual", "jalan-jalan", "hangout", "main"],
         }
 
+        self._patterns = {
+            "gender": self._compile(self.gender_keywords),
+            "skin_tone": self._compile(self.skin_tone_keywords),
+            "occasion": self._compile(self.occasion_keywords),
+        }
+
+    @staticmethod
+    def _compile(keywords_by_value):
+        """
+        (pattern, value) pairs, longest keyword first, matched on word
+        boundaries so "kulit gelap" wins over "gelap" and "tan" does not
+        match inside "tante" or "matang"
+        """
+        pairs = [
+            (keyword, value)
+            for value, keywords in keywords_by_value.items()
+            for keyword in keywords
+        ]
+        pairs.sort(key=lambda pair: len(pair[0]), reverse=True)
+        return [
+            (re.compile(rf"(?<!\w){re.escape(keyword)}(?!\w)"), value)
+            for keyword, value in pairs
+        ]
+
+    @staticmethod
+    def _match(patterns, text):
+        for pattern, value in patterns:
+            if pattern.search(text):
+                return value
+        return None
+
     def extract_parameters(self, text: str) -> dict:
         """Extract gender, skin tone and occasion from text"""
-        params = {"gender": None, "skin_tone": None, "occasion": None}
-
-        # Extract gender
-        for gender, keywords in self.gender_keywords.items():
-            if any(keyword in text.lower() for keyword in keywords):
-                params["gender"] = gender
-                break
-
-        # Extract skin tone
-        for tone, keywords in self.skin_tone_keywords.items():
-            if any(keyword in text.lower() for keyword in keywords):
-                params["skin_tone"] = tone
-                break
-
-        # Extract occasion
-        for occasion, keywords in self.occasion_keywords.items():
-            if any(keyword in text.lower() for keyword in keywords):
-                params["occasion"] = occasion
-                # Additional parsing for specific occasions
-                if "interview" in text.lower():
-                    params["occasion"] = "interview"
-                break
+        text = text.lower()
+        params = {
+            slot: self._match(patterns, text)
+            for slot, patterns in self._patterns.items()
+        }
+
+        # Additional parsing for specific occasions
+        if params["occasion"] is not None and re.search(r"\binterview\b", text):
+            params["occasion"] = "interview"
 
         return params
 
@@ -1,12 +1,14 @@
 # src/clothing_selector.py
 import json
 import re
+import tracing
 from fashion_mapping import FashionMapping, fashion_mapping
 
 # Create an instance of FashionMapping
 fashion_mapping_instance = FashionMapping()
 
 
+@tracing.traced("clothing.select")
 def generate_clothing_selection(parameters):
     """
     Process parameters and generate clothing selection for 3D visualization
@@ -90,7 +92,8 @@ def generate_clothing_selection(parameters):
                 }
 
             # Convert to JSON string
-            return json.dumps(result, indent=2)
+            with tracing.span("clothing.json_dumps"):
+                return json.dumps(result, indent=2)
         else:
             # Default response if occasion not found
             return json.dumps(
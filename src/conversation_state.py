@@ -0,0 +1,149 @@
+# src/conversation_state.py
+import sys
+import time
+from collections import deque
+
+DEFAULT_HISTORY_TURNS = 50
+MAX_TURN_CHARS = 1000
+
+
+class Turn:
+    """One line of the conversation"""
+
+    __slots__ = ("speaker", "text", "timestamp")
+
+    def __init__(self, speaker, text, timestamp=None):
+        self.speaker = speaker
+        self.text = text
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def to_list(self):
+        return [self.speaker, self.text, self.timestamp]
+
+    def __repr__(self):
+        return f"Turn({self.speaker!r}, {self.text!r})"
+
+
+class TurnHistory:
+    """
+    Ring buffer of the last `max_turns` turns.
+
+    Older turns are dropped as new ones arrive and long texts are cut to
+    `max_chars`, so a history never holds more than
+    max_turns * max_chars characters however long the conversation runs.
+    """
+
+    __slots__ = ("max_chars", "_turns")
+
+    def __init__(self, max_turns=DEFAULT_HISTORY_TURNS, max_chars=MAX_TURN_CHARS):
+        if max_turns < 1:
+            raise ValueError(f"max_turns must be at least 1, got {max_turns}")
+        self.max_chars = max_chars
+        self._turns = deque(maxlen=max_turns)
+
+    @property
+    def max_turns(self):
+        return self._turns.maxlen
+
+    def append(self, speaker, text, timestamp=None):
+        """Add a turn; returns the turn that fell off the front, or None"""
+        dropped = self._turns[0] if len(self._turns) == self.max_turns else None
+        if self.max_chars is not None and len(text) > self.max_chars:
+            text = text[: self.max_chars - 1] + "…"
+        self._turns.append(Turn(speaker, text, timestamp))
+        return dropped
+
+    def clear(self):
+        self._turns.clear()
+
+    def __iter__(self):
+        return iter(self._turns)
+
+    def __len__(self):
+        return len(self._turns)
+
+    def __getitem__(self, index):
+        return self._turns[index]
+
+    def to_list(self):
+        return [turn.to_list() for turn in self._turns]
+
+    @classmethod
+    def from_list(
+        cls, turns, max_turns=DEFAULT_HISTORY_TURNS, max_chars=MAX_TURN_CHARS
+    ):
+        history = cls(max_turns, max_chars)
+        for speaker, text, timestamp in turns:
+            history.append(speaker, text, timestamp)
+        return history
+
+
+class ConversationState:
+    """Clarification progress and recent turns of one session"""
+
+    __slots__ = (
+        "awaiting_clarification",
+        "pending_params",
+        "clarification_type",
+        "last_params",
+        "history",
+    )
+
+    def __init__(self, history_turns=DEFAULT_HISTORY_TURNS):
+        self.awaiting_clarification = False
+        self.pending_params = {}
+        self.clarification_type = None
+        # Parameters of the last recommendation, once a dialog has finished
+        self.last_params = None
+        self.history = TurnHistory(history_turns)
+
+    def reset_clarification(self):
+        """Forget a finished (or abandoned) clarification dialog; keep history"""
+        self.awaiting_clarification = False
+        self.pending_params = {}
+        self.clarification_type = None
+
+    def to_dict(self):
+        return {
+            "awaiting_clarification": self.awaiting_clarification,
+            "pending_params": self.pending_params,
+            "clarification_type": self.clarification_type,
+            "last_params": self.last_params,
+            "history": self.history.to_list(),
+        }
+
+    @classmethod
+    def from_dict(cls, data, history_turns=DEFAULT_HISTORY_TURNS):
+        state = cls(history_turns)
+        state.awaiting_clarification = data.get("awaiting_clarification", False)
+        state.pending_params = data.get("pending_params", {})
+        state.clarification_type = data.get("clarification_type")
+        state.last_params = data.get("last_params")
+        state.history = TurnHistory.from_list(data.get("history", []), history_turns)
+        return state
+
+    def memory_bytes(self):
+        return deep_sizeof(self)
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate bytes held by obj and everything it references"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_sizeof(key, seen) + deep_sizeof(value, seen)
+            for key, value in obj.items()
+        )
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(type(obj), "__slots__"):
+        for name in type(obj).__slots__:
+            if hasattr(obj, name):
+                size += deep_sizeof(getattr(obj, name), seen)
+    return size
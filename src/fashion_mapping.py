@@ -1,5 +1,6 @@
 # src/fashion_mapping.py
 import random
+import tracing
 
 fashion_mapping = {
     "occasion_mappings": {
@@ -386,6 +387,7 @@ class FashionMapping:
     def __init__(self):
         self.fashion_mapping = fashion_mapping
 
+    @tracing.traced("response.recommendation_lookup")
     def get_recommendation(self, parameters):
         """Get clothing recommendations based on parameters"""
         gender = parameters.get("gender", "pria")
@@ -454,6 +456,7 @@ class FashionMapping:
 
         return recommendation
 
+    @tracing.traced("response.template")
     def format_recommendation(self, recommendation, parameters):
         """Format recommendation into a natural language response"""
         gender = parameters.get("gender", "pria")
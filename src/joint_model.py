@@ -0,0 +1,219 @@
+# src/joint_model.py
+import os
+import json
+
+import torch
+from torch import nn
+
+# Intent ids are the ones IndoBERTFashionProcessor.categories uses
+INTENT_LABELS = [
+    "formal_pria_light",
+    "formal_wanita_light",
+    "formal_pria_dark",
+    "formal_wanita_dark",
+    "kasual_pria_light",
+    "kasual_wanita_light",
+    "kasual_pria_dark",
+    "kasual_wanita_dark",
+    "wedding",
+    "party",
+    "business_meeting",
+    "hot_weather",
+    "cold_weather",
+    "rainy_weather",
+    "windy_weather",
+    "summer",
+    "winter",
+    "spring",
+    "autumn",
+    "other",
+]
+
+# One classification head per parameter. The first value of each head means
+# "not mentioned"; values match what extract_parameters_from_intent returns.
+SLOT_LABELS = {
+    "gender": ["neutral", "pria", "wanita"],
+    "skin_tone": ["neutral", "very_light", "light", "medium", "dark", "very_dark"],
+    "occasion": ["none", "formal", "kasual", "wedding", "party", "business_meeting"],
+    "weather": ["none", "hot", "cold", "rainy", "windy"],
+    "season": ["none", "summer", "winter", "spring", "autumn"],
+}
+
+SEASON_KEYWORDS = {
+    "summer": ["musim panas", "summer"],
+    "winter": ["musim dingin", "winter"],
+    "spring": ["musim semi", "spring"],
+    "autumn": ["musim gugur", "autumn", "fall"],
+}
+
+CONFIG_FILE = "joint_config.json"
+HEADS_FILE = "joint_heads.pt"
+
+
+def is_joint_model(model_path):
+    return os.path.exists(os.path.join(model_path, CONFIG_FILE))
+
+
+def slot_targets(label, gender, skin_tone, query):
+    """
+    Training targets for every head of one dataset row.
+
+    gender and skin_tone come from the dataset columns. occasion and weather
+    follow from the intent label; season from the label or, like
+    extract_parameters_from_intent, from season words in the query.
+
+    Returns:
+        dict: Label id per head, keyed "<head>_labels"
+    """
+    intent = INTENT_LABELS[label]
+    occasion = weather = season = "none"
+
+    prefix = intent.split("_")[0]
+    if prefix in ("formal", "kasual"):
+        occasion = prefix
+    elif intent in ("wedding", "party", "business_meeting"):
+        occasion = intent
+    elif intent.endswith("_weather"):
+        weather = intent[: -len("_weather")]
+    elif intent in SEASON_KEYWORDS:
+        season = intent
+
+    if season == "none":
+        text = query.lower()
+        for name, keywords in SEASON_KEYWORDS.items():
+            if any(word in text for word in keywords):
+                season = name
+                break
+
+    values = {
+        "gender": gender if gender in SLOT_LABELS["gender"] else "neutral",
+        "skin_tone": skin_tone if skin_tone in SLOT_LABELS["skin_tone"] else "neutral",
+        "occasion": occasion,
+        "weather": weather,
+        "season": season,
+    }
+    return {
+        f"{head}_labels": SLOT_LABELS[head].index(value)
+        for head, value in values.items()
+    }
+
+
+class JointIntentSlotModel(nn.Module):
+    """
+    One encoder pass, several classification heads: the intent plus one head
+    per parameter in SLOT_LABELS.
+
+    forward() takes the tokenizer output plus optional `labels` (intent) and
+    `<head>_labels`, and returns a dict with "loss" (sum of the cross entropy
+    of every head that has labels), "logits" (intent) and "<head>_logits".
+    """
+
+    def __init__(self, encoder, num_intents=len(INTENT_LABELS), slot_labels=None):
+        super().__init__()
+        self.encoder = encoder
+        self.num_intents = num_intents
+        self.slot_labels = slot_labels or SLOT_LABELS
+        hidden_size = encoder.config.hidden_size
+        dropout = getattr(encoder.config, "hidden_dropout_prob", 0.1)
+        self.dropout = nn.Dropout(dropout)
+        self.intent_head = nn.Linear(hidden_size, num_intents)
+        self.slot_heads = nn.ModuleDict(
+            {
+                head: nn.Linear(hidden_size, len(values))
+                for head, values in self.slot_labels.items()
+            }
+        )
+
+    @property
+    def config(self):
+        return self.encoder.config
+
+    @classmethod
+    def from_encoder(cls, name_or_path, **kwargs):
+        """New heads on a pretrained encoder (a base or fine-tuned IndoBERT)"""
+        from transformers import AutoModel
+
+        return cls(AutoModel.from_pretrained(name_or_path), **kwargs)
+
+    def forward(
+        self,
+        input_ids=None,
+        attention_mask=None,
+        token_type_ids=None,
+        labels=None,
+        gender_labels=None,
+        skin_tone_labels=None,
+        occasion_labels=None,
+        weather_labels=None,
+        season_labels=None,
+    ):
+        # Named arguments (not **kwargs) so Trainer keeps these dataset columns
+        targets = {
+            "gender": gender_labels,
+            "skin_tone": skin_tone_labels,
+            "occasion": occasion_labels,
+            "weather": weather_labels,
+            "season": season_labels,
+        }
+        outputs = self.encoder(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            token_type_ids=token_type_ids,
+        )
+        pooled = getattr(outputs, "pooler_output", None)
+        if pooled is None:
+            pooled = outputs.last_hidden_state[:, 0]
+        pooled = self.dropout(pooled)
+
+        result = {"logits": self.intent_head(pooled)}
+        for head, layer in self.slot_heads.items():
+            result[f"{head}_logits"] = layer(pooled)
+
+        loss_fn = nn.CrossEntropyLoss()
+        losses = []
+        if labels is not None:
+            losses.append(loss_fn(result["logits"], labels))
+        for head in self.slot_heads:
+            target = targets.get(head)
+            if target is not None:
+                losses.append(loss_fn(result[f"{head}_logits"], target))
+        if losses:
+            result = {"loss": torch.stack(losses).sum(), **result}
+        return result
+
+    def save_pretrained(self, save_directory):
+        os.makedirs(save_directory, exist_ok=True)
+        self.encoder.save_pretrained(save_directory)
+        heads = {
+            key: value
+            for key, value in self.state_dict().items()
+            if not key.startswith("encoder.")
+        }
+        torch.save(heads, os.path.join(save_directory, HEADS_FILE))
+        with open(os.path.join(save_directory, CONFIG_FILE), "w") as f:
+            json.dump(
+                {
+                    "intent_labels": INTENT_LABELS[: self.num_intents],
+                    "slot_labels": self.slot_labels,
+                },
+                f,
+                indent=2,
+            )
+
+    @classmethod
+    def from_pretrained(cls, model_path):
+        from transformers import AutoModel
+
+        with open(os.path.join(model_path, CONFIG_FILE)) as f:
+            config = json.load(f)
+        model = cls(
+            AutoModel.from_pretrained(model_path),
+            num_intents=len(config["intent_labels"]),
+            slot_labels=config["slot_labels"],
+        )
+        heads = torch.load(os.path.join(model_path, HEADS_FILE), map_location="cpu")
+        missing, _ = model.load_state_dict(heads, strict=False)
+        missing = [key for key in missing if not key.startswith("encoder.")]
+        if missing:
+            raise ValueError(f"{HEADS_FILE} is missing weights: {missing}")
+        return model
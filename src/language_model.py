@@ -1,22 +1,97 @@
 # src/language_model.py
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import numpy as np
+import re
 import logging
+import threading
+from collections import OrderedDict
+import tracing
+import profiling
+from metrics import REGISTRY
+from structured_logging import log_event
 from response_generator import ResponseGenerator
 
+# torch and transformers are imported inside the methods that need them so that
+# the rule-based paths (parameter extraction, response generation, clarification)
+# can import this module without paying for the model stack.
+
 logger = logging.getLogger(__name__)
 
+INTENT_REQUESTS = REGISTRY.counter(
+    "nlp_intent_requests_total", "Classified requests per intent category", ["intent"]
+)
+INTENT_FALLBACKS = REGISTRY.counter(
+    "nlp_intent_fallbacks_total", "Low-confidence predictions sent to keywords"
+)
+INTENT_ERRORS = REGISTRY.counter(
+    "nlp_intent_errors_total", "Classifications that failed with an exception"
+)
+INTENT_CONFIDENCE = REGISTRY.histogram(
+    "nlp_intent_confidence",
+    "Top softmax probability of each prediction",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99),
+)
+BATCH_SIZE = REGISTRY.histogram(
+    "nlp_batch_size",
+    "Texts per model forward pass",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+SLOT_FALLBACKS = REGISTRY.counter(
+    "nlp_slot_fallbacks_total",
+    "Low-confidence joint model slot predictions replaced by the rules",
+    ["slot"],
+)
+REGISTRY.gauge(
+    "nlp_intent_fallback_ratio",
+    "Share of classified requests that used the keyword fallback",
+    function=lambda: INTENT_FALLBACKS.total() / max(INTENT_REQUESTS.total(), 1),
+)
+
+
+def _record_prediction(category, confidence, fallback):
+    INTENT_REQUESTS.inc(intent=category)
+    INTENT_CONFIDENCE.observe(confidence)
+    if fallback:
+        INTENT_FALLBACKS.inc()
+
+
+# Below this softmax probability a joint model slot falls back to the rules
+SLOT_CONFIDENCE_THRESHOLD = 0.5
+SLOT_CACHE_SIZE = 256
+
+
+def normalize_utterance(text):
+    """Lowercase and strip punctuation so partial and final hypotheses compare equal"""
+    text = re.sub(r"[^\w\s-]", "", text.lower())
+    return " ".join(text.split())
+
 
 class IndoBERTFashionProcessor:
     def __init__(self, model_path):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        from joint_model import JointIntentSlotModel, is_joint_model
+        from calibration import Calibration
+
         self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-        self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        # A joint model (train/train_joint_model.py) predicts the intent and
+        # every parameter from one forward pass
+        self.joint = is_joint_model(model_path)
+        if self.joint:
+            self.model = JointIntentSlotModel.from_pretrained(model_path)
+        else:
+            self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        self.model.eval()
+        # Temperature and per-intent fallback thresholds (calibration.json,
+        # written by analytics/evaluate_model.py --calibrate)
+        self.calibration = Calibration.load(model_path)
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model.to(self.device)
         self.response_generator = ResponseGenerator()  # Add this line
         print(f"Using device: {self.device}")
 
+        # Slot predictions from classify_intent, picked up by generate_response
+        self._slot_cache = OrderedDict()
+        self._slot_lock = threading.Lock()
+
         # Define categories
         self.categories = {
             0: "formal_pria_light",
@@ -52,30 +127,195 @@ class IndoBERTFashionProcessor:
         )
         return encoding.to(self.device)
 
-    def classify_intent(self, text):  # THIS LINE NEEDS TO BE INDENTED
-        try:
+    def _forward(self, text):
+        import torch
+
+        with tracing.span("nlp.tokenize"):
             inputs = self.preprocess_text(text)
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                predictions = torch.softmax(outputs.logits, dim=1)
+        with torch.no_grad():
+            with tracing.span("nlp.forward"):
+                with profiling.torch_forward_profile("indobert_forward"):
+                    return self.model(**inputs)
+
+    def predict(self, text):
+        """
+        Intent and, with a joint model, slots of one text from one forward pass.
+
+        Returns:
+            tuple: (category_id, slots); slots as in predict_slots
+        """
+        category_id = self.classify_intent(text)
+        return category_id, self.predict_slots(text)
+
+    def classify_intent(self, text):  # THIS LINE NEEDS TO BE INDENTED
+        import torch
 
-                # Get top 2 predictions
-                values, indices = torch.topk(predictions, 2)
+        with tracing.span("nlp.classify_intent") as intent_span:
+            try:
+                outputs = self._forward(text)
+                with torch.no_grad():
+                    with tracing.span("nlp.softmax_topk"):
+                        logits = outputs["logits"] / self.calibration.temperature
+                        predictions = torch.softmax(logits, dim=1)
 
-                category_id = indices[0][0].item()
-                confidence = values[0][0].item()
+                        # Get top 2 predictions
+                        values, indices = torch.topk(predictions, 2)
 
-                # If confidence is too low, try to determine from keywords
-                if confidence < 0.5:
-                    category_id = self._keyword_fallback(text)
+                        category_id = indices[0][0].item()
+                        confidence = values[0][0].item()
 
-                print(f"\nDetected intent: {self.categories[category_id]}")
-                print(f"Confidence: {confidence:.2f}")
-                return category_id
+                    # If confidence is too low, try to determine from keywords
+                    fallback = confidence < self.calibration.threshold(category_id)
+                    if fallback:
+                        with tracing.span("nlp.keyword_fallback"):
+                            category_id = self._keyword_fallback(text)
 
-        except Exception as e:
-            logger.error(f"Error in intent classification: {str(e)}")
-            return 19
+                    if self.joint:
+                        self._remember_slots([text], outputs)
+
+                    category = self.categories[category_id]
+                    BATCH_SIZE.observe(1)
+                    _record_prediction(category, confidence, fallback)
+                    intent_span.set_attribute("intent", category)
+                    intent_span.set_attribute("confidence", round(confidence, 4))
+                    log_event(
+                        logger,
+                        logging.DEBUG,
+                        "Detected intent: %s (%.2f)",
+                        category,
+                        confidence,
+                        sample_every=10,
+                        intent=category,
+                        confidence=confidence,
+                        fallback=fallback,
+                    )
+                    return category_id
+
+            except Exception as e:
+                INTENT_ERRORS.inc()
+                logger.error(f"Error in intent classification: {str(e)}")
+                return 19
+
+    def classify_intents(self, texts, batch_size=32):
+        """
+        Classify many texts with one forward pass per batch.
+
+        Batches are padded to their longest text instead of max_length, and
+        low-confidence predictions use the same calibrated keyword fallback
+        as classify_intent.
+
+        Returns:
+            list: Category ids in the order of `texts`
+        """
+        import torch
+
+        category_ids = []
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start : start + batch_size]
+            try:
+                with tracing.span("nlp.tokenize", batch_size=len(batch)):
+                    inputs = self.tokenizer(
+                        batch,
+                        add_special_tokens=True,
+                        max_length=128,
+                        padding=True,
+                        truncation=True,
+                        return_tensors="pt",
+                    ).to(self.device)
+                with torch.no_grad():
+                    with tracing.span("nlp.forward", batch_size=len(batch)):
+                        with profiling.torch_forward_profile("indobert_forward"):
+                            outputs = self.model(**inputs)
+                    logits = outputs["logits"] / self.calibration.temperature
+                    predictions = torch.softmax(logits, dim=1)
+                if self.joint:
+                    self._remember_slots(batch, outputs)
+                confidences, indices = predictions.max(dim=1)
+                BATCH_SIZE.observe(len(batch))
+                for text, category_id, confidence in zip(
+                    batch, indices.tolist(), confidences.tolist()
+                ):
+                    fallback = confidence < self.calibration.threshold(category_id)
+                    if fallback:
+                        category_id = self._keyword_fallback(text)
+                    _record_prediction(
+                        self.categories[category_id], confidence, fallback
+                    )
+                    category_ids.append(category_id)
+
+            except Exception as e:
+                INTENT_ERRORS.inc(len(batch))
+                logger.error(f"Error in batch intent classification: {str(e)}")
+                category_ids.extend([19] * len(batch))
+
+        return category_ids
+
+    def _remember_slots(self, texts, outputs):
+        """
+        Cache each text's slot predictions: {head: (value, confidence)}.
+        Keyed by normalize_utterance, so a final hypothesis finds the slots
+        of the partial hypothesis it was prewarmed with.
+        """
+        import torch
+
+        per_head = {}
+        for head, values in self.model.slot_labels.items():
+            probabilities = torch.softmax(outputs[f"{head}_logits"], dim=1)
+            confidences, indices = probabilities.max(dim=1)
+            per_head[head] = [
+                (values[index], confidence)
+                for index, confidence in zip(indices.tolist(), confidences.tolist())
+            ]
+        with self._slot_lock:
+            for row, text in enumerate(texts):
+                key = normalize_utterance(text)
+                self._slot_cache[key] = {
+                    head: predictions[row] for head, predictions in per_head.items()
+                }
+                self._slot_cache.move_to_end(key)
+            while len(self._slot_cache) > SLOT_CACHE_SIZE:
+                self._slot_cache.popitem(last=False)
+
+    def predict_slots(self, text):
+        """
+        Joint model slot predictions for a text, reusing the forward pass of
+        an earlier classify_intent call on the same (normalized) text.
+
+        Only a text that was never classified gets a forward pass of its own;
+        it is not counted as an intent request.
+
+        Returns:
+            dict: {head: (value, confidence)}, or None without a joint model
+        """
+        if not self.joint:
+            return None
+        key = normalize_utterance(text)
+        with self._slot_lock:
+            slots = self._slot_cache.get(key)
+        if slots is None:
+            self._remember_slots([text], self._forward(text))
+            with self._slot_lock:
+                slots = self._slot_cache.get(key)
+        return slots
+
+    def parameters_from_slots(self, slots, intent_name, text):
+        """
+        Response parameters from joint model slots. A slot the model is unsure
+        about takes the value extract_parameters_from_intent would give it.
+        """
+        parameters = {}
+        rules = None
+        for head, (value, confidence) in slots.items():
+            if confidence < SLOT_CONFIDENCE_THRESHOLD:
+                SLOT_FALLBACKS.inc(slot=head)
+                if rules is None:
+                    rules = self.extract_parameters_from_intent(
+                        intent_name, text, defaults=False
+                    )
+                value = rules.get(head)
+            if value not in (None, "none"):
+                parameters[head] = value
+        return self._with_defaults(parameters)
 
     def _keyword_fallback(self, text):
         """Fallback method using keywords when confidence is low"""
@@ -115,25 +355,35 @@ class IndoBERTFashionProcessor:
         return 1  # Default neutral sentiment
 
     def generate_response(self, text, intent_id, sentiment):
-        try:
-            # Extract parameters from intent
-            intent_name = self.categories[intent_id]
+        with tracing.span("nlp.generate_response"):
+            try:
+                # Extract parameters from intent
+                intent_name = self.categories[intent_id]
 
-            # Parse intent to get parameters
-            parameters = self.extract_parameters_from_intent(intent_name, text)
+                # Parse intent to get parameters
+                with tracing.span("nlp.extract_parameters"):
+                    slots = self.predict_slots(text)
+                    if slots is not None:
+                        parameters = self.parameters_from_slots(
+                            slots, intent_name, text
+                        )
+                    else:
+                        parameters = self.extract_parameters_from_intent(
+                            intent_name, text
+                        )
 
-            # Use ResponseGenerator to generate the response
-            text_response, clothing_json = self.response_generator.generate_response(
-                parameters
-            )
+                # Use ResponseGenerator to generate the response
+                generator = self.response_generator
+                text_response, clothing_json = generator.generate_response(parameters)
 
-            return text_response, clothing_json
+                return text_response, clothing_json
 
-        except Exception as e:
-            logger.error(f"Error generating response: {str(e)}")
-            return "Maaf, bisakah Anda mengulangi pertanyaan Anda?", "{}"
+            except Exception as e:
+                logger.error(f"Error generating response: {str(e)}")
+                return "Maaf, bisakah Anda mengulangi pertanyaan Anda?", "{}"
 
-    def extract_parameters_from_intent(self, intent_name, text):
+    @staticmethod
+    def extract_parameters_from_intent(intent_name, text, defaults=True):
         """Extract parameters from intent and text"""
         parameters = {}
 
@@ -185,7 +435,13 @@ class IndoBERTFashionProcessor:
             ):
                 parameters["skin_tone"] = "dark"
 
-        # Set defaults if not found
+        if defaults:
+            parameters = IndoBERTFashionProcessor._with_defaults(parameters)
+        return parameters
+
+    @staticmethod
+    def _with_defaults(parameters):
+        """Set defaults if not found"""
         if "gender" not in parameters:
             parameters["gender"] = "neutral"
         if "skin_tone" not in parameters:
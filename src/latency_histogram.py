@@ -0,0 +1,114 @@
+# src/latency_histogram.py
+import math
+import threading
+
+# 2048 linear sub-buckets per power of two keeps every recorded value within
+# 0.1% of its true value (three significant digits), like HdrHistogram
+SUB_BUCKET_BITS = 11
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT // 2
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def _bucket_index(value):
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    top = value >> shift  # in [SUB_BUCKET_HALF, SUB_BUCKET_COUNT)
+    return SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + top - SUB_BUCKET_HALF
+
+
+def _bucket_range(index):
+    """Lowest and highest integer value that fall into a bucket"""
+    if index < SUB_BUCKET_COUNT:
+        return index, index
+    shift = (index - SUB_BUCKET_COUNT) // SUB_BUCKET_HALF + 1
+    top = (index - SUB_BUCKET_COUNT) % SUB_BUCKET_HALF + SUB_BUCKET_HALF
+    low = top << shift
+    return low, low + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram.
+
+    Latencies are recorded in seconds and stored as integer microseconds in
+    buckets whose width grows with the value, so memory stays small while
+    every percentile keeps three significant digits. Safe to record into
+    from many threads.
+    """
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds):
+        value = max(int(round(seconds * 1_000_000)), 0)
+        index = _bucket_index(value)
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        with self._lock:
+            for index, count in other._counts.items():
+                self._counts[index] = self._counts.get(index, 0) + count
+            self.count += other.count
+            self.total += other.total
+            if other.count:
+                self.min = other.min if self.min is None else min(self.min, other.min)
+                self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percentile):
+        """Latency in seconds at or below which `percentile` % of values fall"""
+        with self._lock:
+            if not self.count:
+                return None
+            target = max(math.ceil(percentile / 100.0 * self.count), 1)
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= target:
+                    _, high = _bucket_range(index)
+                    return min(high, self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    def mean(self):
+        return self.total / self.count / 1_000_000 if self.count else None
+
+    def to_dict(self, percentiles=DEFAULT_PERCENTILES):
+        """Summary in seconds with keys like p50, p99 and p99_9"""
+        summary = {
+            "count": self.count,
+            "min": self.min / 1_000_000 if self.count else None,
+            "mean": self.mean(),
+            "max": self.max / 1_000_000 if self.count else None,
+        }
+        for percentile in percentiles:
+            key = "p" + f"{percentile:g}".replace(".", "_")
+            summary[key] = self.percentile(percentile)
+        return summary
+
+    def percentile_distribution(self):
+        """
+        Rows of (latency_seconds, percentile, total_count), one per bucket,
+        for plotting or writing an .hgrm-like file.
+        """
+        rows = []
+        with self._lock:
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                _, high = _bucket_range(index)
+                rows.append(
+                    (min(high, self.max) / 1_000_000, 100.0 * seen / self.count, seen)
+                )
+        return rows
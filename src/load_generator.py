@@ -0,0 +1,175 @@
+# src/load_generator.py
+import json
+import time
+import random
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, wait
+from latency_histogram import LatencyHistogram
+
+
+def poisson_arrivals(rate, duration, rng):
+    """Intended start offsets (seconds) of a Poisson process at `rate` per second"""
+    arrivals = []
+    t = rng.expovariate(rate)
+    while t < duration:
+        arrivals.append(t)
+        t += rng.expovariate(rate)
+    return arrivals
+
+
+def processor_target(processor):
+    """Run one query through the NLP pipeline, like a chatbot turn without speech"""
+
+    def run(query):
+        intent_id = processor.classify_intent(query)
+        sentiment = processor.analyze_sentiment(query)
+        text_response, _ = processor.generate_response(query, intent_id, sentiment)
+        if not text_response:
+            raise ValueError("Empty response")
+
+    return run
+
+
+def http_target(url, timeout=30.0):
+    """POST {"text": query} as JSON to a chatbot HTTP endpoint"""
+
+    def run(query):
+        request = urllib.request.Request(
+            url,
+            data=json.dumps({"text": query}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+
+    return run
+
+
+def run_open_loop(
+    target,
+    queries,
+    rate,
+    duration,
+    max_workers=32,
+    drain_timeout=30.0,
+    seed=None,
+):
+    """
+    Drive `target` with Poisson arrivals at `rate` requests per second.
+
+    Unlike a closed loop, new requests are sent on schedule whether or not
+    earlier ones have finished. Latency is measured from each request's
+    intended start time, so time spent waiting for a free worker is counted
+    instead of hidden (no coordinated omission).
+
+    Args:
+        target (callable): target(query); raising an exception marks an error
+        queries (list): Queries sent round-robin
+        rate (float): Offered load in requests per second
+        duration (float): Seconds during which requests are started
+        max_workers (int): Concurrent requests the client can have in flight
+        drain_timeout (float): Seconds to wait for outstanding requests after
+            the last one was sent; unfinished requests are counted as timeouts
+        seed (int): Seed for the arrival schedule
+
+    Returns:
+        dict: Offered and achieved rates, error counts and the latency
+              histogram ("histogram", a LatencyHistogram)
+    """
+    rng = random.Random(seed)
+    arrivals = poisson_arrivals(rate, duration, rng)
+    histogram = LatencyHistogram()
+    errors = []
+    lock = threading.Lock()
+    completion_times = []
+
+    def send(query, intended_start):
+        try:
+            target(query)
+            ok = True
+        except Exception as e:
+            ok = False
+            with lock:
+                errors.append(str(e))
+        finished = time.perf_counter()
+        if ok:
+            histogram.record(finished - intended_start)
+        with lock:
+            completion_times.append(finished)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = []
+    start = time.perf_counter()
+    max_send_lag = 0.0
+    try:
+        for i, offset in enumerate(arrivals):
+            intended_start = start + offset
+            delay = intended_start - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            max_send_lag = max(max_send_lag, time.perf_counter() - intended_start)
+            futures.append(
+                executor.submit(send, queries[i % len(queries)], intended_start)
+            )
+
+        _, not_done = wait(futures, timeout=drain_timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    with lock:
+        finished_in_window = sum(1 for t in completion_times if t - start <= duration)
+        error_count = len(errors)
+        sample_errors = errors[:5]
+
+    return {
+        "offered_rate": rate,
+        "duration": duration,
+        "requests_sent": len(arrivals),
+        "completed": histogram.count,
+        "errors": error_count,
+        "timeouts": len(not_done),
+        # Completions during the send window; drained requests are excluded
+        "throughput": finished_in_window / duration,
+        "max_send_lag": max_send_lag,
+        "histogram": histogram,
+        "sample_errors": sample_errors,
+    }
+
+
+def run_rate_sweep(target, queries, rates, duration, **options):
+    """Run one open-loop test per offered rate and return their results"""
+    results = []
+    for rate in rates:
+        print(f"Offered load: {rate:.2f} requests/second for {duration} seconds...")
+        result = run_open_loop(target, queries, rate, duration, **options)
+        latency = result["histogram"].to_dict()
+        print(
+            f"  throughput {result['throughput']:.2f}/s, "
+            f"p50 {latency['p50'] or 0:.4f}s, p99 {latency['p99'] or 0:.4f}s, "
+            f"errors {result['errors']}, timeouts {result['timeouts']}"
+        )
+        results.append(result)
+    return results
+
+
+def slo_violations(row, p99_seconds=1.0, max_error_rate=0.01):
+    """
+    Ways one rate of a sweep misses the service level objective: p99 latency
+    above `p99_seconds`, or errors plus timeouts above `max_error_rate` of the
+    requests sent. An empty list means the SLO was met.
+
+    Args:
+        row (dict): A run_open_loop result, or one with its histogram flattened
+    """
+    p99 = row["p99"] if "p99" in row else row["histogram"].percentile(99)
+    violations = []
+    if p99 is None or p99 > p99_seconds:
+        p99_text = "no completed requests" if p99 is None else f"{p99:.3f}s"
+        violations.append(f"p99 {p99_text} > {p99_seconds:g}s")
+    failed = row["errors"] + row["timeouts"]
+    error_rate = failed / max(row["requests_sent"], 1)
+    if error_rate > max_error_rate:
+        violations.append(f"error rate {error_rate:.1%} > {max_error_rate:.1%}")
+    return violations
@@ -0,0 +1,393 @@
+# src/local_speech.py
+import io
+import csv
+import random
+import re
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+import azure.cognitiveservices.speech as speechsdk
+
+METADATA_FILE = "test_data/audio_metadata.csv"
+
+
+def load_audio_transcripts(metadata_file=METADATA_FILE, category=None):
+    """
+    Load the expected transcripts of the recorded test audio.
+
+    Args:
+        metadata_file (str): Path to audio_metadata.csv
+        category (str): Only return entries from this category (optional)
+
+    Returns:
+        list: Dicts with filename, expected_text, category and duration_seconds
+    """
+    entries = []
+    with open(metadata_file, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if category and row["category"] != category:
+                continue
+            try:
+                duration = float(row.get("duration_seconds") or 0.0)
+            except ValueError:
+                duration = 0.0
+            entries.append(
+                {
+                    "filename": row["filename"],
+                    "expected_text": row["expected_text"],
+                    "category": row["category"],
+                    "duration_seconds": duration,
+                }
+            )
+    return entries
+
+
+def _find_entry(entries, path):
+    """Metadata entry for a path relative to the audio root or containing it"""
+    path = path.replace("\\", "/")
+    for entry in entries:
+        filename = entry["filename"].replace("\\", "/")
+        if path == filename or path.endswith("/" + filename):
+            return entry
+    raise KeyError(f"No transcript for audio file: {path}")
+
+
+class EventSignal:
+    """Minimal stand-in for speechsdk.EventSignal"""
+
+    def __init__(self):
+        self._callbacks = []
+
+    def connect(self, callback):
+        self._callbacks.append(callback)
+
+    def disconnect_all(self):
+        self._callbacks = []
+
+    def fire(self, evt):
+        for callback in list(self._callbacks):
+            callback(evt)
+
+
+class LocalCancellationDetails:
+    def __init__(self, error_details):
+        self.reason = speechsdk.CancellationReason.Error
+        # Injected failures look like a transient service outage
+        self.code = speechsdk.CancellationErrorCode.ServiceUnavailable
+        self.error_details = error_details
+
+
+class LocalRecognitionResult:
+    def __init__(self, text, reason, cancellation_details=None):
+        self.text = text
+        self.reason = reason
+        self.cancellation_details = cancellation_details
+
+
+class LocalSynthesisResult:
+    def __init__(self, reason, audio_data=b"", cancellation_details=None):
+        self.reason = reason
+        self.audio_data = audio_data
+        self.cancellation_details = cancellation_details
+
+
+class LocalRecognitionEventArgs:
+    def __init__(self, result):
+        self.result = result
+
+
+class _CompletedFuture:
+    """Mimics the ResultFuture returned by the *_async SDK calls"""
+
+    def __init__(self, value=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+
+class _PendingFuture:
+    """Wraps a concurrent.futures.Future in the SDK's .get() interface"""
+
+    def __init__(self, future):
+        self._future = future
+
+    def get(self):
+        return self._future.result()
+
+
+def _injected_failure(rng, error_rate, reason_no_match=True):
+    """Pick a failure result for error injection, or None for success"""
+    if error_rate <= 0 or rng.random() >= error_rate:
+        return None
+    if reason_no_match and rng.random() < 0.5:
+        return LocalRecognitionResult("", speechsdk.ResultReason.NoMatch)
+    return LocalRecognitionResult(
+        "",
+        speechsdk.ResultReason.Canceled,
+        LocalCancellationDetails("Injected error from local speech backend"),
+    )
+
+
+class LocalSpeechRecognizer:
+    """
+    Offline replacement for speechsdk.SpeechRecognizer.
+
+    Replays the expected transcripts of the files in test_data/audio_samples
+    instead of sending audio to Azure. In continuous mode each utterance emits
+    word-by-word `recognizing` events followed by one `recognized` event, paced
+    by the recorded duration of the file multiplied by `time_scale`
+    (0 replays instantly).
+
+    `latency` adds a fixed service delay before each final result and
+    `error_rate` turns that fraction of utterances into NoMatch or Canceled
+    results, so failure handling can be exercised without a network.
+    """
+
+    def __init__(
+        self, utterances, time_scale=1.0, latency=0.0, error_rate=0.0, seed=None
+    ):
+        """
+        Args:
+            utterances (list): Transcript strings or dicts from load_audio_transcripts
+            time_scale (float): Multiplier for the recorded audio durations
+            latency (float): Extra seconds before each final result
+            error_rate (float): Probability that an utterance fails
+            seed (int): Seed for the error injection (optional)
+        """
+        self.utterances = [
+            u if isinstance(u, dict) else {"expected_text": u, "duration_seconds": 0.0}
+            for u in utterances
+        ]
+        self.time_scale = time_scale
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._position = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.recognizing = EventSignal()
+        self.recognized = EventSignal()
+        self.canceled = EventSignal()
+        self.session_started = EventSignal()
+        self.session_stopped = EventSignal()
+
+    @classmethod
+    def from_audio_files(
+        cls,
+        filenames=None,
+        category=None,
+        time_scale=1.0,
+        metadata_file=METADATA_FILE,
+        **options,
+    ):
+        """Build a recognizer that replays the given test audio files"""
+        entries = load_audio_transcripts(metadata_file, category=category)
+        if filenames is not None:
+            entries = [_find_entry(entries, f) for f in filenames]
+        return cls(entries, time_scale=time_scale, **options)
+
+    def _next_utterance(self):
+        if self._position >= len(self.utterances):
+            return None
+        utterance = self.utterances[self._position]
+        self._position += 1
+        return utterance
+
+    def _utterance_delay(self, utterance):
+        return utterance.get("duration_seconds", 0.0) * self.time_scale
+
+    def recognize_once(self):
+        utterance = self._next_utterance()
+        if utterance is None:
+            return LocalRecognitionResult("", speechsdk.ResultReason.NoMatch)
+
+        delay = self._utterance_delay(utterance) + self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+        failure = _injected_failure(self._rng, self.error_rate)
+        if failure is not None:
+            return failure
+        return LocalRecognitionResult(
+            utterance["expected_text"], speechsdk.ResultReason.RecognizedSpeech
+        )
+
+    def recognize_once_async(self):
+        return _CompletedFuture(self.recognize_once())
+
+    def _replay(self):
+        self.session_started.fire(None)
+        while not self._stop_event.is_set():
+            utterance = self._next_utterance()
+            if utterance is None:
+                break
+
+            words = utterance["expected_text"].split()
+            word_delay = self._utterance_delay(utterance) / max(len(words), 1)
+            for i in range(1, len(words) + 1):
+                if self._stop_event.wait(word_delay):
+                    break
+                partial = " ".join(words[:i]).lower().rstrip(".,?!")
+                self.recognizing.fire(
+                    LocalRecognitionEventArgs(
+                        LocalRecognitionResult(
+                            partial, speechsdk.ResultReason.RecognizingSpeech
+                        )
+                    )
+                )
+            else:
+                if self.latency > 0 and self._stop_event.wait(self.latency):
+                    break
+                result = _injected_failure(self._rng, self.error_rate)
+                if result is None:
+                    result = LocalRecognitionResult(
+                        utterance["expected_text"],
+                        speechsdk.ResultReason.RecognizedSpeech,
+                    )
+                if result.reason == speechsdk.ResultReason.Canceled:
+                    evt = LocalRecognitionEventArgs(result)
+                    evt.cancellation_details = result.cancellation_details
+                    self.canceled.fire(evt)
+                else:
+                    self.recognized.fire(LocalRecognitionEventArgs(result))
+        self.session_stopped.fire(None)
+
+    def start_continuous_recognition_async(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._replay, daemon=True)
+        self._thread.start()
+        return _CompletedFuture()
+
+    def stop_continuous_recognition_async(self):
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+        return _CompletedFuture()
+
+    def start_continuous_recognition(self):
+        self.start_continuous_recognition_async().get()
+
+    def stop_continuous_recognition(self):
+        self.stop_continuous_recognition_async().get()
+
+
+def silent_wav(duration_seconds, sample_rate=16000):
+    """Bytes of a mono 16-bit WAV file containing silence"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x00\x00" * int(duration_seconds * sample_rate))
+    return buffer.getvalue()
+
+
+def wav_duration(audio_data):
+    """Duration of WAV bytes in seconds"""
+    with wave.open(io.BytesIO(audio_data), "rb") as wav_file:
+        return wav_file.getnframes() / float(wav_file.getframerate())
+
+
+class LocalSpeechSynthesizer:
+    """
+    Offline replacement for speechsdk.SpeechSynthesizer.
+
+    Each request waits `latency` seconds before the first audio, then "plays"
+    silent audio whose length follows the text (`words_per_second`) scaled by
+    `time_scale`. Requests are processed one at a time in submission order,
+    like the SDK. `error_rate` makes that fraction of requests cancel.
+    """
+
+    def __init__(
+        self,
+        play_audio=True,
+        latency=0.0,
+        words_per_second=2.5,
+        time_scale=1.0,
+        error_rate=0.0,
+        seed=None,
+    ):
+        self.play_audio = play_audio
+        self.latency = latency
+        self.words_per_second = words_per_second
+        self.time_scale = time_scale
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._stop_event = threading.Event()
+        self.request_count = 0
+
+        self.synthesis_started = EventSignal()
+        self.synthesizing = EventSignal()
+        self.synthesis_completed = EventSignal()
+        self.synthesis_canceled = EventSignal()
+
+    @staticmethod
+    def _text_from_ssml(ssml):
+        return re.sub(r"<[^>]+>", " ", ssml)
+
+    def _synthesize(self, ssml):
+        self.request_count += 1
+        self._stop_event.clear()
+        self.synthesis_started.fire(None)
+
+        if self.latency > 0 and self._stop_event.wait(self.latency):
+            return LocalSynthesisResult(speechsdk.ResultReason.Canceled)
+
+        failure = _injected_failure(self._rng, self.error_rate, reason_no_match=False)
+        if failure is not None:
+            result = LocalSynthesisResult(
+                speechsdk.ResultReason.Canceled,
+                cancellation_details=failure.cancellation_details,
+            )
+            self.synthesis_canceled.fire(None)
+            return result
+
+        words = len(self._text_from_ssml(ssml).split())
+        duration = words / self.words_per_second
+        audio_data = silent_wav(duration)
+        self.synthesizing.fire(None)
+
+        if self.play_audio and duration * self.time_scale > 0:
+            if self._stop_event.wait(duration * self.time_scale):
+                return LocalSynthesisResult(speechsdk.ResultReason.Canceled)
+
+        self.synthesis_completed.fire(None)
+        return LocalSynthesisResult(
+            speechsdk.ResultReason.SynthesizingAudioCompleted, audio_data
+        )
+
+    def speak_ssml_async(self, ssml):
+        return _PendingFuture(self._executor.submit(self._synthesize, ssml))
+
+    def speak_ssml(self, ssml):
+        return self.speak_ssml_async(ssml).get()
+
+    def stop_speaking_async(self):
+        self._stop_event.set()
+        return _CompletedFuture()
+
+    def stop_speaking(self):
+        self.stop_speaking_async().get()
+
+
+class LocalAudioPlayer:
+    """Stands in for audio_player.AudioPlayer by waiting out the clip length"""
+
+    def __init__(self, time_scale=1.0):
+        self.time_scale = time_scale
+        self._stop_event = threading.Event()
+
+    @property
+    def available(self):
+        return True
+
+    def play(self, audio_data):
+        self._stop_event.clear()
+        self._stop_event.wait(wav_duration(audio_data) * self.time_scale)
+
+    def stop(self):
+        self._stop_event.set()
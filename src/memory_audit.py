@@ -0,0 +1,214 @@
+# src/memory_audit.py
+import os
+import sys
+import csv
+import json
+import time
+import tracemalloc
+from datetime import datetime
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Allocations to leave out of every snapshot, including the audit's own samples
+_IGNORED = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+# Path fragments that identify where an allocation comes from
+CATEGORIES = [
+    ("tokenizers", "tokeniz"),
+    ("transformers", "transformers"),
+    ("torch", "torch"),
+    ("numpy/pandas", "numpy"),
+    ("numpy/pandas", "pandas"),
+    ("azure speech", "azure"),
+]
+
+
+def categorize(filename):
+    """Rough owner of an allocation site: a library, our code, stdlib or other"""
+    normalized = filename.replace("\\", "/").lower()
+    if os.path.abspath(filename).startswith(SRC_DIR):
+        return "ours"
+    if "site-packages" in normalized or "dist-packages" in normalized:
+        for category, fragment in CATEGORIES:
+            if fragment in normalized:
+                return category
+        return "other libraries"
+    return "stdlib"
+
+
+def _rss_bytes():
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return None
+
+
+def _torch_allocated_bytes():
+    """Bytes held by torch's CUDA caching allocator (CPU tensors are in RSS)"""
+    torch = sys.modules.get("torch")
+    if torch is None or not torch.cuda.is_available():
+        return None
+    return torch.cuda.memory_allocated()
+
+
+def _slope(points):
+    """Least-squares slope of (x, y) points, or None with fewer than two"""
+    points = [(x, y) for x, y in points if y is not None]
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+class MemoryAudit:
+    """
+    tracemalloc-based memory audit for soak runs.
+
+    Call snapshot(turn) every few hundred turns. The first snapshot taken at
+    or after `warmup_turns` is the baseline; growth is the slope of traced
+    Python memory (and RSS) over the later snapshots, so one-off caches that
+    fill during warm-up are not counted as leaks. RSS growth that tracemalloc
+    does not see comes from native allocators (torch, Rust tokenizers).
+    """
+
+    def __init__(self, warmup_turns=100, frames=1, group_by="lineno"):
+        self.warmup_turns = warmup_turns
+        self.frames = frames
+        self.group_by = group_by
+        self.samples = []
+        self.baseline = None
+        self.last = None
+        self._started_tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        return self
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def snapshot(self, turn):
+        """Record memory after `turn` completed turns"""
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        traced, peak = tracemalloc.get_traced_memory()
+        sample = {
+            "turn": turn,
+            "time": time.time(),
+            "traced_bytes": traced,
+            "traced_peak_bytes": peak,
+            "rss_bytes": _rss_bytes(),
+            "torch_cuda_bytes": _torch_allocated_bytes(),
+        }
+        self.samples.append(sample)
+        if self.baseline is None and turn >= self.warmup_turns:
+            self.baseline = snapshot
+            self.baseline_turn = turn
+        self.last = snapshot
+        return sample
+
+    def steady_samples(self):
+        return [s for s in self.samples if s["turn"] >= self.warmup_turns]
+
+    def growth_per_1000_turns(self, key="traced_bytes"):
+        """Steady-state growth in bytes per 1000 turns, or None if unknown"""
+        slope = _slope([(s["turn"], s[key]) for s in self.steady_samples()])
+        return None if slope is None else slope * 1000
+
+    def top_growth(self, limit=15):
+        """Allocation sites that grew most between the baseline and last snapshot"""
+        if self.baseline is None or self.last is None:
+            return []
+        rows = []
+        for stat in self.last.compare_to(self.baseline, self.group_by)[:limit]:
+            frame = stat.traceback[0]
+            rows.append(
+                {
+                    "location": f"{frame.filename}:{frame.lineno}",
+                    "category": categorize(frame.filename),
+                    "size_diff": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                    "size": stat.size,
+                }
+            )
+        return rows
+
+    def growth_by_category(self):
+        """Net growth since the baseline summed per category, in bytes"""
+        if self.baseline is None or self.last is None:
+            return {}
+        totals = {}
+        for stat in self.last.compare_to(self.baseline, "filename"):
+            category = categorize(stat.traceback[0].filename)
+            totals[category] = totals.get(category, 0) + stat.size_diff
+        return dict(sorted(totals.items(), key=lambda item: -abs(item[1])))
+
+    def check(self, max_growth_per_1000_turns):
+        """
+        Returns:
+            tuple: (passed, growth) where growth is traced bytes per 1000 turns;
+                   passes when there are too few steady-state samples to judge
+        """
+        growth = self.growth_per_1000_turns()
+        return growth is None or growth <= max_growth_per_1000_turns, growth
+
+    def report(self, max_growth_per_1000_turns=None):
+        traced_growth = self.growth_per_1000_turns()
+        rss_growth = self.growth_per_1000_turns("rss_bytes")
+        report = {
+            "warmup_turns": self.warmup_turns,
+            "snapshots": len(self.samples),
+            "turns": self.samples[-1]["turn"] if self.samples else 0,
+            "traced_growth_per_1000_turns": traced_growth,
+            "rss_growth_per_1000_turns": rss_growth,
+            "untraced_growth_per_1000_turns": (
+                rss_growth - traced_growth
+                if rss_growth is not None and traced_growth is not None
+                else None
+            ),
+            "growth_by_category": self.growth_by_category(),
+            "top_growth": self.top_growth(),
+        }
+        if max_growth_per_1000_turns is not None:
+            passed, _ = self.check(max_growth_per_1000_turns)
+            report["max_growth_per_1000_turns"] = max_growth_per_1000_turns
+            report["passed"] = passed
+        return report
+
+    def save(
+        self, results_dir="test_results", prefix="memory_audit", report=None, **options
+    ):
+        """
+        Write the samples (CSV) and the report (JSON); returns both paths.
+        `report` is written as given; otherwise report(**options) is computed.
+        """
+        if report is None:
+            report = self.report(**options)
+        os.makedirs(results_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        samples_file = os.path.join(results_dir, f"{prefix}_samples_{timestamp}.csv")
+        with open(samples_file, "w", newline="") as f:
+            if self.samples:
+                writer = csv.DictWriter(f, fieldnames=list(self.samples[0]))
+                writer.writeheader()
+                writer.writerows(self.samples)
+        report_file = os.path.join(results_dir, f"{prefix}_report_{timestamp}.json")
+        with open(report_file, "w") as f:
+            json.dump(report, f, indent=2)
+        return samples_file, report_file
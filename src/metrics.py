@@ -0,0 +1,446 @@
+# src/metrics.py
+import os
+import json
+import math
+import time
+import threading
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; covers cached rule-based replies (~0.1 ms) up to slow model turns
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(labelnames, labelvalues, extra=()):
+    pairs = list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {list(self.labelnames)}, "
+                f"got {sorted(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def _header(self):
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, optionally split by labels"""
+
+    type_name = "counter"
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def total(self):
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self):
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down. A gauge created with `function` is read
+    when the registry is collected (queue depth, memory, cache size).
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels):
+        if self.function is not None:
+            return self.function()
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        if self.function is not None:
+            try:
+                value = self.function()
+            except Exception:
+                return []
+            return [] if value is None else [("", (), (), value)]
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        if self.buckets[-1] != math.inf:
+            self.buckets += (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels):
+        """Context manager observing the duration of its block"""
+        return _Timer(self, labels)
+
+    def count(self, **labels):
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def samples(self):
+        rows = []
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative += bucket_count
+                    le = (("le", _format_value(float(bound))),)
+                    rows.append(("_bucket", key, le, cumulative))
+                rows.append(("_sum", key, (), total))
+                rows.append(("_count", key, (), count))
+        return rows
+
+    def summary(self):
+        """Count, sum, mean and bucket-interpolated percentiles per label set"""
+        result = {}
+        with self._lock:
+            items = [
+                (key, list(counts), total, count)
+                for key, (counts, total, count) in self._values.items()
+            ]
+        for key, bucket_counts, total, count in items:
+            entry = {"count": count, "sum": total, "mean": total / count}
+            for percentile in (50, 90, 99):
+                entry[f"p{percentile}"] = self._estimate(
+                    bucket_counts, count, percentile
+                )
+            result[",".join(key)] = entry
+        return result
+
+    def _estimate(self, bucket_counts, count, percentile):
+        target = percentile / 100.0 * count
+        cumulative = 0
+        lower = 0.0
+        for bound, bucket_count in zip(self.buckets, bucket_counts):
+            if bucket_count and cumulative + bucket_count >= target:
+                if bound == math.inf:
+                    return lower
+                fraction = (target - cumulative) / bucket_count
+                return lower + (bound - lower) * fraction
+            cumulative += bucket_count
+            if bound != math.inf:
+                lower = bound
+        return lower
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """Named metrics of one process, exportable as Prometheus text or JSON"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **options):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **options)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already a {metric.type_name}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=(), function=None):
+        return self._get_or_create(
+            Gauge, name, documentation, labelnames, function=function
+        )
+
+    def histogram(
+        self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS
+    ):
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def reset(self):
+        """Clear recorded values (metric definitions are kept)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+    def to_prometheus(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        for metric in metrics:
+            lines.extend(metric._header())
+            for suffix, key, extra, value in metric.samples():
+                labels = _label_text(metric.labelnames, key, extra)
+                lines.append(f"{metric.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self):
+        """Current values keyed by metric name; histograms are summarized"""
+        result = {}
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        for metric in metrics:
+            if isinstance(metric, Histogram):
+                result[metric.name] = metric.summary()
+            elif metric.labelnames:
+                result[metric.name] = {
+                    ",".join(key): value for _, key, _, value in metric.samples()
+                }
+            else:
+                samples = metric.samples()
+                result[metric.name] = samples[0][3] if samples else None
+        return result
+
+    def dump_json(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {"timestamp": time.strftime("%Y%m%d_%H%M%S"), **self.to_dict()},
+                f,
+                indent=2,
+            )
+        return path
+
+    def serve(self, port=9100, host="127.0.0.1", routes=None, post_routes=None):
+        """
+        Serve /metrics (Prometheus text) and /metrics.json from a daemon thread.
+
+        The endpoints have no authentication, so only localhost is served
+        unless another `host` (e.g. "0.0.0.0") is passed explicitly.
+
+        Args:
+            routes (dict): Extra paths -> handler(query) returning
+                (status, content_type, body); query is a parse_qs dict
+            post_routes (dict): The same for POST-only paths (anything that
+                changes state); their query also includes a form-encoded body
+
+        Returns:
+            ThreadingHTTPServer: call shutdown() to stop it
+        """
+        registry = self
+        routes = routes or {}
+        post_routes = post_routes or {}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/metrics":
+                    handler = self._prometheus
+                elif url.path == "/metrics.json":
+                    handler = self._json
+                elif url.path in routes:
+                    handler = routes[url.path]
+                elif url.path in post_routes:
+                    self.send_response(405)
+                    self.send_header("Allow", "POST")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                else:
+                    self.send_error(404)
+                    return
+                self._call(handler, parse_qs(url.query))
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                if url.path not in post_routes:
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                form = self.rfile.read(length).decode("utf-8") if length else ""
+                query = parse_qs(url.query)
+                for name, values in parse_qs(form).items():
+                    query.setdefault(name, []).extend(values)
+                self._call(post_routes[url.path], query)
+
+            def _call(self, handler, query):
+                try:
+                    status, content_type, body = handler(query)
+                except Exception as e:
+                    status, content_type = 500, "text/plain; charset=utf-8"
+                    body = f"{type(e).__name__}: {e}\n"
+                self._reply(status, content_type, body)
+
+            def _prometheus(self, query):
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+                return 200, content_type, registry.to_prometheus()
+
+            def _json(self, query):
+                return 200, "application/json", json.dumps(registry.to_dict())
+
+            def _reply(self, status, content_type, body):
+                body = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        return server
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _resident_memory_bytes():
+    """Current RSS; None (no sample) where it cannot be read"""
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        # Linux: the second field of statm is resident pages
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+REGISTRY.gauge(
+    "process_resident_memory_bytes",
+    "Resident memory of this process in bytes",
+    function=_resident_memory_bytes,
+)
+
+# Latency of each traced stage (see tracing.py), fed by SpanMetricsExporter
+STAGE_LATENCY = REGISTRY.histogram(
+    "pipeline_stage_latency_seconds", "Latency of each pipeline stage", ["stage"]
+)
+
+
+class SpanMetricsExporter:
+    """Tracing exporter that records every span's duration in STAGE_LATENCY"""
+
+    def __init__(self, histogram=STAGE_LATENCY):
+        self.histogram = histogram
+
+    def __call__(self, root):
+        for node, _ in root.walk():
+            if node.duration is not None:
+                self.histogram.observe(node.duration, stage=node.name)
@@ -0,0 +1,519 @@
+# src/profiling.py
+import os
+import sys
+import time
+import html
+import shutil
+import signal
+import pstats
+import cProfile
+import hashlib
+import threading
+import subprocess
+import contextlib
+from collections import Counter
+from datetime import datetime
+
+DEFAULT_OUTPUT_DIR = "test_reports"
+MODES = ("sample", "cprofile", "yappi", "py-spy")
+
+_session = None
+_session_lock = threading.Lock()
+_request_profiler = None
+_torch_session = None
+
+
+def _frame_name(frame, include_lines=False):
+    code = frame.f_code
+    location = os.path.basename(code.co_filename)
+    if include_lines:
+        location += f":{frame.f_lineno}"
+    return f"{code.co_name} ({location})"
+
+
+class StackSampler:
+    """
+    Samples the stacks of all other threads every `interval` seconds.
+
+    Overhead is one sys._current_frames() call per interval, so it can run
+    against a live chatbot; the application threads are never instrumented.
+    """
+
+    def __init__(self, interval=0.005, include_lines=False):
+        self.interval = interval
+        self.include_lines = include_lines
+        self.stacks = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        own_id = threading.get_ident()
+        start = time.perf_counter()
+        while not self._stop.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame, self.include_lines))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+            self._stop.wait(self.interval)
+        self.duration = time.perf_counter() - start
+
+
+def write_collapsed(stacks, path):
+    """Brendan Gregg's collapsed format: 'frame;frame;frame count' per line"""
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in sorted(stacks.items()):
+            f.write(f"{stack} {count}\n")
+    return path
+
+
+def read_collapsed(path):
+    stacks = Counter()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+def _build_tree(stacks):
+    root = {"name": "all", "value": 0, "children": {}}
+    for stack, count in stacks.items():
+        root["value"] += count
+        node = root
+        for frame in stack.split(";"):
+            child = node["children"].get(frame)
+            if child is None:
+                child = node["children"][frame] = {
+                    "name": frame,
+                    "value": 0,
+                    "children": {},
+                }
+            child["value"] += count
+            node = child
+    return root
+
+
+def _color(name):
+    # Stable warm colours, like flamegraph.pl's "hot" palette
+    digest = hashlib.md5(name.encode("utf-8")).digest()
+    return f"rgb({205 + digest[0] % 50},{digest[1] % 230},{digest[2] % 55})"
+
+
+def render_flamegraph(
+    stacks, path, title="Flame Graph", width=1200, frame_height=16
+):
+    """Write collapsed stacks as a standalone SVG flame graph (root at bottom)"""
+    root = _build_tree(stacks)
+    total = root["value"] or 1
+    rects = []
+    max_depth = 0
+
+    def layout(node, x, depth):
+        nonlocal max_depth
+        max_depth = max(max_depth, depth)
+        rects.append((node, x, depth))
+        child_x = x
+        for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+            layout(child, child_x, depth + 1)
+            child_x += child["value"]
+
+    layout(root, 0, 0)
+
+    top_margin = 30
+    height = (max_depth + 1) * frame_height + top_margin + 10
+    scale = (width - 20) / total
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="Verdana" font-size="11">',
+        '<rect width="100%" height="100%" fill="#f8f8f8"/>',
+        f'<text x="{width / 2}" y="20" text-anchor="middle" font-size="15">'
+        f"{html.escape(title)}</text>",
+    ]
+    for node, x, depth in rects:
+        rect_width = node["value"] * scale
+        if rect_width < 0.5:
+            continue
+        rect_x = 10 + x * scale
+        rect_y = height - 10 - (depth + 1) * frame_height
+        percent = 100.0 * node["value"] / total
+        label = html.escape(node["name"])
+        parts.append(
+            f'<g><title>{label} ({node["value"]} samples, {percent:.2f}%)</title>'
+            f'<rect x="{rect_x:.1f}" y="{rect_y}" width="{rect_width:.1f}" '
+            f'height="{frame_height - 1}" fill="{_color(node["name"])}" rx="2"/>'
+        )
+        max_chars = int(rect_width / 7)
+        if max_chars >= 3:
+            text = node["name"]
+            if len(text) > max_chars:
+                text = text[: max_chars - 2] + ".."
+            parts.append(
+                f'<text x="{rect_x + 3:.1f}" y="{rect_y + frame_height - 4}">'
+                f"{html.escape(text)}</text>"
+            )
+        parts.append("</g>")
+    parts.append("</svg>")
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+    return path
+
+
+class RequestProfiler:
+    """
+    Collects cProfile statistics for every request wrapped in profile_request()
+    while it is active. cProfile only sees the thread that enables it, so
+    each request is profiled on its own thread and the results are merged.
+    """
+
+    def __init__(self):
+        self._stats = None
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def add(self, profile):
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+            self.requests += 1
+
+    def stats(self):
+        return self._stats
+
+
+class _ProfiledRequest:
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.profile = cProfile.Profile()
+
+    def __enter__(self):
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profile.disable()
+        self.profiler.add(self.profile)
+        return False
+
+
+_NOT_PROFILED = contextlib.nullcontext()
+
+
+def profile_request():
+    """Context manager for request handling; a shared no-op unless cProfile is on"""
+    profiler = _request_profiler
+    if profiler is None:
+        return _NOT_PROFILED
+    return _ProfiledRequest(profiler)
+
+
+class ProfileSession:
+    """One profiling run; outputs are written when it finishes"""
+
+    def __init__(self, mode, seconds, output_dir=DEFAULT_OUTPUT_DIR, interval=0.005):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r}; choose from {MODES}")
+        self.mode = mode
+        self.seconds = seconds
+        self.output_dir = output_dir
+        self.interval = interval
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.outputs = []
+        self.error = None
+        self.done = threading.Event()
+        self._sampler = None
+        self._process = None
+
+    def _path(self, extension):
+        return os.path.join(
+            self.output_dir, f"profile_{self.mode}_{self.timestamp}.{extension}"
+        )
+
+    def start(self):
+        global _request_profiler
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.mode == "sample":
+            self._sampler = StackSampler(self.interval).start()
+        elif self.mode == "cprofile":
+            _request_profiler = RequestProfiler()
+        elif self.mode == "yappi":
+            import yappi
+
+            yappi.set_clock_type("wall")
+            yappi.clear_stats()
+            yappi.start()
+        elif self.mode == "py-spy":
+            executable = shutil.which("py-spy")
+            if executable is None:
+                raise RuntimeError("py-spy is not installed (pip install py-spy)")
+            self._process = subprocess.Popen(
+                [
+                    executable,
+                    "record",
+                    "--pid",
+                    str(os.getpid()),
+                    "--duration",
+                    str(int(max(self.seconds, 1))),
+                    "--output",
+                    self._path("svg"),
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+        return self
+
+    def finish(self):
+        global _request_profiler
+        try:
+            if self.mode == "sample":
+                stacks = self._sampler.stop()
+                self.outputs.append(write_collapsed(stacks, self._path("folded")))
+                self.outputs.append(
+                    render_flamegraph(
+                        stacks,
+                        self._path("svg"),
+                        title=f"{self._sampler.samples} samples over "
+                        f"{self._sampler.duration:.1f}s",
+                    )
+                )
+            elif self.mode == "cprofile":
+                profiler, _request_profiler = _request_profiler, None
+                if profiler.stats() is not None:
+                    self.outputs.append(self._write_pstats(profiler.stats()))
+            elif self.mode == "yappi":
+                import yappi
+
+                yappi.stop()
+                path = self._path("prof")
+                yappi.get_func_stats().save(path, type="pstat")
+                self.outputs.append(path)
+                self.outputs.append(self._write_pstats(pstats.Stats(path)))
+            elif self.mode == "py-spy":
+                _, stderr = self._process.communicate()
+                if self._process.returncode != 0:
+                    raise RuntimeError(stderr.decode(errors="replace").strip())
+                self.outputs.append(self._path("svg"))
+        except Exception as e:
+            self.error = str(e)
+            print(f"Error in profiling session: {self.error}")
+        finally:
+            self.done.set()
+        return self.outputs
+
+    def _write_pstats(self, stats):
+        """Raw .prof for snakeviz/pstats plus a cumulative-time text summary"""
+        prof_path = self._path("prof")
+        stats.dump_stats(prof_path)
+        text_path = self._path("txt")
+        with open(text_path, "w") as f:
+            stats.stream = f
+            stats.sort_stats("cumulative").print_stats(40)
+        return text_path
+
+
+def profile_for(seconds=10, mode="sample", output_dir=DEFAULT_OUTPUT_DIR, wait=False):
+    """
+    Profile the running process for `seconds` without stopping it.
+
+    Only one session runs at a time. With wait=False the session finishes on
+    a timer thread; check session.done / session.outputs.
+
+    Returns:
+        ProfileSession
+    """
+    global _session
+    with _session_lock:
+        if _session is not None and not _session.done.is_set():
+            raise RuntimeError("A profiling session is already running")
+        session = ProfileSession(mode, seconds, output_dir).start()
+        _session = session
+
+    def finish_later():
+        time.sleep(seconds)
+        outputs = session.finish()
+        if outputs:
+            print(f"Profile saved to: {', '.join(outputs)}")
+
+    if wait:
+        finish_later()
+    else:
+        threading.Thread(target=finish_later, name="profile-timer", daemon=True).start()
+    return session
+
+
+def install_signal_handler(
+    seconds=10, mode="sample", output_dir=DEFAULT_OUTPUT_DIR, signum=None
+):
+    """
+    Start a profiling session whenever the process receives SIGUSR2
+    (e.g. `kill -USR2 <pid>`). Not available on Windows.
+    """
+    signum = signum or getattr(signal, "SIGUSR2", None)
+    if signum is None:
+        print("Profiling signal handler is not supported on this platform")
+        return False
+
+    def handler(signum, frame):
+        try:
+            profile_for(seconds, mode, output_dir)
+            print(f"Profiling ({mode}) for {seconds} seconds...")
+        except RuntimeError as e:
+            print(str(e))
+
+    signal.signal(signum, handler)
+    return True
+
+
+def http_route(query):
+    """
+    POST route for the metrics server: /profile?seconds=10&mode=sample starts
+    a session and returns immediately; /profile?mode=torch&calls=5 profiles
+    the next forward passes with torch.profiler. Invalid parameters get a 400.
+    """
+    mode = query.get("mode", ["sample"])[0]
+    try:
+        if mode == "torch":
+            calls = int(query.get("calls", ["5"])[0])
+            if calls < 1:
+                raise ValueError("calls must be at least 1")
+        else:
+            seconds = float(query.get("seconds", ["10"])[0])
+            if not 0 < seconds < float("inf"):
+                raise ValueError("seconds must be a positive number")
+    except ValueError as e:
+        return 400, "text/plain; charset=utf-8", f"Invalid parameter: {e}\n"
+
+    if mode == "torch":
+        session = start_torch_profiling(calls)
+        return (
+            202,
+            "text/plain; charset=utf-8",
+            f"Profiling the next {calls} forward passes; output in "
+            f"{session.output_dir}/torch_*_{session.timestamp}_*\n",
+        )
+
+    try:
+        session = profile_for(seconds, mode)
+    except ValueError as e:
+        return 400, "text/plain; charset=utf-8", f"{e}\n"
+    except (RuntimeError, ImportError) as e:
+        return 409, "text/plain; charset=utf-8", f"{e}\n"
+    return (
+        202,
+        "text/plain; charset=utf-8",
+        f"Profiling ({mode}) for {seconds:g} seconds; output in "
+        f"{session.output_dir}/profile_{mode}_{session.timestamp}.*\n",
+    )
+
+
+class TorchForwardSession:
+    """Profiles up to `max_calls` forward passes with torch.profiler"""
+
+    def __init__(self, max_calls=5, output_dir=DEFAULT_OUTPUT_DIR):
+        self.max_calls = max_calls
+        self.output_dir = output_dir
+        self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.calls = 0
+        self.outputs = []
+        self._lock = threading.Lock()
+
+    def claim(self):
+        """Number of this call, or None once max_calls have been claimed"""
+        global _torch_session
+        with self._lock:
+            if self.calls >= self.max_calls:
+                return None
+            self.calls += 1
+            if self.calls == self.max_calls and _torch_session is self:
+                # Later forward passes go back to the shared no-op
+                _torch_session = None
+            return self.calls
+
+
+class _ProfiledForward:
+    def __init__(self, session, call, name):
+        self.session = session
+        self.call = call
+        self.name = name
+
+    def __enter__(self):
+        import torch
+        from torch.profiler import ProfilerActivity, profile, record_function
+
+        activities = [ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(ProfilerActivity.CUDA)
+        self.prof = profile(activities=activities, record_shapes=True)
+        self.prof.__enter__()
+        self.record = record_function(self.name)
+        self.record.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record.__exit__(exc_type, exc, tb)
+        self.prof.__exit__(exc_type, exc, tb)
+        if exc_type is not None:
+            return False
+
+        session = self.session
+        base = os.path.join(
+            session.output_dir, f"torch_{self.name}_{session.timestamp}_{self.call}"
+        )
+        self.prof.export_chrome_trace(f"{base}.json")
+        with open(f"{base}.txt", "w") as f:
+            f.write(
+                self.prof.key_averages(group_by_input_shape=True).table(
+                    sort_by="self_cpu_time_total", row_limit=30
+                )
+            )
+        session.outputs.extend([f"{base}.json", f"{base}.txt"])
+        return False
+
+
+def start_torch_profiling(max_calls=5, output_dir=DEFAULT_OUTPUT_DIR):
+    """Profile the next `max_calls` model forward passes"""
+    global _torch_session
+    os.makedirs(output_dir, exist_ok=True)
+    _torch_session = TorchForwardSession(max_calls, output_dir)
+    return _torch_session
+
+
+def torch_forward_profile(name="forward"):
+    """
+    Context manager for a model forward pass; the shared no-op unless
+    start_torch_profiling() is active. Profiled calls are recorded with
+    torch.profiler and written as a Chrome trace plus an operator table.
+    The session clears itself once its last call is claimed.
+    """
+    session = _torch_session
+    if session is None:
+        return _NOT_PROFILED
+    call = session.claim()
+    if call is None:
+        return _NOT_PROFILED
+    return _ProfiledForward(session, call, name)
@@ -1,5 +1,6 @@
 # src/response_generator.py
 import random
+import tracing
 from fashion_mapping import FashionMapping
 from clothing_selector import generate_clothing_selection
 
@@ -120,6 +121,7 @@ class ResponseGenerator:
 
         self.fashion_mapping = FashionMapping()
 
+    @tracing.traced("response.generate")
     def generate_response(self, parameters):
         """
         Generate response based on extracted parameters
@@ -187,6 +189,7 @@ class ResponseGenerator:
 
         return "casual"
 
+    @tracing.traced("response.item_selection")
     def _get_clothing_items(self, gender_style):
         """Get clothing items based on gender and style"""
         # Default to casual pria if not found
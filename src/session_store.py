@@ -0,0 +1,257 @@
+# src/session_store.py
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from conversation_state import ConversationState, deep_sizeof
+
+DEFAULT_TTL_SECONDS = 30 * 60
+
+
+def new_session_state():
+    """Conversation state for a session that has not said anything yet"""
+    return ConversationState()
+
+
+class SessionStore(ABC):
+    """
+    Conversation state keyed by session id.
+
+    get() returns None for unknown or expired sessions. Every put() restarts
+    the session's time-to-live, so a session expires `ttl_seconds` after its
+    last turn.
+    """
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    def get(self, session_id):
+        """ConversationState of the session, or None"""
+
+    @abstractmethod
+    def put(self, session_id, state):
+        """Store the state and restart the session's time-to-live"""
+
+    @abstractmethod
+    def delete(self, session_id):
+        """Forget the session; unknown ids are ignored"""
+
+    def evict_expired(self):
+        """Drop expired sessions; returns how many were removed"""
+        return 0
+
+    @abstractmethod
+    def __len__(self):
+        """Number of live sessions"""
+
+    def close(self):
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Sessions in a dict, ordered by last use.
+
+    Expired sessions are dropped lazily: the least recently used entries sit
+    at the front, so every put() only has to look at the front of the order.
+    `max_sessions` bounds memory; the least recently used session goes first.
+    States are stored as-is, not copied.
+    """
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS, max_sessions=None):
+        super().__init__(ttl_seconds)
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "expired": 0, "evicted": 0}
+
+    def _expired(self, expires_at, now):
+        return self.ttl_seconds is not None and expires_at <= now
+
+    def get(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if self._expired(entry[0], now):
+                del self._sessions[session_id]
+                self.stats["expired"] += 1
+                return None
+            return entry[1]
+
+    def put(self, session_id, state):
+        now = time.monotonic()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else None
+        with self._lock:
+            if session_id not in self._sessions:
+                self.stats["created"] += 1
+            self._sessions[session_id] = (expires_at, state)
+            self._sessions.move_to_end(session_id)
+            self._evict_locked(now)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _evict_locked(self, now):
+        removed = 0
+        while self._sessions:
+            session_id, (expires_at, _) = next(iter(self._sessions.items()))
+            if not self._expired(expires_at, now):
+                break
+            del self._sessions[session_id]
+            self.stats["expired"] += 1
+            removed += 1
+        if self.max_sessions is not None:
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.stats["evicted"] += 1
+                removed += 1
+        return removed
+
+    def evict_expired(self):
+        with self._lock:
+            return self._evict_locked(time.monotonic())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def memory_bytes(self):
+        """Approximate bytes held by all live sessions (walks every state)"""
+        with self._lock:
+            return deep_sizeof(self._sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions in a local SQLite file, so they survive restarts and can be
+    shared by several worker processes on one machine. ConversationStates
+    are stored as JSON. Expired rows are deleted every `sweep_every` writes.
+    """
+
+    def __init__(self, path, ttl_seconds=DEFAULT_TTL_SECONDS, sweep_every=1000):
+        super().__init__(ttl_seconds)
+        self.path = path
+        self.sweep_every = sweep_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)"
+        )
+        self._connection.commit()
+
+    def get(self, session_id):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT state FROM sessions WHERE session_id = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (session_id, time.time()),
+            ).fetchone()
+        return ConversationState.from_dict(json.loads(row[0])) if row else None
+
+    def put(self, session_id, state):
+        expires_at = (
+            time.time() + self.ttl_seconds if self.ttl_seconds is not None else None
+        )
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, state, expires_at) "
+                "VALUES (?, ?, ?)",
+                (session_id, json.dumps(state.to_dict()), expires_at),
+            )
+            self._connection.commit()
+            self._writes += 1
+            sweep = self._writes % self.sweep_every == 0
+        if sweep:
+            self.evict_expired()
+
+    def delete(self, session_id):
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+            self._connection.commit()
+
+    def evict_expired(self):
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)
+            )
+            self._connection.commit()
+            return cursor.rowcount
+
+    def __len__(self):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM sessions "
+                "WHERE expires_at IS NULL OR expires_at > ?",
+                (time.time(),),
+            ).fetchone()
+        return row[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions in Redis (or anything that speaks its protocol, e.g. Valkey or
+    KeyDB), for several chatbot processes behind a load balancer. Redis
+    expires keys itself.
+
+    Args:
+        client: A redis-py compatible client (get, set with ex=, delete, scan_iter)
+    """
+
+    def __init__(self, client, ttl_seconds=DEFAULT_TTL_SECONDS, prefix="session:"):
+        super().__init__(ttl_seconds)
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, session_id):
+        value = self.client.get(self.prefix + session_id)
+        if value is None:
+            return None
+        return ConversationState.from_dict(json.loads(value))
+
+    def put(self, session_id, state):
+        ttl = int(self.ttl_seconds) if self.ttl_seconds is not None else None
+        value = json.dumps(state.to_dict())
+        self.client.set(self.prefix + session_id, value, ex=ttl)
+
+    def delete(self, session_id):
+        self.client.delete(self.prefix + session_id)
+
+    def __len__(self):
+        return sum(1 for _ in self.client.scan_iter(match=self.prefix + "*"))
+
+
+def create_session_store(url="memory", ttl_seconds=DEFAULT_TTL_SECONDS):
+    """
+    Build a store from a URL: "memory", "sqlite:///path/to/sessions.db" or
+    "redis://host:6379/0" (needs the redis package).
+    """
+    if url == "memory":
+        return InMemorySessionStore(ttl_seconds=ttl_seconds)
+    if url.startswith("sqlite:///"):
+        return SQLiteSessionStore(url[len("sqlite:///") :], ttl_seconds=ttl_seconds)
+    if url.startswith(("redis://", "rediss://")):
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("Install the redis package to use a Redis session store")
+        return RedisSessionStore(redis.Redis.from_url(url), ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown session store: {url}")
@@ -0,0 +1,226 @@
+# src/speech_backend.py
+import os
+from abc import ABC, abstractmethod
+import azure.cognitiveservices.speech as speechsdk
+from dotenv import load_dotenv
+from audio_assets import get_audio_manager
+from audio_player import AudioPlayer
+from local_speech import (
+    METADATA_FILE,
+    LocalAudioPlayer,
+    LocalSpeechRecognizer,
+    LocalSpeechSynthesizer,
+    load_audio_transcripts,
+)
+from vad import to_pcm16
+
+RECOGNITION_LANGUAGE = "id-ID"
+VOICE_NAME = "id-ID-GadisNeural"
+
+
+class SpeechBackend(ABC):
+    """
+    Creates the speech objects used by the voice pipeline.
+
+    Recognizers and synthesizers follow the Azure Speech SDK interface
+    (recognize_once, continuous recognition events, speak_ssml_async, ...)
+    so the chatbot and test runners work unchanged on any backend.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def create_recognizer(self, audio_file=None, segment=None):
+        """
+        Recognizer for the microphone, or for one audio file if given.
+        With a vad.SpeechSegment only that part of the file is sent.
+        """
+
+    @abstractmethod
+    def create_synthesizer(self, play_audio=True):
+        """Synthesizer that plays to the speaker, or only returns audio bytes"""
+
+    @abstractmethod
+    def create_audio_player(self):
+        """Player for cached audio clips"""
+
+
+class AzureSpeechBackend(SpeechBackend):
+    """Azure Cognitive Services Speech, configured from the .env file"""
+
+    name = "azure"
+
+    def __init__(
+        self,
+        speech_key=None,
+        speech_region=None,
+        initial_silence_timeout_ms=None,
+        end_silence_timeout_ms=None,
+    ):
+        """
+        Args:
+            speech_key (str): Defaults to AZURE_SPEECH_KEY
+            speech_region (str): Defaults to AZURE_SPEECH_REGION
+            initial_silence_timeout_ms (int): Give up if nobody speaks this long
+            end_silence_timeout_ms (int): Silence that ends an utterance; lower
+                values finalize microphone results sooner
+        """
+        load_dotenv()
+        speech_key = speech_key or os.getenv("AZURE_SPEECH_KEY")
+        speech_region = speech_region or os.getenv("AZURE_SPEECH_REGION")
+
+        if not speech_key or not speech_region:
+            raise ValueError("Azure Speech credentials not found in .env file")
+
+        self.speech_config = speechsdk.SpeechConfig(
+            subscription=speech_key, region=speech_region
+        )
+        self.speech_config.speech_recognition_language = RECOGNITION_LANGUAGE
+        self.speech_config.speech_synthesis_language = RECOGNITION_LANGUAGE
+        self.speech_config.speech_synthesis_voice_name = VOICE_NAME
+        # RIFF output so result.audio_data is a playable WAV for the TTS cache
+        self.speech_config.set_speech_synthesis_output_format(
+            speechsdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm
+        )
+
+        # Service-side endpointing for the microphone, where we never see the audio
+        if initial_silence_timeout_ms is not None:
+            self.speech_config.set_property(
+                speechsdk.PropertyId.SpeechServiceConnection_InitialSilenceTimeoutMs,
+                str(initial_silence_timeout_ms),
+            )
+        if end_silence_timeout_ms is not None:
+            self.speech_config.set_property(
+                speechsdk.PropertyId.SpeechServiceConnection_EndSilenceTimeoutMs,
+                str(end_silence_timeout_ms),
+            )
+            self.speech_config.set_property(
+                speechsdk.PropertyId.Speech_SegmentationSilenceTimeoutMs,
+                str(end_silence_timeout_ms),
+            )
+
+    def create_recognizer(self, audio_file=None, segment=None):
+        if audio_file and segment is not None:
+            audio_config = self._segment_audio_config(audio_file, segment)
+        elif audio_file:
+            audio_config = speechsdk.audio.AudioConfig(filename=audio_file)
+        else:
+            return speechsdk.SpeechRecognizer(speech_config=self.speech_config)
+        return speechsdk.SpeechRecognizer(
+            speech_config=self.speech_config, audio_config=audio_config
+        )
+
+    def _segment_audio_config(self, audio_file, segment):
+        """Stream just the speech segment of a file to the service"""
+        asset = get_audio_manager().load(audio_file)
+        start = int(segment.start * asset.sample_rate)
+        end = int(segment.end * asset.sample_rate)
+
+        stream_format = speechsdk.audio.AudioStreamFormat(
+            samples_per_second=asset.sample_rate, bits_per_sample=16, channels=1
+        )
+        stream = speechsdk.audio.PushAudioInputStream(stream_format=stream_format)
+        stream.write(to_pcm16(asset.samples[start:end]))
+        stream.close()
+        return speechsdk.audio.AudioConfig(stream=stream)
+
+    def create_synthesizer(self, play_audio=True):
+        if play_audio:
+            return speechsdk.SpeechSynthesizer(speech_config=self.speech_config)
+        return speechsdk.SpeechSynthesizer(
+            speech_config=self.speech_config, audio_config=None
+        )
+
+    def create_audio_player(self):
+        return AudioPlayer()
+
+
+class LocalSpeechBackend(SpeechBackend):
+    """
+    Offline backend for benchmarks and regression tests.
+
+    Recognition replays the expected transcripts from audio_metadata.csv
+    (a whole session for the microphone, or the matching entry for a file)
+    and synthesis produces silent audio of realistic length. Latency and
+    error rates can be injected for both.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        metadata_file=METADATA_FILE,
+        utterances=None,
+        time_scale=0.0,
+        recognition_latency=0.0,
+        synthesis_latency=0.0,
+        recognition_error_rate=0.0,
+        synthesis_error_rate=0.0,
+        seed=None,
+    ):
+        """
+        Args:
+            metadata_file (str): Path to audio_metadata.csv
+            utterances (list): What microphone recognizers replay (default: all entries)
+            time_scale (float): Multiplier for audio durations (0 = no real-time waits)
+            recognition_latency (float): Seconds added before each recognition result
+            synthesis_latency (float): Seconds before the first audio of each synthesis
+            recognition_error_rate (float): Fraction of recognitions that fail
+            synthesis_error_rate (float): Fraction of syntheses that are canceled
+            seed (int): Seed for error injection
+        """
+        self.metadata_file = metadata_file
+        self.entries = load_audio_transcripts(metadata_file)
+        self.utterances = utterances if utterances is not None else self.entries
+        self.time_scale = time_scale
+        self.recognition_latency = recognition_latency
+        self.synthesis_latency = synthesis_latency
+        self.recognition_error_rate = recognition_error_rate
+        self.synthesis_error_rate = synthesis_error_rate
+        self.seed = seed
+        self._created = 0
+
+    def _next_seed(self):
+        # Different but reproducible error patterns for each created object
+        self._created += 1
+        return None if self.seed is None else self.seed + self._created
+
+    def create_recognizer(self, audio_file=None, segment=None):
+        options = {
+            "time_scale": self.time_scale,
+            "latency": self.recognition_latency,
+            "error_rate": self.recognition_error_rate,
+            "seed": self._next_seed(),
+        }
+        if audio_file:
+            recognizer = LocalSpeechRecognizer.from_audio_files(
+                [audio_file], metadata_file=self.metadata_file, **options
+            )
+            if segment is not None:
+                # Replay only as long as the trimmed audio would take
+                recognizer.utterances[0] = dict(
+                    recognizer.utterances[0], duration_seconds=segment.duration
+                )
+            return recognizer
+        return LocalSpeechRecognizer(self.utterances, **options)
+
+    def create_synthesizer(self, play_audio=True):
+        return LocalSpeechSynthesizer(
+            play_audio=play_audio,
+            latency=self.synthesis_latency,
+            time_scale=self.time_scale,
+            error_rate=self.synthesis_error_rate,
+            seed=self._next_seed(),
+        )
+
+    def create_audio_player(self):
+        return LocalAudioPlayer(time_scale=self.time_scale)
+
+
+def create_speech_backend(name="azure", **options):
+    """Build a speech backend by name ("azure" or "local")"""
+    if name == "azure":
+        return AzureSpeechBackend(**options)
+    if name == "local":
+        return LocalSpeechBackend(**options)
+    raise ValueError(f"Unknown speech backend: {name}")
@@ -0,0 +1,137 @@
+# src/speech_eval.py
+import os
+import csv
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import azure.cognitiveservices.speech as speechsdk
+
+# Cancellation codes worth retrying; anything else (bad key, bad request) is final
+TRANSIENT_ERROR_CODES = {
+    speechsdk.CancellationErrorCode.TooManyRequests,
+    speechsdk.CancellationErrorCode.ConnectionFailure,
+    speechsdk.CancellationErrorCode.ServiceTimeout,
+    speechsdk.CancellationErrorCode.ServiceError,
+    speechsdk.CancellationErrorCode.ServiceUnavailable,
+}
+
+
+def is_transient_failure(result):
+    """True if a canceled recognition is likely to succeed when retried"""
+    if result.reason != speechsdk.ResultReason.Canceled:
+        return False
+    details = getattr(result, "cancellation_details", None)
+    code = getattr(details, "code", None)
+    return code in TRANSIENT_ERROR_CODES
+
+
+def recognize_with_retry(
+    speech_backend, filepath, max_retries=3, backoff=0.5, segment=None
+):
+    """
+    Recognize one audio file, retrying transient failures with exponential
+    backoff and jitter. With a vad.SpeechSegment only the speech is sent.
+
+    Returns:
+        tuple: (result, processing_time of the last attempt, attempts)
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            # Recognizers are bound to one audio file; the backend's
+            # SpeechConfig is shared by all of them
+            recognizer = speech_backend.create_recognizer(
+                audio_file=filepath, segment=segment
+            )
+            start_time = time.time()
+            result = recognizer.recognize_once()
+            processing_time = time.time() - start_time
+        except Exception:
+            if attempt > max_retries:
+                raise
+        else:
+            if attempt > max_retries or not is_transient_failure(result):
+                return result, processing_time, attempt
+
+        delay = backoff * (2 ** (attempt - 1))
+        time.sleep(delay + random.uniform(0, delay / 2))
+
+
+class StreamingCSVWriter:
+    """Appends result rows to a CSV file as they arrive, from any thread"""
+
+    def __init__(self, path, fieldnames):
+        self.path = path
+        self.fieldnames = fieldnames
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", newline="") as f:
+            csv.DictWriter(f, fieldnames=fieldnames).writeheader()
+
+    def write(self, row):
+        with self._lock:
+            with open(self.path, "a", newline="") as f:
+                csv.DictWriter(
+                    f, fieldnames=self.fieldnames, extrasaction="ignore"
+                ).writerow(row)
+
+
+def run_parallel_recognition(
+    speech_backend,
+    jobs,
+    evaluate,
+    results_file,
+    fieldnames,
+    max_workers=4,
+    max_retries=3,
+    backoff=0.5,
+):
+    """
+    Recognize many audio files with a bounded number of concurrent requests.
+
+    Args:
+        speech_backend (SpeechBackend): Backend shared by all workers
+        jobs (list): Dicts with a "filepath" key and optionally a "segment"
+        evaluate (callable): evaluate(job, result, processing_time) -> result row
+        results_file (str): CSV that rows are streamed to as they complete
+        fieldnames (list): CSV columns
+        max_workers (int): Maximum recognitions in flight
+        max_retries (int): Retries per file for transient failures
+        backoff (float): Initial retry delay in seconds
+
+    Returns:
+        list: Result rows in the order of `jobs`
+    """
+    writer = StreamingCSVWriter(results_file, fieldnames)
+    rows = [None] * len(jobs)
+
+    def run_job(job):
+        result, processing_time, attempts = recognize_with_retry(
+            speech_backend,
+            job["filepath"],
+            max_retries,
+            backoff,
+            segment=job.get("segment"),
+        )
+        row = evaluate(job, result, processing_time)
+        row["attempts"] = attempts
+        return row
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_job, job): i for i, job in enumerate(jobs)}
+        for completed, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                row = future.result()
+            except Exception as e:
+                print(f"Error testing {jobs[i]['filepath']}: {str(e)}")
+                continue
+            rows[i] = row
+            writer.write(row)
+            print(f"Completed {completed}/{len(jobs)}: {jobs[i]['filepath']}")
+
+    return [row for row in rows if row is not None]
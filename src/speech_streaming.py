@@ -0,0 +1,115 @@
+# src/speech_streaming.py
+import re
+import queue
+import logging
+import threading
+import azure.cognitiveservices.speech as speechsdk
+from structured_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+
+class ContinuousListener:
+    """
+    Wraps a speech recognizer in continuous recognition mode.
+
+    Recognition keeps running between turns. Interim hypotheses are passed to
+    `on_partial` as they arrive and final results are queued until `listen()`
+    collects them. Works with `speechsdk.SpeechRecognizer` and with
+    `local_speech.LocalSpeechRecognizer`.
+    """
+
+    def __init__(self, recognizer, on_partial=None):
+        self.recognizer = recognizer
+        self.on_partial = on_partial
+        self.final_results = queue.Queue()
+        self.is_running = False
+        self._lock = threading.Lock()
+
+        self.recognizer.recognizing.connect(self._handle_recognizing)
+        self.recognizer.recognized.connect(self._handle_recognized)
+        self.recognizer.canceled.connect(self._handle_canceled)
+        self.recognizer.session_stopped.connect(self._handle_session_stopped)
+
+    def start(self):
+        """Start continuous recognition if it is not already running"""
+        with self._lock:
+            if self.is_running:
+                return
+            self.recognizer.start_continuous_recognition_async().get()
+            self.is_running = True
+
+    def stop(self):
+        """Stop continuous recognition"""
+        with self._lock:
+            if not self.is_running:
+                return
+            self.recognizer.stop_continuous_recognition_async().get()
+            self.is_running = False
+
+    def listen(self, timeout=None):
+        """
+        Wait for the next final recognition result.
+
+        Returns:
+            str: Recognized text, "" on no match or cancellation,
+                 or None if the timeout expired or the session ended.
+        """
+        self.start()
+        try:
+            return self.final_results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _handle_recognizing(self, evt):
+        if self.on_partial and evt.result.text:
+            try:
+                self.on_partial(evt.result.text)
+            except Exception as e:
+                # Partials arrive several times per second; don't flood the log
+                log_event(
+                    logger,
+                    logging.ERROR,
+                    "Error in partial result handler: %s",
+                    e,
+                    sample_every=20,
+                )
+
+    def _handle_recognized(self, evt):
+        if evt.result.reason == speechsdk.ResultReason.RecognizedSpeech:
+            self.final_results.put(evt.result.text)
+        elif evt.result.reason == speechsdk.ResultReason.NoMatch:
+            self.final_results.put("")
+
+    def _handle_canceled(self, evt):
+        logger.warning(
+            "Speech recognition dibatalkan: %s", evt.cancellation_details.reason
+        )
+        self.final_results.put("")
+
+    def _handle_session_stopped(self, evt):
+        self.is_running = False
+        self.final_results.put(None)
+
+
+def split_sentences(text, min_chars=20):
+    """
+    Split a response into sentence chunks for incremental synthesis.
+
+    Very short sentences are merged into the following one so each chunk is
+    worth a synthesis request of its own.
+    """
+    sentences = [s for s in re.split(r"(?<=[.!?])\s+", text.strip()) if s]
+    chunks = []
+    pending = ""
+    for sentence in sentences:
+        pending = f"{pending} {sentence}".strip()
+        if len(pending) >= min_chars:
+            chunks.append(pending)
+            pending = ""
+    if pending:
+        if chunks:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
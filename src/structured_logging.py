@@ -0,0 +1,231 @@
+# src/structured_logging.py
+import os
+import sys
+import json
+import uuid
+import queue
+import atexit
+import logging
+import threading
+import contextlib
+import contextvars
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Comma-separated per-module levels, e.g. "language_model=DEBUG,chatbot_azure=INFO"
+LOG_LEVELS_ENV = "CHATBOT_LOG_LEVELS"
+
+_request_id = contextvars.ContextVar("request_id", default=None)
+_listener = None
+_installed_handlers = []
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+@contextlib.contextmanager
+def request_context(request_id=None):
+    """Tag every log record (and nested calls) made inside the block with an id"""
+    token = _request_id.set(request_id or uuid.uuid4().hex[:12])
+    try:
+        yield _request_id.get()
+    finally:
+        _request_id.reset(token)
+
+
+def get_request_id():
+    return _request_id.get()
+
+
+def log_event(logger, level, msg, *args, sample_every=None, **fields):
+    """
+    Log a message with structured fields (JSON output only), doing no work
+    at all if the level is disabled for this logger.
+
+    Args:
+        sample_every (int): Only emit one in this many records of this message
+    """
+    if not logger.isEnabledFor(level):
+        return
+    extra = {"fields": fields}
+    if sample_every and sample_every > 1:
+        extra["sample_every"] = sample_every
+    logger.log(level, msg, *args, extra=extra)
+
+
+class RequestIdFilter(logging.Filter):
+    """Copies the current request id onto records in the calling thread"""
+
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = _request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Passes one in N records that carry extra={"sample_every": N}, counted per
+    logger and message template, so high-frequency events stay cheap.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        every = getattr(record, "sample_every", None)
+        if not every or every <= 1:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        return count % every == 0
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line with timestamp, level, logger and fields"""
+
+    def format(self, record):
+        document = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            document["request_id"] = request_id
+        if getattr(record, "sample_every", None):
+            document["sample_every"] = record.sample_every
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key not in (
+                "fields",
+                "request_id",
+                "sample_every",
+            ):
+                document[key] = value
+        document.update(getattr(record, "fields", None) or {})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            document["exc"] = record.exc_text
+        return json.dumps(document, ensure_ascii=False, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Plain messages for the interactive CLI; structured fields are omitted"""
+
+    def format(self, record):
+        message = record.getMessage()
+        if record.levelno >= logging.WARNING:
+            message = f"[{record.levelname}] {message}"
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            message += "\n" + record.exc_text
+        return message
+
+
+class _AsyncQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without formatting them, so the
+    caller only pays for creating the record. Arguments are merged and
+    tracebacks rendered here because they may not survive the thread hop.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def parse_module_levels(text):
+    """'language_model=DEBUG,chatbot_azure=INFO' -> {'language_model': 'DEBUG', ...}"""
+    levels = {}
+    for item in (text or "").split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(
+    level="WARNING",
+    module_levels=None,
+    console=True,
+    json_file=None,
+    json_console=False,
+    use_queue=True,
+):
+    """
+    Route all logging through a queue to console and/or JSON-lines handlers.
+
+    Args:
+        level (str): Root level; records below it are dropped before any
+            formatting happens
+        module_levels (dict): Logger name -> level overrides (default: read
+            from the CHATBOT_LOG_LEVELS environment variable)
+        console (bool): Log to stderr
+        json_file (str): Also append JSON lines to this file
+        json_console (bool): Write JSON lines to stderr instead of plain text
+        use_queue (bool): Write from a background thread (QueueListener)
+    """
+    global _listener
+    shutdown_logging()
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    if module_levels is None:
+        module_levels = parse_module_levels(os.getenv(LOG_LEVELS_ENV))
+    for name, module_level in module_levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+    handlers = []
+    if console:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(JSONFormatter() if json_console else ConsoleFormatter())
+        handlers.append(handler)
+    if json_file:
+        os.makedirs(os.path.dirname(json_file) or ".", exist_ok=True)
+        handler = logging.FileHandler(json_file, encoding="utf-8")
+        handler.setFormatter(JSONFormatter())
+        handlers.append(handler)
+
+    if use_queue:
+        front = _AsyncQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(front.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        front_handlers = [front]
+    else:
+        front_handlers = handlers
+
+    # Filters run in the calling thread, where the request id is known and
+    # sampled-out records can be dropped before they are queued
+    for handler in front_handlers:
+        handler.addFilter(SamplingFilter())
+        handler.addFilter(RequestIdFilter())
+        root.addHandler(handler)
+    _installed_handlers[:] = front_handlers + (handlers if use_queue else [])
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and remove the handlers configure_logging added"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    root = logging.getLogger()
+    for handler in _installed_handlers:
+        root.removeHandler(handler)
+        handler.close()
+    _installed_handlers.clear()
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,259 @@
+# src/tests/benchmark_pipeline.py
+import os
+import sys
+import json
+import argparse
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+# Import required modules
+from benchmark import (
+    Benchmark,
+    DEFAULT_RESULTS_DIR,
+    compare_to_baseline,
+    load_baseline,
+    run_benchmarks,
+    save_results,
+)
+from clothing_selector import generate_clothing_selection
+from language_model import IndoBERTFashionProcessor
+from response_generator import ResponseGenerator
+
+QUERIES = [
+    "Baju formal untuk interview",
+    "Outfit casual untuk jalan-jalan",
+    "Pakaian untuk cuaca panas",
+    "Baju untuk ke pesta",
+    "Rekomendasi fashion untuk musim dingin",
+    "Saya pria berkulit cerah, mau ke meeting kantor",
+    "Outfit untuk wanita berkulit sawo matang ke acara casual",
+    "Baju formal yang professional looking",
+]
+
+PARAMETERS = [
+    {"gender": "pria", "skin_tone": "light", "occasion": "formal"},
+    {"gender": "wanita", "skin_tone": "dark", "occasion": "casual"},
+    {"gender": "neutral", "skin_tone": "neutral", "weather": "hot"},
+    {"gender": "wanita", "skin_tone": "light", "season": "winter"},
+]
+
+INTENTS = ["formal_pria_light", "kasual_wanita_dark", "hot_weather", "party"]
+
+
+def _cycle(items):
+    """Callable returning the items in turn, so every call sees fresh input"""
+    state = {"index": 0}
+
+    def next_item():
+        item = items[state["index"] % len(items)]
+        state["index"] += 1
+        return item
+
+    return next_item
+
+
+def _response_generator(context):
+    return ResponseGenerator(), _cycle(PARAMETERS)
+
+
+def _generate_response(state):
+    generator, next_parameters = state
+    generator.generate_response(next_parameters())
+
+
+def _clothing_json(context):
+    return _cycle(PARAMETERS)
+
+
+def _extraction_inputs(context):
+    return _cycle(list(zip(INTENTS * 2, QUERIES)))
+
+
+def _extract_parameters(next_input):
+    IndoBERTFashionProcessor.extract_parameters_from_intent(*next_input())
+
+
+def _json_round_trip(context):
+    return generate_clothing_selection(PARAMETERS[0])
+
+
+def _processor_queries(context):
+    return context["processor"], _cycle(QUERIES)
+
+
+def _tokenize(state):
+    processor, next_query = state
+    processor.preprocess_text(next_query())
+
+
+def _classify(state):
+    processor, next_query = state
+    processor.classify_intent(next_query())
+
+
+def _classify_batch(state):
+    processor, _ = state
+    processor.classify_intents(QUERIES * 4)
+
+
+def _full_response(state):
+    processor, next_query = state
+    query = next_query()
+    processor.generate_response(query, processor._keyword_fallback(query), 1)
+
+
+BENCHMARKS = [
+    Benchmark(
+        "parameters.extract_from_intent",
+        _extract_parameters,
+        "parameters",
+        setup=_extraction_inputs,
+    ),
+    Benchmark(
+        "response.generate",
+        _generate_response,
+        "response",
+        setup=_response_generator,
+    ),
+    Benchmark(
+        "json.clothing_selection",
+        lambda next_parameters: generate_clothing_selection(next_parameters()),
+        "json",
+        setup=_clothing_json,
+    ),
+    Benchmark(
+        "json.round_trip",
+        lambda document: json.dumps(json.loads(document)),
+        "json",
+        setup=_json_round_trip,
+    ),
+    Benchmark(
+        "tokenize.single",
+        _tokenize,
+        "tokenize",
+        setup=_processor_queries,
+        requires_model=True,
+    ),
+    Benchmark(
+        "classify.single",
+        _classify,
+        "classify",
+        setup=_processor_queries,
+        requires_model=True,
+    ),
+    Benchmark(
+        "classify.batch_32",
+        _classify_batch,
+        "classify",
+        setup=_processor_queries,
+        requires_model=True,
+    ),
+    Benchmark(
+        "response.full_pipeline",
+        _full_response,
+        "response",
+        setup=_processor_queries,
+        requires_model=True,
+    ),
+]
+
+
+def load_processor(model_path):
+    if not os.path.isdir(model_path):
+        print(f"Model not found at {model_path}; running rule-based benchmarks only")
+        return None
+    try:
+        import torch
+
+        # Pin threads so numbers from different runs are comparable
+        torch.set_num_threads(1)
+        return IndoBERTFashionProcessor(model_path)
+    except Exception as e:
+        print(f"Could not load model ({e}); running rule-based benchmarks only")
+        return None
+
+
+def benchmark_pipeline(
+    model_path="./fine-tuned-model",
+    pattern=None,
+    results_dir=DEFAULT_RESULTS_DIR,
+    baseline_file=None,
+    save_baseline=False,
+    threshold=0.10,
+    min_time=0.5,
+):
+    """
+    Run the pipeline benchmarks, save the results and compare with the baseline.
+
+    Returns:
+        tuple: (run, comparisons); comparisons is empty without a baseline
+    """
+    context = {"processor": load_processor(model_path)}
+    run = run_benchmarks(BENCHMARKS, context, pattern, min_time=min_time)
+
+    baseline = load_baseline(results_dir, baseline_file)
+    results_file = save_results(run, results_dir, as_baseline=save_baseline)
+    print(f"\nResults saved to: {results_file}")
+
+    if baseline is None:
+        print("No baseline found; run with --save-baseline to create one")
+        return run, []
+
+    comparisons = compare_to_baseline(run, baseline, threshold)
+    print(f"\nCompared with baseline from commit {baseline.get('commit')}:")
+    for comparison in comparisons:
+        ratio = comparison["ratio"]
+        change = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else "new"
+        print(f"  {comparison['name']:<32} {change:>8}  {comparison['status']}")
+    if baseline.get("machine") != run["machine"]:
+        print("Warning: baseline was recorded on a different machine")
+
+    return run, comparisons
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NLP and response benchmarks")
+    parser.add_argument("--model-path", default="./fine-tuned-model")
+    parser.add_argument(
+        "--filter", default=None, help="Only run benchmarks containing this text"
+    )
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("--baseline", default=None, help="Baseline JSON to compare")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Also store this run as the new baseline",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown that counts as a regression",
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.5, help="Seconds to spend per benchmark"
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with status 1 if any benchmark regressed",
+    )
+    args = parser.parse_args()
+
+    _, comparisons = benchmark_pipeline(
+        model_path=args.model_path,
+        pattern=args.filter,
+        results_dir=args.results_dir,
+        baseline_file=args.baseline,
+        save_baseline=args.save_baseline,
+        threshold=args.threshold,
+        min_time=args.min_time,
+    )
+    regressions = [c["name"] for c in comparisons if c["status"] == "regression"]
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
@@ -0,0 +1,89 @@
+# src/tests/test_audio_assets.py
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import wave
+import numpy as np
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from audio_assets import AudioAssetManager
+
+
+def write_wav(path, samples, sample_rate=16000, channels=1):
+    data = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(data.tobytes())
+
+
+class TestAudioAssets(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.sample_rate = 16000
+
+        # 1 s of quiet noise followed by 1 s of a 440 Hz tone over the noise
+        rng = np.random.default_rng(0)
+        t = np.arange(self.sample_rate) / self.sample_rate
+        noise = 0.001 * rng.standard_normal(2 * self.sample_rate)
+        tone = np.concatenate(
+            [np.zeros(self.sample_rate), 0.5 * np.sin(2 * np.pi * 440 * t)]
+        )
+        self.wav_path = os.path.join(self.temp_dir, "tone.wav")
+        write_wav(self.wav_path, noise + tone)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_measurements(self):
+        asset = AudioAssetManager(self.cache_dir).load(self.wav_path)
+
+        self.assertAlmostEqual(asset.duration, 2.0, places=3)
+        # Half the file is a sine of amplitude 0.5: RMS = 0.5 / sqrt(2) / sqrt(2)
+        self.assertAlmostEqual(asset.rms(), 0.25, places=2)
+        self.assertGreater(asset.snr_db(), 40)
+
+    def test_decoded_once_across_managers(self):
+        """A second manager memory-maps the cached PCM instead of decoding."""
+        first = AudioAssetManager(self.cache_dir)
+        first.load(self.wav_path)
+        first.load(self.wav_path)
+        first.save_index()
+
+        second = AudioAssetManager(self.cache_dir)
+        asset = second.load(self.wav_path)
+
+        self.assertEqual(first.stats["decodes"], 1)
+        self.assertEqual(first.stats["memory_hits"], 1)
+        self.assertEqual(second.stats["decodes"], 0)
+        self.assertEqual(second.stats["disk_hits"], 1)
+        self.assertIsInstance(asset.samples, np.memmap)
+
+    def test_identical_content_shares_cache_entry(self):
+        copy_path = os.path.join(self.temp_dir, "copy.wav")
+        shutil.copy(self.wav_path, copy_path)
+        manager = AudioAssetManager(self.cache_dir)
+
+        self.assertIs(manager.load(self.wav_path), manager.load(copy_path))
+        self.assertEqual(manager.stats["decodes"], 1)
+
+    def test_resampled_buffer(self):
+        asset = AudioAssetManager(cache_dir=None).load(self.wav_path)
+        resampled = asset.resampled(8000)
+
+        self.assertEqual(len(resampled), len(asset.samples) // 2)
+        self.assertIs(asset.resampled(8000), resampled)
+        resampled_rms = float(np.sqrt(np.mean(resampled**2)))
+        self.assertAlmostEqual(resampled_rms, asset.rms(), places=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
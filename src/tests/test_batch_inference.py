@@ -0,0 +1,114 @@
+# src/tests/test_batch_inference.py
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import torch
+from transformers import BertConfig, BertForSequenceClassification, BertTokenizerFast
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(os.path.dirname(parent_dir), "analytics"))
+
+from batch_inference import load_classifier, predict_logits, summarize_logits
+
+WORDS = "baju formal untuk interview pria wanita kulit cerah gelap pesta musim panas"
+QUERIES = [
+    "baju pesta",
+    "baju formal untuk interview pria kulit cerah",
+    "musim panas",
+    "wanita kulit gelap untuk pesta musim panas baju formal",
+    "interview",
+    "baju untuk pria",
+    "kulit cerah wanita",
+]
+
+
+def save_tiny_classifier(path):
+    vocab_file = os.path.join(path, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]))
+        f.write("\n" + "\n".join(WORDS.split()) + "\n")
+    BertTokenizerFast(vocab_file=vocab_file).save_pretrained(path)
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(WORDS.split()) + 5,
+        hidden_size=16,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=32,
+        num_labels=20,
+    )
+    BertForSequenceClassification(config).save_pretrained(path)
+
+
+class TestBatchInference(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        save_tiny_classifier(cls.tmp.name)
+        cls.tokenizer, cls.model, cls.device = load_classifier(cls.tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def per_row_logits(self):
+        """The old evaluation loop: one forward pass padded to 128 per row"""
+        rows = []
+        with torch.no_grad():
+            for query in QUERIES:
+                inputs = self.tokenizer(
+                    query,
+                    return_tensors="pt",
+                    padding="max_length",
+                    truncation=True,
+                    max_length=128,
+                )
+                rows.append(self.model(**inputs).logits[0].numpy())
+        return np.array(rows)
+
+    def test_batched_matches_per_row(self):
+        expected = self.per_row_logits()
+        for batch_size in (1, 3, 32):
+            logits = predict_logits(
+                self.model, self.tokenizer, QUERIES, batch_size=batch_size
+            )
+            np.testing.assert_allclose(logits, expected, atol=1e-5)
+
+    def test_order_is_kept_without_sorting(self):
+        sorted_logits = predict_logits(self.model, self.tokenizer, QUERIES, 2)
+        unsorted_logits = predict_logits(
+            self.model, self.tokenizer, QUERIES, 2, sort_by_length=False
+        )
+        np.testing.assert_allclose(sorted_logits, unsorted_logits, atol=1e-5)
+
+    def test_summarize_logits(self):
+        logits = np.array([[0.0, 2.0, 1.0], [3.0, 0.0, 0.0]])
+        predictions, confidences, probabilities = summarize_logits(logits)
+        self.assertEqual(predictions.tolist(), [1, 0])
+        np.testing.assert_allclose(confidences, probabilities.max(axis=1))
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+
+    def test_generate_test_predictions(self):
+        from generate_test_predictions import generate_test_predictions
+
+        test_file = os.path.join(self.tmp.name, "test.csv")
+        output_file = os.path.join(self.tmp.name, "out", "predictions.csv")
+        pd.DataFrame({"query": QUERIES, "label": range(len(QUERIES))}).to_csv(
+            test_file, index=False
+        )
+        results = generate_test_predictions(
+            self.tmp.name, test_file, output_file, batch_size=4
+        )
+        expected = self.per_row_logits().argmax(axis=1)
+        self.assertEqual(results["predicted_label"].tolist(), expected.tolist())
+        self.assertTrue(os.path.exists(output_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# src/tests/test_benchmark.py
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from benchmark import (
+    Benchmark,
+    compare_to_baseline,
+    load_baseline,
+    run_benchmarks,
+    save_results,
+    time_function,
+)
+
+
+def _run(**medians):
+    return {
+        "commit": "abc1234",
+        "timestamp": "20260101_000000",
+        "machine": {},
+        "benchmarks": {
+            name: {"median": median, "iqr": 0.0001} for name, median in medians.items()
+        },
+    }
+
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.results_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.results_dir, ignore_errors=True)
+
+    def test_time_function_calibrates_iterations(self):
+        calls = []
+        stats = time_function(
+            lambda: calls.append(1), min_rounds=3, min_time=0.01, round_time=0.001
+        )
+        self.assertGreater(stats["iterations"], 1)
+        self.assertGreaterEqual(stats["rounds"], 3)
+        self.assertLessEqual(stats["min"], stats["median"])
+        self.assertLessEqual(stats["median"], stats["max"])
+
+    def test_compare_detects_regression_and_improvement(self):
+        baseline = _run(fast=0.010, slow=0.010, same=0.010)
+        current = _run(fast=0.005, slow=0.020, same=0.0102, added=0.001)
+        status = {
+            c["name"]: c["status"] for c in compare_to_baseline(current, baseline)
+        }
+        self.assertEqual(status["fast"], "improvement")
+        self.assertEqual(status["slow"], "regression")
+        self.assertEqual(status["same"], "ok")
+        self.assertEqual(status["added"], "new")
+
+    def test_slowdown_within_noise_is_not_a_regression(self):
+        baseline = _run(noisy=0.010)
+        current = _run(noisy=0.012)
+        current["benchmarks"]["noisy"]["iqr"] = 0.005
+        comparison = compare_to_baseline(current, baseline)[0]
+        self.assertEqual(comparison["status"], "ok")
+
+    def test_saved_baseline_round_trips(self):
+        self.assertIsNone(load_baseline(self.results_dir))
+        run = run_benchmarks(
+            [Benchmark("noop", lambda: None)],
+            {},
+            min_rounds=2,
+            min_time=0.0,
+            round_time=0.0001,
+        )
+        save_results(run, self.results_dir, as_baseline=True)
+        baseline = load_baseline(self.results_dir)
+        self.assertEqual(set(baseline["benchmarks"]), {"noop"})
+        self.assertEqual(len(os.listdir(self.results_dir)), 2)
+
+    def test_model_benchmarks_skipped_without_processor(self):
+        run = run_benchmarks(
+            [Benchmark("needs_model", lambda state: None, requires_model=True)],
+            {"processor": None},
+        )
+        self.assertEqual(run["benchmarks"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# src/tests/test_calibration.py
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from calibration import (
+    Calibration,
+    expected_calibration_error,
+    fit_class_thresholds,
+    fit_temperature,
+    softmax,
+)
+
+
+def overconfident_logits(n=2000, classes=5, accuracy=0.7, seed=0):
+    """Logits whose argmax is right `accuracy` of the time but look ~99% sure"""
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, classes, n)
+    wrong = (labels + rng.integers(1, classes, n)) % classes
+    predicted = np.where(rng.random(n) < accuracy, labels, wrong)
+    logits = rng.normal(0, 0.5, (n, classes))
+    logits[np.arange(n), predicted] += 6.0
+    return logits, labels
+
+
+class TestCalibration(unittest.TestCase):
+    def test_temperature_scaling_reduces_ece(self):
+        logits, labels = overconfident_logits()
+        temperature = fit_temperature(logits, labels)
+        self.assertGreater(temperature, 1.5)
+
+        def ece(t):
+            probabilities = softmax(logits, t)
+            correct = probabilities.argmax(axis=1) == labels
+            return expected_calibration_error(probabilities.max(axis=1), correct)[0]
+
+        self.assertGreater(ece(1.0), 0.2)
+        self.assertLess(ece(temperature), 0.05)
+
+    def test_ece_of_perfect_calibration(self):
+        confidences = np.full(1000, 0.8)
+        correct = np.arange(1000) % 5 != 0
+        ece, bins = expected_calibration_error(confidences, correct)
+        self.assertAlmostEqual(ece, 0.0)
+        self.assertEqual(bins[0]["count"], 1000)
+
+    def test_class_thresholds_reach_target_precision(self):
+        # Class 0: right above 0.6, wrong below; class 1 seen too rarely
+        confidences = np.array([0.9, 0.8, 0.7, 0.65, 0.55, 0.5, 0.45, 0.95])
+        probabilities = np.zeros((8, 3))
+        probabilities[:7, 0] = confidences[:7]
+        probabilities[:7, 2] = 1 - confidences[:7]
+        probabilities[7, 1] = confidences[7]
+        probabilities[7, 2] = 1 - confidences[7]
+        labels = np.array([0, 0, 0, 0, 2, 2, 2, 1])
+
+        thresholds = fit_class_thresholds(
+            probabilities, labels, target_precision=0.9, min_support=3
+        )
+        self.assertEqual(thresholds, {0: 0.65})
+
+    def test_save_and_load(self):
+        calibration = Calibration(temperature=1.7, thresholds={3: 0.35, 19: 0.8})
+        with tempfile.TemporaryDirectory() as tmp:
+            calibration.save(tmp)
+            loaded = Calibration.load(tmp)
+            self.assertEqual(Calibration.load(parent_dir).temperature, 1.0)
+        self.assertEqual(loaded.temperature, 1.7)
+        self.assertEqual(loaded.threshold(3), 0.35)
+        self.assertEqual(loaded.threshold(5), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+# src/tests/test_clarification_module.py
+import os
+import sys
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from clarification_module import ClarificationModule
+
+
+class TestKeywordMatching(unittest.TestCase):
+    def setUp(self):
+        self.clarification = ClarificationModule()
+
+    def assertSlots(self, text, **expected):
+        params = self.clarification.extract_parameters(text)
+        for slot, value in expected.items():
+            self.assertEqual(params[slot], value, f"{slot} from: {text}")
+
+    def test_keywords_inside_other_words_do_not_match(self):
+        self.assertSlots("tante saya", gender=None, skin_tone=None)
+        self.assertSlots("masih bingung", gender=None)
+        self.assertSlots("mainan anak", occasion=None)
+
+    def test_longer_keywords_win(self):
+        self.assertSlots("kulit gelap", skin_tone="very_dark")
+        self.assertSlots("coklat tua", skin_tone="very_dark")
+        self.assertSlots("sawo matang muda", skin_tone="medium")
+        self.assertSlots("kulit putih", skin_tone="very_light")
+
+    def test_short_keywords_still_match_whole_words(self):
+        self.assertSlots("gelap", skin_tone="dark")
+        self.assertSlots("Mas perlu baju", gender="pria")
+        self.assertSlots("kulit tan", skin_tone="medium")
+        self.assertSlots("Baju untuk interview pekerjaan", occasion="interview")
+
+    def test_all_slots_from_one_reply(self):
+        self.assertSlots(
+            "cowok, kulit sawo matang, buat kerja",
+            gender="pria",
+            skin_tone="dark",
+            occasion="formal",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
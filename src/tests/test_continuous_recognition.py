@@ -0,0 +1,126 @@
+# src/tests/test_continuous_recognition.py
+import os
+import sys
+import time
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from local_speech import LocalSpeechRecognizer, load_audio_transcripts
+from speech_streaming import ContinuousListener
+from chatbot_azure import AzureFashionChatbot, normalize_utterance
+from speech_backend import LocalSpeechBackend
+from tts_cache import TTSCache
+from test_local_speech_backend import KeywordProcessor
+
+METADATA_FILE = os.path.join(
+    os.path.dirname(parent_dir), "test_data", "audio_metadata.csv"
+)
+
+
+class TestContinuousRecognition(unittest.TestCase):
+    def setUp(self):
+        self.entries = load_audio_transcripts(METADATA_FILE, category="real_world")
+        self.partials = []
+
+    def test_partials_arrive_before_final(self):
+        """Interim hypotheses grow word by word and end in the final transcript."""
+        entry = self.entries[0]
+        recognizer = LocalSpeechRecognizer([entry], time_scale=0)
+        listener = ContinuousListener(recognizer, on_partial=self.partials.append)
+
+        final_text = listener.listen(timeout=5)
+        listener.stop()
+
+        self.assertEqual(final_text, entry["expected_text"])
+        self.assertEqual(len(self.partials), len(entry["expected_text"].split()))
+        self.assertEqual(
+            normalize_utterance(self.partials[-1]), normalize_utterance(final_text)
+        )
+
+    def test_replays_all_utterances_in_order(self):
+        """Final results are returned one per listen() call."""
+        recognizer = LocalSpeechRecognizer(self.entries[:3], time_scale=0)
+        listener = ContinuousListener(recognizer)
+
+        results = [listener.listen(timeout=5) for _ in range(3)]
+        listener.stop()
+
+        self.assertEqual(results, [e["expected_text"] for e in self.entries[:3]])
+
+    def test_session_end_returns_none(self):
+        """listen() returns None once the replayed session has ended."""
+        recognizer = LocalSpeechRecognizer(self.entries[:1], time_scale=0)
+        listener = ContinuousListener(recognizer)
+
+        self.assertTrue(listener.listen(timeout=5))
+        self.assertIsNone(listener.listen(timeout=5))
+
+    def test_first_partial_precedes_final_by_utterance_duration(self):
+        """With real-time pacing the first partial arrives well before the final."""
+        entry = dict(self.entries[0], duration_seconds=0.5)
+        timestamps = []
+        recognizer = LocalSpeechRecognizer([entry], time_scale=1.0)
+        listener = ContinuousListener(
+            recognizer, on_partial=lambda text: timestamps.append(time.time())
+        )
+
+        listener.listen(timeout=5)
+        final_time = time.time()
+        listener.stop()
+
+        self.assertGreater(final_time - timestamps[0], 0.2)
+
+    def test_recognize_once_replays_transcript(self):
+        """The fake also supports the blocking recognize_once() call."""
+        recognizer = LocalSpeechRecognizer.from_audio_files(
+            [self.entries[0]["filename"]], time_scale=0, metadata_file=METADATA_FILE
+        )
+        result = recognizer.recognize_once()
+        self.assertEqual(result.text, self.entries[0]["expected_text"])
+
+
+class SlowKeywordProcessor(KeywordProcessor):
+    """Records what was classified; each classification takes a while"""
+
+    def __init__(self):
+        self.classified = []
+
+    def classify_intent(self, text):
+        time.sleep(0.05)
+        self.classified.append(text)
+        return super().classify_intent(text)
+
+
+class TestIntentPrewarm(unittest.TestCase):
+    def setUp(self):
+        self.processor = SlowKeywordProcessor()
+        self.chatbot = AzureFashionChatbot(
+            continuous=True,
+            backend=LocalSpeechBackend(metadata_file=METADATA_FILE, utterances=[]),
+            nlp_processor=self.processor,
+            tts_cache=TTSCache(cache_dir=None),
+        )
+
+    def test_matching_final_text_reuses_the_prewarm(self):
+        self.chatbot._prewarm_intent("Saya mau baju")
+        self.chatbot._prewarm_intent("Saya mau baju untuk pesta")
+        self.assertEqual(self.chatbot._classify_intent("saya mau baju untuk pesta."), 1)
+        self.assertEqual(self.processor.classified[-1], "Saya mau baju untuk pesta")
+        self.assertNotIn("saya mau baju untuk pesta.", self.processor.classified)
+
+    def test_reset_waits_for_the_running_prewarm(self):
+        for _ in range(20):
+            self.chatbot._prewarm_intent("baju pesta")
+            future = self.chatbot._prewarm_future
+            # Different final text: the prewarm result is discarded
+            self.assertEqual(self.chatbot._classify_intent("baju formal"), 0)
+            self.assertTrue(future.cancelled() or future.exception() is None)
+            self.assertEqual(self.chatbot._prewarmed_intents, {})
+            self.assertFalse(self.chatbot._prewarm_running)
+
+if __name__ == "__main__":
+    unittest.main()
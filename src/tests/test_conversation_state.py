@@ -0,0 +1,78 @@
+# src/tests/test_conversation_state.py
+import os
+import sys
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from conversation_state import ConversationState, TurnHistory, deep_sizeof
+from session_store import InMemorySessionStore
+
+
+class TestTurnHistory(unittest.TestCase):
+    def test_ring_buffer_keeps_last_turns(self):
+        history = TurnHistory(max_turns=3)
+        dropped = [history.append("user", f"pesan {i}") for i in range(5)]
+        self.assertEqual(
+            [turn.text for turn in history], ["pesan 2", "pesan 3", "pesan 4"]
+        )
+        self.assertEqual(dropped[:3], [None, None, None])
+        self.assertEqual([turn.text for turn in dropped[3:]], ["pesan 0", "pesan 1"])
+
+    def test_empty_ring_buffer_is_rejected(self):
+        with self.assertRaises(ValueError):
+            TurnHistory(max_turns=0)
+
+    def test_long_text_is_truncated(self):
+        history = TurnHistory(max_turns=2, max_chars=10)
+        history.append("assistant", "x" * 100)
+        self.assertEqual(len(history[0].text), 10)
+
+    def test_round_trip(self):
+        state = ConversationState(history_turns=4)
+        state.awaiting_clarification = True
+        state.pending_params = {"gender": None, "occasion": "formal"}
+        state.clarification_type = "gender"
+        state.history.append("user", "Baju untuk kerja")
+
+        restored = ConversationState.from_dict(state.to_dict(), history_turns=4)
+        self.assertEqual(restored.to_dict(), state.to_dict())
+
+
+class TestConversationStateMemory(unittest.TestCase):
+    def test_slots(self):
+        state = ConversationState()
+        self.assertFalse(hasattr(state, "__dict__"))
+        self.assertFalse(hasattr(state.history, "__dict__"))
+        with self.assertRaises(AttributeError):
+            state.extra = 1
+
+    def test_session_memory_is_capped(self):
+        """However long the conversation, a session stays under its cap."""
+        state = ConversationState(history_turns=20)
+        sizes = []
+        for i in range(2000):
+            state.history.append("user", f"Baju formal untuk interview nomor {i} " * 5)
+            state.history.append("assistant", "Rekomendasi: kemeja putih. " * 100)
+            if i in (100, 1999):
+                sizes.append(state.memory_bytes())
+        self.assertAlmostEqual(sizes[0], sizes[1], delta=sizes[0] * 0.01)
+        # 20 turns of at most 1000 characters, plus per-object overhead
+        self.assertLess(sizes[1], 20 * (1000 + 300) + 2000)
+
+    def test_store_memory_grows_per_session_not_per_turn(self):
+        store = InMemorySessionStore()
+        for i in range(100):
+            state = ConversationState(history_turns=10)
+            for turn in range(50):
+                state.history.append("user", f"pesan {turn} dari pengguna {i}")
+            store.put(f"user-{i}", state)
+        per_session = store.memory_bytes() / len(store)
+        self.assertLess(per_session, deep_sizeof(state) * 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
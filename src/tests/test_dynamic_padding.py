@@ -0,0 +1,118 @@
+# src/tests/test_dynamic_padding.py
+import os
+import sys
+import tempfile
+import unittest
+from transformers import BertConfig, BertForSequenceClassification
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(os.path.dirname(parent_dir), "train"))
+
+from benchmark_padding import run_epoch
+from preprocess import dynamic_padding_collator, length_grouping_args
+from preprocess import preprocess_dataset, preprocess_joint_dataset
+from test_tokenized_cache import WORDS, save_tiny_tokenizer, write_csv
+
+QUERIES = [
+    "baju pesta",
+    "baju formal untuk interview pria kulit cerah",
+    "musim panas",
+    "wanita kulit gelap untuk pesta musim panas baju formal",
+    "interview",
+    "baju untuk pria",
+    "kulit cerah wanita",
+    "pesta",
+]
+
+
+class TestDynamicPadding(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        self.model_path = os.path.join(root, "model")
+        os.makedirs(self.model_path)
+        self.tokenizer = save_tiny_tokenizer(self.model_path)
+        self.data_files = {
+            "train": os.path.join(root, "train.csv"),
+            "test": os.path.join(root, "test.csv"),
+        }
+        write_csv(self.data_files["train"], QUERIES)
+        write_csv(self.data_files["test"], QUERIES[:2])
+
+    def preprocess(self, padding=False):
+        return preprocess_dataset(
+            self.data_files,
+            self.model_path,
+            max_length=32,
+            cache_dir=None,
+            num_proc=1,
+            padding=padding,
+        )["train"]
+
+    def test_rows_are_unpadded_and_batches_pad_to_longest(self):
+        dataset = self.preprocess()
+        lengths = [len(ids) for ids in dataset["input_ids"]]
+        self.assertEqual(lengths, [len(q.split()) + 2 for q in QUERIES])
+
+        collator = dynamic_padding_collator(self.tokenizer)
+        batch = collator([dataset[0], dataset[2], dataset[4]])
+        self.assertEqual(tuple(batch["input_ids"].shape), (3, 4))
+        self.assertEqual(batch["labels"].tolist(), [0, 2, 4])
+
+    def test_max_length_padding_is_kept_as_an_option(self):
+        dataset = self.preprocess(padding="max_length")
+        self.assertEqual({len(ids) for ids in dataset["input_ids"]}, {32})
+
+    def test_joint_label_columns_survive_the_collator(self):
+        joint = preprocess_joint_dataset(
+            self.data_files["train"],
+            test_size=0.25,
+            tokenizer_name=self.model_path,
+            max_length=32,
+            cache_dir=None,
+            num_proc=1,
+        )["train"]
+        batch = dynamic_padding_collator(self.tokenizer)([joint[0], joint[1]])
+        for column in ("labels", "gender_labels", "season_labels"):
+            self.assertEqual(tuple(batch[column].shape), (2,))
+
+    def test_length_grouping_args_match_training_arguments(self):
+        from transformers import TrainingArguments
+
+        for name in length_grouping_args():
+            self.assertIn(name, TrainingArguments.__dataclass_fields__)
+
+    def test_grouped_epoch_has_less_padding(self):
+        config = BertConfig(
+            vocab_size=len(WORDS.split()) + 5,
+            hidden_size=16,
+            num_hidden_layers=1,
+            num_attention_heads=2,
+            intermediate_size=32,
+            num_labels=len(QUERIES),
+        )
+        dataset = self.preprocess()
+        collator = dynamic_padding_collator(self.tokenizer)
+
+        results = {}
+        for group_by_length in (False, True):
+            model = BertForSequenceClassification(config)
+            results[group_by_length] = run_epoch(
+                model, dataset, collator, batch_size=2, group_by_length=group_by_length
+            )
+            self.assertEqual(results[group_by_length]["examples"], len(QUERIES))
+            self.assertEqual(
+                results[group_by_length]["real_tokens"],
+                sum(len(q.split()) + 2 for q in QUERIES),
+            )
+        self.assertLessEqual(
+            results[True]["padded_tokens"], results[False]["padded_tokens"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
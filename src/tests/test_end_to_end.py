@@ -6,7 +6,6 @@ import time
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import matplotlib.pyplot as plt
 import traceback
 
 # Add the parent directory to the path so we can import from src
@@ -176,6 +175,8 @@ def test_end_to_end_pipeline(model_path="./fine-tuned-model"):
         pct_json_valid = results_df["json_valid"].mean() * 100
 
         # Create visualization for processing times
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(14, 8))
 
         # Stacked bar chart of processing times
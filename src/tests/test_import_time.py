@@ -0,0 +1,102 @@
+# src/tests/test_import_time.py
+import os
+import sys
+import subprocess
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+
+# Modules on the lightweight paths and the maximum cumulative import time
+# (milliseconds) each one may take. Override with IMPORT_TIME_BUDGET_MS.
+LIGHTWEIGHT_MODULES = [
+    "clarification_module",
+    "fashion_mapping",
+    "clothing_selector",
+    "response_generator",
+    "language_model",
+]
+DEFAULT_BUDGET_MS = 150.0
+
+# Packages that must never be pulled in just by importing a lightweight module
+HEAVY_PACKAGES = ["torch", "transformers", "matplotlib", "seaborn", "sklearn"]
+
+
+def measure_import_time(module_name):
+    """
+    Import a module in a fresh interpreter with `python -X importtime`.
+
+    Returns:
+        tuple: (cumulative import time in ms, set of top-level packages imported)
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = parent_dir + os.pathsep + env.get("PYTHONPATH", "")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True,
+        text=True,
+        cwd=parent_dir,
+        env=env,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Importing {module_name} failed:\n{completed.stderr[-2000:]}"
+        )
+
+    cumulative_ms = None
+    imported = set()
+    for line in completed.stderr.splitlines():
+        # Format: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].strip()
+        imported.add(name.split(".")[0])
+        if name == module_name:
+            cumulative_ms = int(parts[1].strip()) / 1000.0
+
+    return cumulative_ms, imported
+
+
+class TestImportTime(unittest.TestCase):
+    def setUp(self):
+        self.budget_ms = float(
+            os.environ.get("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS)
+        )
+
+    def test_lightweight_modules_skip_heavy_packages(self):
+        """Lightweight modules must not import the model or plotting stack."""
+        for module_name in LIGHTWEIGHT_MODULES:
+            _, imported = measure_import_time(module_name)
+            heavy = sorted(imported.intersection(HEAVY_PACKAGES))
+            self.assertEqual(
+                heavy, [], f"{module_name} imports heavy packages: {heavy}"
+            )
+
+    def test_lightweight_import_time_budget(self):
+        """Cumulative import time must stay under the regression threshold."""
+        for module_name in LIGHTWEIGHT_MODULES:
+            cumulative_ms, _ = measure_import_time(module_name)
+            self.assertIsNotNone(cumulative_ms, f"No timing for {module_name}")
+            self.assertLess(
+                cumulative_ms,
+                self.budget_ms,
+                f"{module_name} took {cumulative_ms:.1f} ms to import "
+                f"(budget {self.budget_ms:.0f} ms)",
+            )
+
+
+if __name__ == "__main__":
+    print("Import Time Benchmark")
+    print("-" * 60)
+    for module_name in LIGHTWEIGHT_MODULES:
+        cumulative_ms, imported = measure_import_time(module_name)
+        heavy = sorted(imported.intersection(HEAVY_PACKAGES))
+        print(
+            f"{module_name:<25} {cumulative_ms:>8.1f} ms"
+            + (f"  heavy: {', '.join(heavy)}" if heavy else "")
+        )
+    print("-" * 60)
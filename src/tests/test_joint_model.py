@@ -0,0 +1,195 @@
+# src/tests/test_joint_model.py
+import os
+import sys
+import json
+import tempfile
+import unittest
+import numpy as np
+import torch
+from transformers import BertConfig, BertModel, BertTokenizerFast
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(os.path.dirname(parent_dir), "train"))
+
+from calibration import Calibration
+from joint_model import SLOT_LABELS, JointIntentSlotModel, slot_targets
+from language_model import INTENT_REQUESTS, IndoBERTFashionProcessor
+
+WORDS = "baju formal untuk interview pria wanita kulit cerah gelap pesta musim panas"
+
+
+def tiny_model():
+    torch.manual_seed(0)
+    config = BertConfig(
+        vocab_size=len(WORDS.split()) + 5,
+        hidden_size=16,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=32,
+    )
+    return JointIntentSlotModel(BertModel(config))
+
+
+def save_tiny_model(path):
+    """A joint model directory the processor can load, without any download"""
+    vocab_file = os.path.join(path, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]))
+        f.write("\n" + "\n".join(WORDS.split()) + "\n")
+    BertTokenizerFast(vocab_file=vocab_file).save_pretrained(path)
+    model = tiny_model()
+    model.save_pretrained(path)
+    return model
+
+
+class TestSlotTargets(unittest.TestCase):
+    def test_targets_from_columns_and_intent(self):
+        targets = slot_targets(2, "pria", "dark", "Baju formal pria kulit gelap")
+        self.assertEqual(SLOT_LABELS["gender"][targets["gender_labels"]], "pria")
+        self.assertEqual(SLOT_LABELS["skin_tone"][targets["skin_tone_labels"]], "dark")
+        self.assertEqual(SLOT_LABELS["occasion"][targets["occasion_labels"]], "formal")
+        self.assertEqual(SLOT_LABELS["weather"][targets["weather_labels"]], "none")
+
+    def test_weather_and_season(self):
+        targets = slot_targets(11, "neutral", "neutral", "Baju untuk musim dingin")
+        self.assertEqual(SLOT_LABELS["weather"][targets["weather_labels"]], "hot")
+        self.assertEqual(SLOT_LABELS["season"][targets["season_labels"]], "winter")
+        self.assertEqual(SLOT_LABELS["occasion"][targets["occasion_labels"]], "none")
+
+
+class TestJointIntentSlotModel(unittest.TestCase):
+    def test_one_forward_gives_every_head_and_a_loss(self):
+        model = tiny_model()
+        inputs = {
+            "input_ids": torch.tensor([[2, 5, 6, 3], [2, 7, 3, 0]]),
+            "attention_mask": torch.tensor([[1, 1, 1, 1], [1, 1, 1, 0]]),
+        }
+        labels = {f"{head}_labels": torch.tensor([1, 0]) for head in SLOT_LABELS}
+        outputs = model(**inputs, labels=torch.tensor([0, 19]), **labels)
+        self.assertEqual(outputs["logits"].shape, (2, 20))
+        for head, values in SLOT_LABELS.items():
+            self.assertEqual(outputs[f"{head}_logits"].shape, (2, len(values)))
+        outputs["loss"].backward()
+        self.assertIsNotNone(model.slot_heads["gender"].weight.grad)
+        self.assertNotIn("loss", model(**inputs))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            model = tiny_model().eval()
+            model.save_pretrained(tmp)
+            loaded = JointIntentSlotModel.from_pretrained(tmp).eval()
+        input_ids = torch.tensor([[2, 5, 6, 3]])
+        with torch.no_grad():
+            for key, value in model(input_ids=input_ids).items():
+                self.assertTrue(torch.allclose(value, loaded(input_ids=input_ids)[key]))
+
+    def test_compute_metrics(self):
+        from train_joint_model import compute_metrics
+
+        class Prediction:
+            predictions = [np.eye(20)[[0, 1]]] + [
+                np.eye(len(values))[[0, 0]] for values in SLOT_LABELS.values()
+            ]
+            label_ids = [np.array([0, 2])] + [np.array([0, 0])] * len(SLOT_LABELS)
+
+        metrics = compute_metrics(Prediction())
+        self.assertEqual(metrics["accuracy"], 0.5)
+        self.assertEqual(metrics["slot_accuracy"], 1.0)
+
+
+class TestProcessorWithJointModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        save_tiny_model(cls.tmp.name)
+        cls.processor = IndoBERTFashionProcessor(cls.tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_generate_response_reuses_the_classify_forward_pass(self):
+        forward_calls = []
+        hook = self.processor.model.register_forward_hook(
+            lambda *args: forward_calls.append(1)
+        )
+        try:
+            text = "baju formal untuk interview pria"
+            intent_id = self.processor.classify_intent(text)
+            text_response, clothing_json = self.processor.generate_response(
+                text, intent_id, 1
+            )
+        finally:
+            hook.remove()
+        self.assertTrue(self.processor.joint)
+        self.assertEqual(len(forward_calls), 1)
+        self.assertTrue(text_response)
+        json.loads(clothing_json)
+
+    def test_final_text_reuses_the_partial_forward_pass(self):
+        forward_calls = []
+        hook = self.processor.model.register_forward_hook(
+            lambda *args: forward_calls.append(1)
+        )
+        requests = INTENT_REQUESTS.total()
+        try:
+            # Prewarmed on the partial, then the final hypothesis arrives
+            intent_id = self.processor.classify_intent("baju pesta untuk wanita")
+            slots = self.processor.predict_slots("Baju pesta untuk wanita.")
+        finally:
+            hook.remove()
+        self.assertEqual(len(forward_calls), 1)
+        self.assertEqual(INTENT_REQUESTS.total(), requests + 1)
+        self.assertEqual(set(slots), set(SLOT_LABELS))
+        self.assertEqual(
+            self.processor.predict("baju pesta untuk wanita")[0], intent_id
+        )
+
+    def test_slots_of_an_unclassified_text_are_not_intent_requests(self):
+        requests = INTENT_REQUESTS.total()
+        slots = self.processor.predict_slots("kulit gelap musim panas pria")
+        self.assertEqual(set(slots), set(SLOT_LABELS))
+        self.assertEqual(INTENT_REQUESTS.total(), requests)
+
+    def test_batch_classification_fills_slots(self):
+        texts = ["baju pesta wanita", "musim panas"]
+        self.processor.classify_intents(texts)
+        for text in texts:
+            self.assertEqual(
+                set(self.processor.predict_slots(text)), set(SLOT_LABELS)
+            )
+
+    def test_calibration_thresholds_route_to_keywords(self):
+        calibration = self.processor.calibration
+        self.assertEqual(calibration.temperature, 1.0)
+        try:
+            # No prediction can reach a threshold above 1
+            self.processor.calibration = Calibration(
+                temperature=2.0, default_threshold=1.01
+            )
+            self.assertEqual(self.processor.classify_intent("baju pesta"), 9)
+            self.assertEqual(self.processor.classify_intents(["baju pesta"]), [9])
+        finally:
+            self.processor.calibration = calibration
+
+    def test_unsure_slots_fall_back_to_rules(self):
+        slots = {
+            "gender": ("wanita", 0.9),
+            "skin_tone": ("very_dark", 0.2),
+            "occasion": ("none", 0.3),
+            "weather": ("none", 0.9),
+            "season": ("none", 0.9),
+        }
+        parameters = self.processor.parameters_from_slots(
+            slots, "formal_pria_light", "baju formal untuk pria"
+        )
+        self.assertEqual(
+            parameters, {"gender": "wanita", "skin_tone": "light", "occasion": "formal"}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
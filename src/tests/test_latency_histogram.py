@@ -0,0 +1,90 @@
+# src/tests/test_latency_histogram.py
+import os
+import sys
+import time
+import random
+import unittest
+import numpy as np
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from latency_histogram import LatencyHistogram
+from load_generator import run_open_loop, slo_violations
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_have_three_significant_digits(self):
+        rng = random.Random(0)
+        values = [rng.lognormvariate(-3, 1) for _ in range(20000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for percentile in (50, 90, 99, 99.9):
+            expected = np.percentile(values, percentile, method="inverted_cdf")
+            self.assertAlmostEqual(
+                histogram.percentile(percentile), expected, delta=expected * 0.002
+            )
+        self.assertEqual(histogram.count, len(values))
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(0.010)
+        second.record(0.500)
+
+        first.merge(second)
+
+        self.assertEqual(first.count, 2)
+        self.assertAlmostEqual(first.percentile(100), 0.5, places=3)
+        self.assertAlmostEqual(first.to_dict()["min"], 0.010, places=4)
+
+
+class TestOpenLoopLoad(unittest.TestCase):
+    def test_queueing_delay_is_measured(self):
+        """
+        Offered load above capacity must show up as growing latency: one
+        worker serving 10 ms requests cannot keep up with 200 requests/s.
+        """
+
+        def target(query):
+            time.sleep(0.01)
+
+        options = {"duration": 0.5, "max_workers": 1, "seed": 1}
+        light = run_open_loop(target, ["q"], rate=20, **options)
+        heavy = run_open_loop(target, ["q"], rate=200, **options)
+
+        self.assertLess(light["histogram"].percentile(50), 0.03)
+        self.assertGreater(heavy["histogram"].percentile(99), 0.1)
+        self.assertLess(heavy["throughput"], 120)
+        self.assertEqual(heavy["completed"], heavy["requests_sent"])
+
+    def test_errors_are_counted(self):
+        def target(query):
+            if query == "bad":
+                raise ValueError("boom")
+
+        result = run_open_loop(target, ["ok", "bad"], rate=100, duration=0.3, seed=2)
+
+        finished = result["completed"] + result["errors"]
+        self.assertEqual(finished, result["requests_sent"])
+        self.assertGreater(result["errors"], 0)
+
+    def test_slo_violations(self):
+        def target(query):
+            time.sleep(0.01)
+
+        options = {"duration": 0.5, "max_workers": 1, "seed": 1}
+        light = run_open_loop(target, ["q"], rate=20, **options)
+        heavy = run_open_loop(target, ["q"], rate=200, **options)
+
+        self.assertEqual(slo_violations(light, p99_seconds=0.1), [])
+        violations = slo_violations(heavy, p99_seconds=0.1)
+        self.assertEqual(len(violations), 1)
+        self.assertIn("p99", violations[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
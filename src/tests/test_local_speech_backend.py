@@ -0,0 +1,143 @@
+# src/tests/test_local_speech_backend.py
+import os
+import sys
+import json
+import tempfile
+import unittest
+import azure.cognitiveservices.speech as speechsdk
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from local_speech import wav_duration
+from speech_backend import LocalSpeechBackend, SpeechBackend, create_speech_backend
+from tts_cache import TTSCache
+from turn_timing import TurnTimer
+from chatbot_azure import AzureFashionChatbot
+
+METADATA_FILE = os.path.join(
+    os.path.dirname(parent_dir), "test_data", "audio_metadata.csv"
+)
+
+
+class KeywordProcessor:
+    """Stands in for IndoBERTFashionProcessor so no model has to be loaded"""
+
+    def classify_intent(self, text):
+        return 1 if "pesta" in text else 0
+
+    def analyze_sentiment(self, text):
+        return "neutral"
+
+    def generate_response(self, text, intent_id, sentiment):
+        clothing_json = json.dumps({"intent": intent_id})
+        return f"Rekomendasi untuk intent {intent_id}.", clothing_json
+
+
+class TestLocalSpeechBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = LocalSpeechBackend(metadata_file=METADATA_FILE)
+
+    def test_file_recognizer_returns_expected_transcript(self):
+        """A recognizer for an audio file replays that file's transcript."""
+        entry = self.backend.entries[0]
+        path = os.path.join("test_data", "audio_samples", entry["filename"])
+
+        result = self.backend.create_recognizer(audio_file=path).recognize_once()
+
+        self.assertEqual(result.reason, speechsdk.ResultReason.RecognizedSpeech)
+        self.assertEqual(result.text, entry["expected_text"])
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class RecognizerOnly(SpeechBackend):
+            def create_recognizer(self, audio_file=None, segment=None):
+                return None
+
+        with self.assertRaises(TypeError):
+            RecognizerOnly()
+
+    def test_error_injection_is_reproducible(self):
+        """The same seed fails the same utterances; the rate is roughly honoured."""
+
+        def reasons(seed):
+            backend = LocalSpeechBackend(
+                metadata_file=METADATA_FILE, recognition_error_rate=0.3, seed=seed
+            )
+            recognizer = backend.create_recognizer()
+            return [
+                recognizer.recognize_once().reason
+                for _ in range(len(backend.utterances))
+            ]
+
+        first, second = reasons(7), reasons(7)
+        failures = sum(r != speechsdk.ResultReason.RecognizedSpeech for r in first)
+
+        self.assertEqual(first, second)
+        self.assertGreater(failures, 0)
+        self.assertLess(failures, len(first))
+
+    def test_synthesizer_returns_wav_sized_to_text(self):
+        """Synthesis produces playable WAV audio whose length follows the text."""
+        synthesizer = self.backend.create_synthesizer(play_audio=False)
+        short = synthesizer.speak_ssml("<speak>Halo</speak>")
+        long = synthesizer.speak_ssml("<speak>" + "kata " * 10 + "</speak>")
+
+        self.assertEqual(
+            long.reason, speechsdk.ResultReason.SynthesizingAudioCompleted
+        )
+        self.assertAlmostEqual(wav_duration(long.audio_data), 4.0, places=2)
+        self.assertLess(wav_duration(short.audio_data), wav_duration(long.audio_data))
+
+    def test_unknown_backend_name(self):
+        with self.assertRaises(ValueError):
+            create_speech_backend("unknown")
+
+
+class TestChatbotOnLocalBackend(unittest.TestCase):
+    def setUp(self):
+        # process_input writes last_recommendation.json to the working directory
+        self.original_dir = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        self.temp_dir.cleanup()
+
+    def test_full_turn_without_network(self):
+        """Listen, classify and speak one turn entirely through the local backend."""
+        backend = LocalSpeechBackend(
+            metadata_file=METADATA_FILE,
+            utterances=["Saya mau baju untuk pesta"],
+            synthesis_latency=0.01,
+        )
+        chatbot = AzureFashionChatbot(
+            continuous=True,
+            backend=backend,
+            nlp_processor=KeywordProcessor(),
+            tts_cache=TTSCache(cache_dir=None),
+        )
+        timer = TurnTimer(1)
+        chatbot._current_turn = timer
+        timer.mark("listen_start")
+
+        user_input = chatbot.speech_to_text_continuous(timeout=5)
+        timer.mark("stt_final")
+        response, is_error, clothing_json = chatbot.process_input(user_input)
+        timer.mark("nlp_done")
+        chatbot.text_to_speech(response, is_error, timer=timer)
+        chatbot.stop_listening()
+
+        self.assertEqual(user_input, "saya mau baju untuk pesta")
+        self.assertFalse(is_error)
+        self.assertEqual(json.loads(clothing_json), {"intent": 1})
+        row = timer.to_dict()
+        self.assertIsNotNone(row["speech_start"])
+        self.assertGreaterEqual(row["tts_time_to_first_audio"], 0.01)
+        self.assertIsNotNone(row["tts_done"])
+
+
+if __name__ == "__main__":
+    unittest.main()
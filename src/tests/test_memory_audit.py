@@ -0,0 +1,101 @@
+# src/tests/test_memory_audit.py
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from memory_audit import MemoryAudit, categorize
+
+LEAK = []
+
+
+def leaky_turn():
+    LEAK.append(bytearray(1000))
+
+
+def steady_turn():
+    cache = [bytearray(1000) for _ in range(10)]
+    return len(cache)
+
+
+def run(audit, turn_function, turns=400, snapshot_every=50):
+    audit.start()
+    try:
+        for turn in range(1, turns + 1):
+            turn_function()
+            if turn % snapshot_every == 0:
+                audit.snapshot(turn)
+    finally:
+        audit.stop()
+    return audit
+
+
+class TestMemoryAudit(unittest.TestCase):
+    def tearDown(self):
+        LEAK.clear()
+
+    def test_leak_fails_threshold_and_is_located(self):
+        audit = run(MemoryAudit(warmup_turns=100), leaky_turn)
+        passed, growth = audit.check(max_growth_per_1000_turns=100 * 1024)
+        self.assertFalse(passed)
+        # About 1 KB per turn
+        self.assertGreater(growth, 800 * 1024)
+
+        top = audit.top_growth(limit=1)[0]
+        self.assertIn("test_memory_audit.py", top["location"])
+        self.assertEqual(top["category"], "ours")
+        self.assertGreater(audit.growth_by_category()["ours"], 200 * 1024)
+
+    def test_steady_state_passes(self):
+        audit = run(MemoryAudit(warmup_turns=100), steady_turn)
+        passed, growth = audit.check(max_growth_per_1000_turns=100 * 1024)
+        self.assertTrue(passed, f"growth {growth}")
+
+    def test_warmup_growth_is_ignored(self):
+        def turn_with_warmup_cache(state={"turn": 0}):
+            state["turn"] += 1
+            if state["turn"] <= 100:
+                LEAK.append(bytearray(1000))
+
+        audit = run(MemoryAudit(warmup_turns=100), turn_with_warmup_cache)
+        self.assertEqual(audit.samples[0]["turn"], 50)
+        self.assertTrue(audit.check(max_growth_per_1000_turns=50 * 1024)[0])
+
+    def test_categorize(self):
+        self.assertEqual(
+            categorize("/venv/lib/site-packages/transformers/tokenization_utils.py"),
+            "tokenizers",
+        )
+        torch_file = "/venv/lib/site-packages/torch/nn/module.py"
+        self.assertEqual(categorize(torch_file), "torch")
+        self.assertEqual(categorize(os.path.join(parent_dir, "wer.py")), "ours")
+        self.assertEqual(categorize("/usr/lib/python3.11/json/encoder.py"), "stdlib")
+
+    def test_save_writes_samples_and_report(self):
+        audit = run(MemoryAudit(warmup_turns=0), steady_turn, turns=100)
+        with tempfile.TemporaryDirectory() as tmp:
+            samples_file, report_file = audit.save(
+                tmp, max_growth_per_1000_turns=1024 * 1024
+            )
+            self.assertTrue(os.path.exists(samples_file))
+            self.assertTrue(os.path.exists(report_file))
+        self.assertTrue(audit.report(max_growth_per_1000_turns=1024 * 1024)["passed"])
+
+    def test_save_writes_the_given_report(self):
+        audit = run(MemoryAudit(warmup_turns=0), steady_turn, turns=100)
+        report = audit.report()
+        report["target"] = "rules"
+        with tempfile.TemporaryDirectory() as tmp:
+            _, report_file = audit.save(tmp, report=report)
+            with open(report_file) as f:
+                self.assertEqual(json.load(f)["target"], "rules")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+# src/tests/test_memory_soak.py
+import os
+import sys
+import argparse
+import tempfile
+import traceback
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+# Import required modules
+from memory_audit import MemoryAudit
+from language_model import IndoBERTFashionProcessor
+from response_generator import ResponseGenerator
+
+QUERIES = [
+    "Baju formal untuk interview",
+    "Outfit casual untuk jalan-jalan",
+    "Pakaian untuk cuaca panas",
+    "Baju untuk ke pesta",
+    "Rekomendasi fashion untuk musim dingin",
+    "Saya pria berkulit cerah, mau ke meeting kantor",
+    "Outfit untuk wanita berkulit sawo matang ke acara casual",
+    "Baju formal yang professional looking",
+]
+
+INTENTS = ["formal_pria_light", "kasual_wanita_dark", "hot_weather", "party"]
+# Enough for the 500-turn warm-up plus 1000 steady-state turns
+PYTEST_TURNS = 1500
+
+
+def rule_based_turn():
+    """Parameter extraction, response templating and JSON, without the model"""
+    generator = ResponseGenerator()
+
+    def run(turn):
+        query = QUERIES[turn % len(QUERIES)]
+        parameters = IndoBERTFashionProcessor.extract_parameters_from_intent(
+            INTENTS[turn % len(INTENTS)], query
+        )
+        generator.generate_response(parameters)
+
+    return run
+
+
+def processor_turn(processor):
+    def run(turn):
+        query = QUERIES[turn % len(QUERIES)]
+        intent_id = processor.classify_intent(query)
+        sentiment = processor.analyze_sentiment(query)
+        processor.generate_response(query, intent_id, sentiment)
+
+    return run
+
+
+def chatbot_turn(processor):
+    """Full process_input plus offline TTS, with the local speech backend"""
+    from chatbot_azure import AzureFashionChatbot
+    from speech_backend import LocalSpeechBackend
+    from tts_cache import TTSCache
+
+    chatbot = AzureFashionChatbot(
+        backend=LocalSpeechBackend(),
+        nlp_processor=processor,
+        tts_cache=TTSCache(cache_dir=None),
+    )
+
+    def run(turn):
+        query = QUERIES[turn % len(QUERIES)]
+        response, is_error, _ = chatbot.process_input(query)
+        chatbot.text_to_speech(response, is_error)
+
+    return run
+
+
+def run_memory_soak(
+    model_path="./fine-tuned-model",
+    turns=5000,
+    snapshot_every=250,
+    warmup_turns=500,
+    max_growth_kb=256,
+    target="auto",
+    results_dir="test_results",
+):
+    """
+    Run many turns under tracemalloc and fail on steady-state memory growth.
+
+    Args:
+        target (str): "rules" (no model), "processor", "chatbot", or "auto"
+            (processor if the model directory exists, otherwise rules)
+        max_growth_kb (float): Allowed traced growth per 1000 turns after warmup
+
+    Returns:
+        dict: The audit report, with "passed"
+    """
+    try:
+        if target == "auto":
+            target = "processor" if os.path.isdir(model_path) else "rules"
+        if target == "rules":
+            run_turn = rule_based_turn()
+        else:
+            processor = IndoBERTFashionProcessor(model_path)
+            run_turn = (
+                chatbot_turn(processor)
+                if target == "chatbot"
+                else processor_turn(processor)
+            )
+
+        print(f"Memory soak: {turns} turns against '{target}'")
+        print(f"Warm-up {warmup_turns} turns, snapshot every {snapshot_every} turns")
+
+        audit = MemoryAudit(warmup_turns=warmup_turns).start()
+        try:
+            audit.snapshot(0)
+            for turn in range(1, turns + 1):
+                run_turn(turn)
+                if turn % snapshot_every == 0 or turn == turns:
+                    sample = audit.snapshot(turn)
+                    rss = sample["rss_bytes"]
+                    print(
+                        f"  turn {turn}: traced {sample['traced_bytes'] / 1024:.0f} KB"
+                        + (f", RSS {rss / 1024 / 1024:.1f} MB" if rss else "")
+                    )
+        finally:
+            audit.stop()
+
+        max_growth = max_growth_kb * 1024
+        report = audit.report(max_growth_per_1000_turns=max_growth)
+        report["target"] = target
+        samples_file, report_file = audit.save(results_dir, report=report)
+
+        print("\n" + "=" * 60)
+        print("Memory Soak Summary:")
+        print("-" * 60)
+        for key in [
+            "traced_growth_per_1000_turns",
+            "rss_growth_per_1000_turns",
+            "untraced_growth_per_1000_turns",
+        ]:
+            value = report[key]
+            text = f"{value / 1024:.1f} KB" if value is not None else "n/a"
+            print(f"  {key}: {text}")
+        print("  Growth since baseline by source:")
+        for category, size in report["growth_by_category"].items():
+            print(f"    {category}: {size / 1024:+.1f} KB")
+        print("  Top growing allocation sites:")
+        for row in report["top_growth"][:10]:
+            print(
+                f"    {row['size_diff'] / 1024:+8.1f} KB {row['count_diff']:+6d} "
+                f"[{row['category']}] {row['location']}"
+            )
+        status = "PASSED" if report["passed"] else "FAILED"
+        print(f"  Result: {status} (limit {max_growth_kb} KB per 1000 turns)")
+        print("=" * 60)
+        print(f"Samples saved to: {samples_file}")
+        print(f"Report saved to: {report_file}")
+        return report
+
+    except Exception as e:
+        print(f"Error in memory soak test: {str(e)}")
+        traceback.print_exc()
+        return None
+
+
+def test_memory_soak():
+    with tempfile.TemporaryDirectory() as results_dir:
+        report = run_memory_soak(turns=PYTEST_TURNS, results_dir=results_dir)
+    assert report is not None, "Memory soak did not complete"
+    assert report["passed"], (
+        f"Traced growth {report['traced_growth_per_1000_turns']} bytes "
+        "per 1000 turns exceeds the limit"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory leak soak test")
+    parser.add_argument("--model-path", default="./fine-tuned-model")
+    parser.add_argument("--turns", type=int, default=5000)
+    parser.add_argument("--snapshot-every", type=int, default=250)
+    parser.add_argument("--warmup-turns", type=int, default=500)
+    parser.add_argument(
+        "--max-growth-kb",
+        type=float,
+        default=256,
+        help="Allowed traced memory growth per 1000 turns after warm-up",
+    )
+    parser.add_argument(
+        "--target", choices=["auto", "rules", "processor", "chatbot"], default="auto"
+    )
+    args = parser.parse_args()
+
+    report = run_memory_soak(
+        model_path=args.model_path,
+        turns=args.turns,
+        snapshot_every=args.snapshot_every,
+        warmup_turns=args.warmup_turns,
+        max_growth_kb=args.max_growth_kb,
+        target=args.target,
+    )
+    sys.exit(0 if report and report["passed"] else 1)
@@ -0,0 +1,152 @@
+# src/tests/test_metrics.py
+import os
+import sys
+import json
+import tempfile
+import unittest
+import urllib.error
+import urllib.request
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import tracing
+from metrics import MetricsRegistry, SpanMetricsExporter
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_with_labels(self):
+        requests = self.registry.counter("requests_total", "Requests", ["intent"])
+        requests.inc(intent="party")
+        requests.inc(2, intent="party")
+        requests.inc(intent="wedding")
+        self.assertEqual(requests.value(intent="party"), 3)
+        self.assertEqual(requests.total(), 4)
+        with self.assertRaises(ValueError):
+            requests.inc(-1, intent="party")
+        with self.assertRaises(ValueError):
+            requests.inc(category="party")
+
+    def test_registry_returns_existing_metric(self):
+        first = self.registry.counter("hits_total", "Hits")
+        self.assertIs(first, self.registry.counter("hits_total", "Hits"))
+        with self.assertRaises(ValueError):
+            self.registry.gauge("hits_total", "Hits")
+
+    def test_prometheus_text_format(self):
+        requests = self.registry.counter("requests_total", "Requests", ["intent"])
+        requests.inc(intent='say "hi"')
+        self.registry.gauge("queue_depth", "Queue", function=lambda: 3)
+        latency = self.registry.histogram(
+            "latency_seconds", "Latency", buckets=(0.1, 1.0)
+        )
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+
+        text = self.registry.to_prometheus()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{intent="say \\"hi\\""} 1', text)
+        self.assertIn("queue_depth 3", text)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("latency_seconds_count 3", text)
+        self.assertIn("latency_seconds_sum 5.55", text)
+
+    def test_histogram_summary_interpolates_percentiles(self):
+        latency = self.registry.histogram("latency_seconds", "Latency", buckets=(1, 2))
+        for value in [0.5] * 50 + [1.5] * 50:
+            latency.observe(value)
+        summary = self.registry.to_dict()["latency_seconds"][""]
+        self.assertEqual(summary["count"], 100)
+        self.assertAlmostEqual(summary["mean"], 1.0)
+        self.assertAlmostEqual(summary["p50"], 1.0)
+        self.assertAlmostEqual(summary["p90"], 1.8)
+
+    def test_json_dump(self):
+        self.registry.counter("requests_total", "Requests", ["intent"]).inc(
+            intent="party"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.registry.dump_json(os.path.join(tmp, "metrics.json"))
+            with open(path) as f:
+                snapshot = json.load(f)
+        self.assertEqual(snapshot["requests_total"], {"party": 1})
+
+    def test_span_exporter_records_stage_latency(self):
+        stages = self.registry.histogram("stage_seconds", "Stages", ["stage"])
+        tracing.enable(SpanMetricsExporter(stages))
+        try:
+            with tracing.span("turn"):
+                with tracing.span("classify"):
+                    pass
+        finally:
+            tracing.disable()
+        self.assertEqual(stages.count(stage="turn"), 1)
+        self.assertEqual(stages.count(stage="classify"), 1)
+
+    def test_http_endpoint(self):
+        self.registry.counter("requests_total", "Requests").inc()
+        routes = {"/echo": lambda query: (202, "text/plain", query["text"][0])}
+        server = self.registry.serve(port=0, host="127.0.0.1", routes=routes)
+        try:
+            port = server.server_address[1]
+            url = f"http://127.0.0.1:{port}"
+            with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+                self.assertIn("requests_total 1", response.read().decode())
+            with urllib.request.urlopen(f"{url}/metrics.json", timeout=5) as response:
+                self.assertEqual(json.loads(response.read())["requests_total"], 1)
+            with urllib.request.urlopen(f"{url}/echo?text=hi", timeout=5) as response:
+                self.assertEqual((response.status, response.read()), (202, b"hi"))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_post_routes_reject_get(self):
+        calls = []
+
+        def start(query):
+            calls.append(query)
+            return 202, "text/plain", "started"
+
+        server = self.registry.serve(port=0, post_routes={"/start": start})
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/start?mode=x"
+            with self.assertRaises(urllib.error.HTTPError) as raised:
+                urllib.request.urlopen(url, timeout=5)
+            self.assertEqual(raised.exception.code, 405)
+            self.assertEqual(calls, [])
+
+            request = urllib.request.Request(url, data=b"seconds=2", method="POST")
+            with urllib.request.urlopen(request, timeout=5) as response:
+                self.assertEqual(response.status, 202)
+            self.assertEqual(calls, [{"mode": ["x"], "seconds": ["2"]}])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_failing_route_returns_500(self):
+        def broken(query):
+            raise ValueError("boom")
+
+        server = self.registry.serve(port=0, routes={"/broken": broken})
+        try:
+            host, port = server.server_address[:2]
+            self.assertEqual(host, "127.0.0.1")
+            with self.assertRaises(urllib.error.HTTPError) as raised:
+                urllib.request.urlopen(f"http://{host}:{port}/broken", timeout=5)
+            self.assertEqual(raised.exception.code, 500)
+            self.assertIn(b"boom", raised.exception.read())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
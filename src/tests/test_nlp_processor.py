@@ -5,9 +5,6 @@ import json
 import time
 from datetime import datetime
 import numpy as np
-from sklearn.metrics import classification_report, confusion_matrix
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 # Add the parent directory to the path so we can import from src
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -202,6 +199,8 @@ def test_nlp_processor(model_path="./fine-tuned-model"):
         avg_processing_time = results_df["processing_time"].mean()
 
         # Generate classification report
+        from sklearn.metrics import classification_report, confusion_matrix
+
         y_true = results_df["expected_intent"]
         y_pred = results_df["predicted_intent"]
         class_report = classification_report(y_true, y_pred, output_dict=True)
@@ -210,6 +209,9 @@ def test_nlp_processor(model_path="./fine-tuned-model"):
         cm = confusion_matrix(y_true, y_pred)
 
         # Plot confusion matrix
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         plt.figure(figsize=(12, 10))
         sns.heatmap(cm, annot=True, fmt="d", cmap="Blues")
         plt.xlabel("Predicted Intent")
@@ -0,0 +1,210 @@
+# src/tests/test_open_loop_load.py
+import os
+import sys
+import json
+import argparse
+import unittest
+import traceback
+import pandas as pd
+from datetime import datetime
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+# Import required modules
+from load_generator import (
+    http_target,
+    processor_target,
+    run_rate_sweep,
+    slo_violations,
+)
+
+QUERIES = [
+    "Baju formal untuk interview",
+    "Outfit casual untuk jalan-jalan",
+    "Pakaian untuk cuaca panas",
+    "Baju untuk ke pesta",
+    "Rekomendasi fashion untuk musim dingin",
+    "Saya pria berkulit cerah, mau ke meeting kantor",
+    "Outfit untuk wanita berkulit sawo matang ke acara casual",
+    "Baju formal yang professional looking",
+]
+
+
+def run_open_loop_load(
+    rates=(1, 2, 4, 8),
+    duration=30,
+    model_path="./fine-tuned-model",
+    url=None,
+    max_workers=32,
+    seed=42,
+    slo_p99=1.0,
+    max_error_rate=0.01,
+):
+    """
+    Measure latency and throughput at increasing offered load.
+
+    Requests arrive as a Poisson process at each rate, independent of how
+    fast earlier requests finish, against the NLP processor in this process
+    or, if `url` is given, an HTTP endpoint. Every rate is checked against
+    the SLO: p99 latency up to `slo_p99` seconds and at most `max_error_rate`
+    failed requests.
+    """
+    try:
+        results_dir = "test_results"
+        os.makedirs(results_dir, exist_ok=True)
+
+        if url:
+            print(f"Target: HTTP endpoint {url}")
+            target = http_target(url)
+        else:
+            from language_model import IndoBERTFashionProcessor
+
+            print(f"Target: NLP processor from {model_path}")
+            target = processor_target(IndoBERTFashionProcessor(model_path))
+
+        results = run_rate_sweep(
+            target, QUERIES, rates, duration, max_workers=max_workers, seed=seed
+        )
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        rows = []
+        for result in results:
+            row = {
+                key: value
+                for key, value in result.items()
+                if key not in ("histogram", "sample_errors")
+            }
+            row.update(result["histogram"].to_dict())
+            rows.append(row)
+
+            # Full percentile distribution per rate, for HDR-style plots
+            distribution_file = os.path.join(
+                results_dir,
+                f"open_loop_latency_{result['offered_rate']:g}rps_{timestamp}.csv",
+            )
+            pd.DataFrame(
+                result["histogram"].percentile_distribution(),
+                columns=["latency_seconds", "percentile", "total_count"],
+            ).to_csv(distribution_file, index=False)
+
+        results_df = pd.DataFrame(rows)
+        results_file = os.path.join(results_dir, f"open_loop_sweep_{timestamp}.csv")
+        results_df.to_csv(results_file, index=False)
+
+        import matplotlib.pyplot as plt
+
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+        ax1.plot(results_df["offered_rate"], results_df["throughput"], marker="o")
+        ax1.plot(
+            results_df["offered_rate"], results_df["offered_rate"], "--", color="gray"
+        )
+        ax1.set_xlabel("Offered Load (requests/second)")
+        ax1.set_ylabel("Throughput (requests/second)")
+        ax1.set_title("Throughput vs Offered Load")
+        ax1.grid(True)
+
+        for column in ["p50", "p90", "p99", "p99_9"]:
+            ax2.plot(
+                results_df["offered_rate"], results_df[column], marker="o", label=column
+            )
+        ax2.set_xlabel("Offered Load (requests/second)")
+        ax2.set_ylabel("Latency (seconds)")
+        ax2.set_yscale("log")
+        ax2.set_title("Latency Percentiles vs Offered Load")
+        ax2.legend()
+        ax2.grid(True)
+
+        plt.tight_layout()
+        plot_file = os.path.join(results_dir, f"open_loop_sweep_{timestamp}.png")
+        plt.savefig(plot_file)
+        plt.close()
+
+        violations = {
+            f"{row['offered_rate']:g}": slo_violations(row, slo_p99, max_error_rate)
+            for row in rows
+        }
+        violations = {rate: found for rate, found in violations.items() if found}
+        summary = {
+            "timestamp": timestamp,
+            "target": url or model_path,
+            "duration_per_rate": duration,
+            "max_workers": max_workers,
+            "slo": {"p99_seconds": slo_p99, "max_error_rate": max_error_rate},
+            "slo_violations": violations,
+            "slo_passed": not violations,
+            "rates": rows,
+        }
+        summary_file = os.path.join(
+            results_dir, f"open_loop_summary_{timestamp}.json"
+        )
+        with open(summary_file, "w") as f:
+            json.dump(summary, f, indent=2)
+
+        print("\n" + "=" * 60)
+        print("Open-Loop Load Test Summary:")
+        print("-" * 60)
+        for row in rows:
+            print(
+                f"  {row['offered_rate']:g} req/s offered: "
+                f"{row['throughput']:.2f} req/s, "
+                f"p50 {row['p50'] or 0:.4f}s, p90 {row['p90'] or 0:.4f}s, "
+                f"p99 {row['p99'] or 0:.4f}s, p99.9 {row['p99_9'] or 0:.4f}s"
+            )
+        for rate, found in violations.items():
+            print(f"  SLO missed at {rate} req/s: {'; '.join(found)}")
+        print(f"  SLO: {'PASSED' if summary['slo_passed'] else 'FAILED'}")
+        print("=" * 60)
+        print(f"Detailed results saved to: {results_file}")
+        print(f"Summary saved to: {summary_file}")
+        print(f"Plot saved to: {plot_file}")
+
+        return summary, results_df
+
+    except Exception as e:
+        print(f"Error in open-loop load testing: {str(e)}")
+        traceback.print_exc()
+        return None, None
+
+
+def test_open_loop_load(model_path="./fine-tuned-model"):
+    if not os.path.isdir(model_path):
+        raise unittest.SkipTest(f"No model at {model_path}")
+    summary, _ = run_open_loop_load(rates=(1, 2), duration=10, model_path=model_path)
+    assert summary is not None, "Open-loop load test did not complete"
+    assert summary["slo_passed"], summary["slo_violations"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Open-loop load test")
+    parser.add_argument(
+        "--rates",
+        default="1,2,4,8",
+        help="Comma-separated offered loads in requests per second",
+    )
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--model-path", default="./fine-tuned-model")
+    parser.add_argument(
+        "--url", default=None, help="Load an HTTP endpoint instead of the processor"
+    )
+    parser.add_argument("--max-workers", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--slo-p99", type=float, default=1.0, help="Allowed p99 latency (seconds)"
+    )
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    summary, _ = run_open_loop_load(
+        rates=[float(rate) for rate in args.rates.split(",")],
+        duration=args.duration,
+        model_path=args.model_path,
+        url=args.url,
+        max_workers=args.max_workers,
+        seed=args.seed,
+        slo_p99=args.slo_p99,
+        max_error_rate=args.max_error_rate,
+    )
+    sys.exit(0 if summary and summary["slo_passed"] else 1)
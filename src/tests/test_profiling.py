@@ -0,0 +1,151 @@
+# src/tests/test_profiling.py
+import os
+import sys
+import time
+import tempfile
+import threading
+import unittest
+import xml.etree.ElementTree as ET
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import profiling
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _busy_thread(self):
+        stop = threading.Event()
+        thread = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(stop.set)
+
+    def test_sampler_sees_other_threads(self):
+        self._busy_thread()
+        sampler = profiling.StackSampler(interval=0.001).start()
+        time.sleep(0.2)
+        stacks = sampler.stop()
+        self.assertGreater(sampler.samples, 10)
+        busy = [s for s in stacks if s.startswith("busy;") and "busy_loop" in s]
+        self.assertTrue(busy)
+        self.assertFalse(any("stack-sampler" in s for s in stacks))
+
+    def test_collapsed_round_trip_and_svg(self):
+        stacks = {"main;handle (app.py);classify (nlp.py)": 3, "main;idle (app.py)": 1}
+        folded = profiling.write_collapsed(
+            stacks, os.path.join(self.tmp.name, "p.folded")
+        )
+        self.assertEqual(profiling.read_collapsed(folded), stacks)
+
+        svg = profiling.render_flamegraph(
+            stacks, os.path.join(self.tmp.name, "p.svg"), title="<test>"
+        )
+        root = ET.parse(svg).getroot()
+        titles = [t.text for t in root.iter("{http://www.w3.org/2000/svg}title")]
+        self.assertIn("classify (nlp.py) (3 samples, 75.00%)", titles)
+
+    def test_sample_session_writes_flamegraph(self):
+        self._busy_thread()
+        session = profiling.profile_for(
+            0.2, "sample", output_dir=self.tmp.name, wait=True
+        )
+        self.assertIsNone(session.error)
+        self.assertEqual(
+            sorted(os.path.splitext(path)[1] for path in session.outputs),
+            [".folded", ".svg"],
+        )
+        for path in session.outputs:
+            self.assertTrue(os.path.exists(path))
+
+    def test_cprofile_session_profiles_wrapped_requests(self):
+        session = profiling.profile_for(0.3, "cprofile", output_dir=self.tmp.name)
+
+        def request():
+            with profiling.profile_request():
+                sum(i * i for i in range(10000))
+
+        threads = [threading.Thread(target=request) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(session.done.wait(5))
+
+        text_file = [p for p in session.outputs if p.endswith(".txt")][0]
+        with open(text_file) as f:
+            self.assertIn("<genexpr>", f.read())
+        self.assertIs(profiling.profile_request(), profiling._NOT_PROFILED)
+
+    def test_only_one_session_at_a_time(self):
+        session = profiling.profile_for(0.2, "sample", output_dir=self.tmp.name)
+        status, _, body = profiling.http_route({"seconds": ["1"]})
+        self.assertEqual(status, 409)
+        self.assertIn("already running", body)
+        session.done.wait(5)
+
+    def test_invalid_route_parameters(self):
+        for query in (
+            {"seconds": ["abc"]},
+            {"seconds": ["-1"]},
+            {"mode": ["torch"], "calls": ["many"]},
+            {"mode": ["perf"]},
+        ):
+            status, _, body = profiling.http_route(query)
+            self.assertEqual(status, 400, query)
+            self.assertTrue(
+                profiling._session is None or profiling._session.done.is_set()
+            )
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            profiling.profile_for(1, "perf", output_dir=self.tmp.name)
+
+    def test_torch_forward_profile(self):
+        try:
+            import torch
+        except ImportError:
+            self.skipTest("torch is not installed")
+
+        model = torch.nn.Linear(8, 4)
+        session = profiling.start_torch_profiling(1, output_dir=self.tmp.name)
+        try:
+            for _ in range(2):
+                with profiling.torch_forward_profile("linear_forward"):
+                    model(torch.ones(2, 8))
+        finally:
+            profiling._torch_session = None
+        self.assertEqual(len(session.outputs), 2)
+        self.assertEqual(session.calls, 1)
+        with open([p for p in session.outputs if p.endswith(".txt")][0]) as f:
+            self.assertIn("aten::", f.read())
+
+    def test_exhausted_torch_session_is_cleared(self):
+        session = profiling.start_torch_profiling(2, output_dir=self.tmp.name)
+        try:
+            self.assertEqual(session.claim(), 1)
+            self.assertIs(profiling._torch_session, session)
+            self.assertEqual(session.claim(), 2)
+            self.assertIsNone(profiling._torch_session)
+            self.assertIs(
+                profiling.torch_forward_profile("forward"), profiling._NOT_PROFILED
+            )
+        finally:
+            profiling._torch_session = None
+
+
+if __name__ == "__main__":
+    unittest.main()
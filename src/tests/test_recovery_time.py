@@ -8,7 +8,6 @@ import signal
 import subprocess
 import pandas as pd
 from datetime import datetime
-import matplotlib.pyplot as plt
 
 # Add the parent directory to the path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -271,6 +270,8 @@ def test_recovery_time():
     ].mean()
 
     # Create visualizations
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 6))
     for i, result in enumerate(results):
         if result["recovered"]:
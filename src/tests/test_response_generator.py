@@ -6,7 +6,6 @@ import time
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import matplotlib.pyplot as plt
 
 # Add the parent directory to the path so we can import from src
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -234,6 +233,8 @@ def test_response_generator():
         pct_valid_json = results_df["json_valid"].mean() * 100
 
         # Create visualizations
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(12, 8))
         plt.bar(results_df["scenario"], results_df["processing_time"])
         plt.xlabel("Scenario")
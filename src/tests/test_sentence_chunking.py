@@ -0,0 +1,48 @@
+# src/tests/test_sentence_chunking.py
+import os
+import sys
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from speech_streaming import split_sentences
+from fashion_mapping import FashionMapping
+
+
+class TestSentenceChunking(unittest.TestCase):
+    def test_recommendation_is_split_into_sentences(self):
+        """A full recommendation yields several chunks that rejoin to the original."""
+        mapping = FashionMapping()
+        parameters = {
+            "gender": "pria",
+            "skin_tone": "light",
+            "occasion": "formal",
+            "weather": "hot",
+        }
+        text = mapping.format_recommendation(
+            mapping.get_recommendation(parameters), parameters
+        )
+
+        chunks = split_sentences(text)
+        self.assertGreater(len(chunks), 2)
+        self.assertEqual(" ".join(chunks), " ".join(text.split()))
+        self.assertTrue(chunks[0].endswith("."))
+
+    def test_short_sentences_are_merged(self):
+        chunks = split_sentences("Oke. Baik. Ini kalimat yang cukup panjang sekali.")
+        self.assertEqual(chunks, ["Oke. Baik. Ini kalimat yang cukup panjang sekali."])
+
+    def test_short_trailing_sentence_joins_previous_chunk(self):
+        chunks = split_sentences("Ini kalimat pertama yang panjang. Ya!")
+        self.assertEqual(chunks, ["Ini kalimat pertama yang panjang. Ya!"])
+
+    def test_single_sentence(self):
+        self.assertEqual(split_sentences("Halo"), ["Halo"])
+        self.assertEqual(split_sentences(""), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+# src/tests/test_session_store.py
+import os
+import sys
+import time
+import tempfile
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from session_store import (
+    InMemorySessionStore,
+    SessionStore,
+    SQLiteSessionStore,
+    create_session_store,
+    new_session_state,
+)
+from chatbot_interface import DEFAULT_SESSION_ID, FashionChatbot
+
+
+class KeywordProcessor:
+    """Stands in for IndoBERTFashionProcessor so no model has to be loaded"""
+
+    def classify_intent(self, text):
+        return 0
+
+
+class TestInMemorySessionStore(unittest.TestCase):
+    def test_ttl_expiry(self):
+        store = InMemorySessionStore(ttl_seconds=0.05)
+        store.put("a", new_session_state())
+        self.assertIsNotNone(store.get("a"))
+        time.sleep(0.1)
+        self.assertIsNone(store.get("a"))
+        self.assertEqual(store.stats["expired"], 1)
+
+    def test_put_sweeps_expired_sessions(self):
+        store = InMemorySessionStore(ttl_seconds=0.05)
+        for i in range(100):
+            store.put(f"old-{i}", new_session_state())
+        time.sleep(0.1)
+        store.put("new", new_session_state())
+        self.assertEqual(len(store), 1)
+
+    def test_max_sessions_evicts_least_recently_used(self):
+        store = InMemorySessionStore(max_sessions=2)
+        store.put("a", {"n": 1})
+        store.put("b", {"n": 2})
+        store.put("a", {"n": 3})
+        store.put("c", {"n": 4})
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("a"), {"n": 3})
+        self.assertEqual(store.stats["evicted"], 1)
+
+
+class TestSQLiteSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "sessions.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_sessions_survive_reopen(self):
+        state = new_session_state()
+        state.pending_params = {"gender": "pria"}
+        state.history.append("user", "Saya pria")
+        store = create_session_store(f"sqlite:///{self.path}")
+        store.put("a", state)
+        store.close()
+
+        store = SQLiteSessionStore(self.path)
+        restored = store.get("a")
+        self.assertEqual(restored.pending_params, {"gender": "pria"})
+        self.assertEqual(restored.history[0].text, "Saya pria")
+        store.delete("a")
+        self.assertIsNone(store.get("a"))
+        store.close()
+
+    def test_expired_rows_are_hidden_and_swept(self):
+        store = SQLiteSessionStore(self.path, ttl_seconds=0.05)
+        store.put("a", new_session_state())
+        store.put("b", new_session_state())
+        time.sleep(0.1)
+        self.assertIsNone(store.get("a"))
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.evict_expired(), 2)
+        store.close()
+
+    def test_unknown_url(self):
+        with self.assertRaises(ValueError):
+            create_session_store("memcached://localhost")
+
+    def test_incomplete_store_cannot_be_created(self):
+        class GetOnlyStore(SessionStore):
+            def get(self, session_id):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnlyStore()
+
+
+class TestFashionChatbotSessions(unittest.TestCase):
+    def setUp(self):
+        self.chatbot = FashionChatbot(nlp_processor=KeywordProcessor())
+
+    def test_interleaved_clarification_dialogs(self):
+        """Each session keeps its own pending parameters."""
+        question = self.chatbot.process_query("Baju untuk kerja", session_id="u1")
+        self.assertIn("pria atau wanita", question)
+        question = self.chatbot.process_query("Saya wanita", session_id="u2")
+        self.assertIn("warna kulit", question)
+
+        self.chatbot.process_query("pria", session_id="u1")
+        u1_state = self.chatbot.sessions.get("u1")
+        self.assertEqual(u1_state.pending_params["gender"], "pria")
+        self.assertEqual(u1_state.pending_params["occasion"], "formal")
+        self.assertEqual(
+            self.chatbot.sessions.get("u2").pending_params["gender"], "wanita"
+        )
+
+        response = self.chatbot.process_query("kulit cerah", session_id="u1")
+        self.assertIsInstance(response, str)
+        u1_state = self.chatbot.sessions.get("u1")
+        self.assertFalse(u1_state.awaiting_clarification)
+        self.assertEqual(len(u1_state.history), 6)
+        self.assertEqual(u1_state.history[-1].text, response)
+        self.assertTrue(self.chatbot.sessions.get("u2").awaiting_clarification)
+
+    def test_clarification_reply_fills_all_slots(self):
+        self.chatbot.process_query("Tolong rekomendasikan baju", session_id="u1")
+        self.chatbot.process_query("cowok, kulit sawo matang, buat kerja", session_id="u1")
+        state = self.chatbot.sessions.get("u1")
+        self.assertFalse(state.awaiting_clarification)
+        self.assertEqual(
+            state.last_params,
+            {"gender": "pria", "skin_tone": "dark", "occasion": "formal"},
+        )
+
+    def test_many_concurrent_dialogs(self):
+        for i in range(2000):
+            self.chatbot.process_query("Baju untuk kerja", session_id=f"user-{i}")
+        self.assertEqual(len(self.chatbot.sessions), 2000)
+        self.assertEqual(
+            self.chatbot.sessions.get("user-1999").clarification_type, "gender"
+        )
+
+    def test_default_session(self):
+        self.chatbot.process_query("Baju untuk kerja")
+        self.assertTrue(
+            self.chatbot.sessions.get(DEFAULT_SESSION_ID).awaiting_clarification
+        )
+        self.chatbot.end_session()
+        self.assertIsNone(self.chatbot.sessions.get(DEFAULT_SESSION_ID))
+
+
+if __name__ == "__main__":
+    unittest.main()
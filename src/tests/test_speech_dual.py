@@ -3,78 +3,56 @@ import os
 import sys
 import pandas as pd
 import json
-import time
 from datetime import datetime
 import azure.cognitiveservices.speech as speechsdk
-from dotenv import load_dotenv
 
-
-def calculate_word_error_rate(reference, hypothesis):
-    """Calculate Word Error Rate between reference and hypothesis."""
-    # Convert to lowercase and split into words
-    reference_words = reference.lower().split()
-    hypothesis_words = hypothesis.lower().split() if hypothesis else []
-
-    # Calculate Levenshtein distance
-    r_len = len(reference_words)
-    h_len = len(hypothesis_words)
-
-    # Initialize matrix with edit distances
-    d = [[0 for _ in range(h_len + 1)] for _ in range(r_len + 1)]
-
-    # Fill first row and column with edit distances
-    for i in range(r_len + 1):
-        d[i][0] = i
-    for j in range(h_len + 1):
-        d[0][j] = j
-
-    # Calculate minimum edit distance
-    for i in range(1, r_len + 1):
-        for j in range(1, h_len + 1):
-            if reference_words[i - 1] == hypothesis_words[j - 1]:
-                d[i][j] = d[i - 1][j - 1]
-            else:
-                d[i][j] = min(
-                    d[i - 1][j] + 1,  # deletion
-                    d[i][j - 1] + 1,  # insertion
-                    d[i - 1][j - 1] + 1,  # substitution
-                )
-
-    # Calculate WER
-    distance = d[r_len][h_len]
-    if r_len == 0:
-        return 0.0
-
-    return distance / r_len
-
-
-def setup_azure_speech():
-    """Set up Azure Speech SDK with credentials from .env file."""
-    load_dotenv()
-    speech_key = os.getenv("AZURE_SPEECH_KEY")
-    speech_region = os.getenv("AZURE_SPEECH_REGION")
-
-    if not speech_key or not speech_region:
-        raise ValueError("Azure Speech credentials not found in .env file")
-
-    speech_config = speechsdk.SpeechConfig(
-        subscription=speech_key, region=speech_region
-    )
-    speech_config.speech_recognition_language = "id-ID"
-
-    return speech_config
-
-
-def test_speech_recognition(test_type="all"):
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from speech_backend import create_speech_backend
+from speech_eval import run_parallel_recognition
+from audio_assets import get_audio_manager
+from vad import detect_speech
+from wer import align, character_error_rate, word_error_rate
+
+RESULT_COLUMNS = [
+    "filename",
+    "category",
+    "expected_text",
+    "recognized_text",
+    "wer",
+    "cer",
+    "substitutions",
+    "insertions",
+    "deletions",
+    "is_success",
+    "processing_time",
+    "audio_seconds",
+    "audio_seconds_sent",
+    "status",
+    "attempts",
+]
+
+
+def test_speech_recognition(
+    test_type="all", backend="azure", workers=4, max_retries=3, vad=False
+):
     """
     Test speech recognition with option to test specific scenarios.
 
     Args:
         test_type (str): Type of test to run - "extreme", "real_world", or "all"
+        backend (str): Speech backend - "azure" or "local" (offline replay)
+        workers (int): Number of files recognized concurrently
+        max_retries (int): Retries per file for throttling and transient errors
+        vad (bool): Trim leading/trailing silence locally before recognition
     """
     try:
-        # Set up Azure Speech
-        speech_config = setup_azure_speech()
+        speech_backend = create_speech_backend(backend)
+        audio_manager = get_audio_manager()
+        run_label = f"{test_type}_vad" if vad else test_type
 
         # Create results directory
         results_dir = "test_results"
@@ -97,58 +75,78 @@ def test_speech_recognition(test_type="all"):
 
         print(f"Running {test_type} tests on {len(test_df)} audio files...")
 
-        # Initialize results
-        results = []
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        results_file = os.path.join(
+            results_dir, f"speech_test_{run_label}_results_{timestamp}.csv"
+        )
         audio_root_dir = "test_data/audio_samples"
 
-        # Test each file
-        for i, row in test_df.iterrows():
+        jobs = []
+        for _, row in test_df.iterrows():
             filepath = os.path.join(audio_root_dir, row["filename"])
 
             if not os.path.exists(filepath):
                 print(f"Warning: File not found - {filepath}")
                 continue
 
-            print(f"Testing {i+1}/{len(test_df)}: {row['filename']}")
-
-            # Set up audio config
-            audio_config = speechsdk.audio.AudioConfig(filename=filepath)
-            speech_recognizer = speechsdk.SpeechRecognizer(
-                speech_config=speech_config, audio_config=audio_config
+            # Only decode when trimming; without VAD the file is streamed as-is
+            audio_seconds = segment = None
+            if vad:
+                asset = audio_manager.load(filepath)
+                audio_seconds = asset.duration
+                segment = detect_speech(asset.samples, asset.sample_rate)
+
+            jobs.append(
+                {
+                    "filepath": filepath,
+                    "filename": row["filename"],
+                    "category": row["category"],
+                    "expected_text": row["expected_text"],
+                    "audio_seconds": audio_seconds,
+                    "segment": segment,
+                }
             )
 
-            # Recognize speech
-            start_time = time.time()
-            result = speech_recognizer.recognize_once()
-            end_time = time.time()
-
-            processing_time = end_time - start_time
-
-            # Process result
+        def evaluate(job, result, processing_time):
             if result.reason == speechsdk.ResultReason.RecognizedSpeech:
                 recognized_text = result.text
-                wer = calculate_word_error_rate(row["expected_text"], recognized_text)
+                wer = word_error_rate(job["expected_text"], recognized_text)
                 is_success = wer < 0.5  # Consider it success if WER less than 50%
             else:
                 recognized_text = ""
                 wer = 1.0  # 100% error
                 is_success = False
+            alignment = align(job["expected_text"], recognized_text)
 
-            # Store result
-            result_data = {
-                "filename": row["filename"],
-                "category": row["category"],
-                "expected_text": row["expected_text"],
+            return {
+                "filename": job["filename"],
+                "category": job["category"],
+                "expected_text": job["expected_text"],
                 "recognized_text": recognized_text,
                 "wer": wer,
+                "cer": character_error_rate(job["expected_text"], recognized_text),
+                "substitutions": alignment["substitutions"],
+                "insertions": alignment["insertions"],
+                "deletions": alignment["deletions"],
                 "is_success": is_success,
                 "processing_time": processing_time,
+                "audio_seconds": job["audio_seconds"],
+                "audio_seconds_sent": (
+                    job["segment"].duration if job["segment"] else job["audio_seconds"]
+                ),
                 "status": str(result.reason),
             }
-            results.append(result_data)
 
-            # Sleep briefly to avoid rate limiting
-            time.sleep(0.5)
+        # Rows are streamed to results_file as each recognition finishes
+        results = run_parallel_recognition(
+            speech_backend,
+            jobs,
+            evaluate,
+            results_file,
+            fieldnames=RESULT_COLUMNS,
+            max_workers=workers,
+            max_retries=max_retries,
+        )
 
         # Create results dataframe
         results_df = pd.DataFrame(results)
@@ -167,6 +165,13 @@ def test_speech_recognition(test_type="all"):
                     "total": len(category_df),
                     "success_rate": category_df["is_success"].mean(),
                     "average_wer": category_df["wer"].mean(),
+                    "average_processing_time": category_df["processing_time"].mean(),
+                    "audio_seconds_saved": float(
+                        (
+                            category_df["audio_seconds"]
+                            - category_df["audio_seconds_sent"]
+                        ).sum()
+                    ),
                 }
         else:
             success_rate = 0
@@ -175,10 +180,10 @@ def test_speech_recognition(test_type="all"):
             category_results = {}
 
         # Create summary
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         summary = {
             "timestamp": timestamp,
             "test_type": test_type,
+            "vad": vad,
             "total_files": len(results),
             "successful_recognitions": (
                 sum(results_df["is_success"]) if len(results_df) > 0 else 0
@@ -189,21 +194,17 @@ def test_speech_recognition(test_type="all"):
             "category_results": category_results,
         }
 
-        # Save results
-        results_file = os.path.join(
-            results_dir, f"speech_test_{test_type}_results_{timestamp}.csv"
-        )
+        # Save summary
         summary_file = os.path.join(
-            results_dir, f"speech_test_{test_type}_summary_{timestamp}.json"
+            results_dir, f"speech_test_{run_label}_summary_{timestamp}.json"
         )
 
-        results_df.to_csv(results_file, index=False)
         with open(summary_file, "w") as f:
             json.dump(summary, f, indent=2)
 
         # Print summary
         print("\n" + "=" * 60)
-        print(f"Speech Recognition Test Summary ({test_type}):")
+        print(f"Speech Recognition Test Summary ({run_label}):")
         print("-" * 60)
         print(f"Total Files: {summary['total_files']}")
         print(f"Successful Recognitions: {summary['successful_recognitions']}")
@@ -234,14 +235,18 @@ def test_speech_recognition(test_type="all"):
         return None, None
 
 
-def compare_test_results():
+def compare_test_results(backend="azure", workers=4):
     """Compare extreme vs real-world test results."""
     # Run both test types
     print("Running extreme tests...")
-    extreme_summary, _ = test_speech_recognition("extreme")
+    extreme_summary, _ = test_speech_recognition(
+        "extreme", backend=backend, workers=workers
+    )
 
     print("\nRunning real-world tests...")
-    real_world_summary, _ = test_speech_recognition("real_world")
+    real_world_summary, _ = test_speech_recognition(
+        "real_world", backend=backend, workers=workers
+    )
 
     # Create comparison report
     comparison = {
@@ -288,19 +293,104 @@ def compare_test_results():
     return comparison
 
 
+def compare_vad_results(test_type="all", backend="azure", workers=4):
+    """Run the same files with and without VAD trimming and compare per category."""
+    print("Running without VAD...")
+    baseline_summary, _ = test_speech_recognition(
+        test_type, backend=backend, workers=workers
+    )
+
+    print("\nRunning with VAD...")
+    vad_summary, _ = test_speech_recognition(
+        test_type, backend=backend, workers=workers, vad=True
+    )
+
+    runs = {"without VAD": baseline_summary, "with VAD": vad_summary}
+    missing = [label for label, summary in runs.items() if summary is None]
+    if missing:
+        print(f"No results from the run {' and '.join(missing)}; skipping comparison.")
+        return None
+
+    categories = {}
+    for category, vad_results in vad_summary["category_results"].items():
+        baseline = baseline_summary["category_results"].get(category)
+        if baseline is None:
+            print(f"Category {category} missing from the run without VAD; skipped.")
+            continue
+        categories[category] = {
+            "audio_seconds_saved": vad_results["audio_seconds_saved"],
+            "processing_time_without_vad": baseline["average_processing_time"],
+            "processing_time_with_vad": vad_results["average_processing_time"],
+            "latency_change": (
+                vad_results["average_processing_time"]
+                - baseline["average_processing_time"]
+            ),
+            "wer_change": vad_results["average_wer"] - baseline["average_wer"],
+        }
+
+    comparison = {
+        "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S"),
+        "test_type": test_type,
+        "backend": backend,
+        "categories": categories,
+    }
+
+    results_dir = "test_results"
+    comparison_file = os.path.join(
+        results_dir, f"speech_test_vad_comparison_{comparison['timestamp']}.json"
+    )
+    with open(comparison_file, "w") as f:
+        json.dump(comparison, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print("VAD Comparison (per category):")
+    print("-" * 60)
+    for category, result in categories.items():
+        print(
+            f"  {category}: {result['audio_seconds_saved']:.1f}s audio saved, "
+            f"latency {result['latency_change']:+.4f}s, "
+            f"WER {result['wer_change']:+.4f}"
+        )
+    print("=" * 60)
+    print(f"Comparison saved to: {comparison_file}")
+
+    return comparison
+
+
 if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Run speech recognition tests")
     parser.add_argument(
         "test_type",
-        choices=["extreme", "real_world", "all", "compare"],
+        choices=["extreme", "real_world", "all", "compare", "compare_vad"],
         help="Type of test to run",
     )
+    parser.add_argument(
+        "--backend",
+        choices=["azure", "local"],
+        default="azure",
+        help="Speech backend; 'local' replays the expected transcripts offline",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of files recognized concurrently",
+    )
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Trim leading/trailing silence locally before recognition",
+    )
 
     args = parser.parse_args()
 
     if args.test_type == "compare":
-        compare_test_results()
+        compare_test_results(backend=args.backend, workers=args.workers)
+    elif args.test_type == "compare_vad":
+        compare_vad_results(backend=args.backend, workers=args.workers)
     else:
-        test_speech_recognition(args.test_type)
+        test_speech_recognition(
+            args.test_type, backend=args.backend, workers=args.workers, vad=args.vad
+        )
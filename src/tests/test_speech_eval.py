@@ -0,0 +1,109 @@
+# src/tests/test_speech_eval.py
+import os
+import sys
+import tempfile
+import unittest
+import pandas as pd
+import azure.cognitiveservices.speech as speechsdk
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from local_speech import LocalRecognitionResult, LocalCancellationDetails
+from speech_backend import LocalSpeechBackend
+from speech_eval import recognize_with_retry, run_parallel_recognition
+
+METADATA_FILE = os.path.join(
+    os.path.dirname(parent_dir), "test_data", "audio_metadata.csv"
+)
+
+
+class ScriptedBackend:
+    """Backend whose recognizers return a fixed sequence of results"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.requests = 0
+
+    def create_recognizer(self, audio_file=None, segment=None):
+        backend = self
+
+        class Recognizer:
+            def recognize_once(self):
+                backend.requests += 1
+                return backend.results.pop(0)
+
+        return Recognizer()
+
+
+def canceled(code):
+    details = LocalCancellationDetails("test")
+    details.code = code
+    return LocalRecognitionResult("", speechsdk.ResultReason.Canceled, details)
+
+
+class TestSpeechEval(unittest.TestCase):
+    def test_transient_failures_are_retried(self):
+        """Throttled requests are retried until recognition succeeds."""
+        backend = ScriptedBackend(
+            [
+                canceled(speechsdk.CancellationErrorCode.TooManyRequests),
+                canceled(speechsdk.CancellationErrorCode.ServiceTimeout),
+                LocalRecognitionResult(
+                    "halo", speechsdk.ResultReason.RecognizedSpeech
+                ),
+            ]
+        )
+
+        result, _, attempts = recognize_with_retry(backend, "a.wav", backoff=0)
+
+        self.assertEqual(result.text, "halo")
+        self.assertEqual(attempts, 3)
+
+    def test_permanent_failures_are_not_retried(self):
+        """Authentication errors return immediately instead of backing off."""
+        backend = ScriptedBackend(
+            [canceled(speechsdk.CancellationErrorCode.AuthenticationFailure)]
+        )
+
+        result, _, attempts = recognize_with_retry(backend, "a.wav", backoff=0)
+
+        self.assertEqual(result.reason, speechsdk.ResultReason.Canceled)
+        self.assertEqual(attempts, 1)
+
+    def test_parallel_run_streams_every_file(self):
+        """All files are recognized and written to the CSV; rows keep job order."""
+        backend = LocalSpeechBackend(
+            metadata_file=METADATA_FILE, recognition_latency=0.01
+        )
+        jobs = [
+            {"filepath": os.path.join("audio_samples", e["filename"]), **e}
+            for e in backend.entries[:12]
+        ]
+
+        def evaluate(job, result, processing_time):
+            return {"filename": job["filename"], "recognized_text": result.text}
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results_file = os.path.join(temp_dir, "results.csv")
+            rows = run_parallel_recognition(
+                backend,
+                jobs,
+                evaluate,
+                results_file,
+                fieldnames=["filename", "recognized_text", "attempts"],
+                max_workers=4,
+            )
+            streamed = pd.read_csv(results_file)
+
+        filenames = [j["filename"] for j in jobs]
+        self.assertEqual([r["filename"] for r in rows], filenames)
+        self.assertEqual(sorted(streamed["filename"]), sorted(filenames))
+        for row, job in zip(rows, jobs):
+            self.assertEqual(row["recognized_text"], job["expected_text"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,74 +1,33 @@
 # src/test_speech_recognition.py
 import os
+import sys
 import pandas as pd
 import azure.cognitiveservices.speech as speechsdk
-from dotenv import load_dotenv
 import time
 import json
 from datetime import datetime
 
-
-def setup_azure_speech():
-    """Set up the Azure Speech SDK with credentials from .env file."""
-    load_dotenv()
-    speech_key = os.getenv("AZURE_SPEECH_KEY")
-    speech_region = os.getenv("AZURE_SPEECH_REGION")
-
-    if not speech_key or not speech_region:
-        raise ValueError("Azure Speech credentials not found in .env file")
-
-    speech_config = speechsdk.SpeechConfig(
-        subscription=speech_key, region=speech_region
-    )
-    speech_config.speech_recognition_language = "id-ID"
-
-    return speech_config
-
-
-def calculate_word_error_rate(reference, hypothesis):
-    """Calculate Word Error Rate between reference and hypothesis."""
-    # Convert to lowercase and split into words
-    reference_words = reference.lower().split()
-    hypothesis_words = hypothesis.lower().split() if hypothesis else []
-
-    # Calculate Levenshtein distance
-    r_len = len(reference_words)
-    h_len = len(hypothesis_words)
-
-    # Initialize matrix with edit distances
-    d = [[0 for _ in range(h_len + 1)] for _ in range(r_len + 1)]
-
-    # Fill first row and column with edit distances
-    for i in range(r_len + 1):
-        d[i][0] = i
-    for j in range(h_len + 1):
-        d[0][j] = j
-
-    # Calculate minimum edit distance
-    for i in range(1, r_len + 1):
-        for j in range(1, h_len + 1):
-            if reference_words[i - 1] == hypothesis_words[j - 1]:
-                d[i][j] = d[i - 1][j - 1]
-            else:
-                d[i][j] = min(
-                    d[i - 1][j] + 1,  # deletion
-                    d[i][j - 1] + 1,  # insertion
-                    d[i - 1][j - 1] + 1,  # substitution
-                )
-
-    # Calculate WER
-    distance = d[r_len][h_len]
-    if r_len == 0:
-        return 0.0
-
-    return distance / r_len
-
-
-def test_audio_file(speech_config, filepath, expected_text):
-    """Test a single audio file with Azure Speech Recognition."""
-    audio_config = speechsdk.audio.AudioConfig(filename=filepath)
-    speech_recognizer = speechsdk.SpeechRecognizer(
-        speech_config=speech_config, audio_config=audio_config
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from speech_backend import create_speech_backend
+from audio_assets import get_audio_manager
+from vad import detect_speech
+from wer import corpus_word_error_rate, score_transcripts, word_error_rate
+
+
+def test_audio_file(speech_backend, filepath, expected_text, vad=False):
+    """Test a single audio file with the given speech backend."""
+    # Only decode when trimming; without VAD the file is streamed as-is
+    audio_seconds = segment = None
+    if vad:
+        asset = get_audio_manager().load(filepath)
+        audio_seconds = asset.duration
+        segment = detect_speech(asset.samples, asset.sample_rate)
+    speech_recognizer = speech_backend.create_recognizer(
+        audio_file=filepath, segment=segment
     )
 
     start_time = time.time()
@@ -80,7 +39,7 @@ def test_audio_file(speech_config, filepath, expected_text):
     # Determine recognition status
     if result.reason == speechsdk.ResultReason.RecognizedSpeech:
         recognized_text = result.text
-        wer = calculate_word_error_rate(expected_text, recognized_text)
+        wer = word_error_rate(expected_text, recognized_text)
         is_success = wer < 0.5  # Consider it success if WER less than 50%
     else:
         recognized_text = ""
@@ -94,15 +53,16 @@ def test_audio_file(speech_config, filepath, expected_text):
         "wer": wer,
         "is_success": is_success,
         "processing_time": processing_time,
+        "audio_seconds": audio_seconds,
+        "audio_seconds_sent": segment.duration if segment else audio_seconds,
         "status": str(result.reason),
     }
 
 
-def run_tests(metadata_file, audio_root_dir):
+def run_tests(metadata_file, audio_root_dir, backend="azure", vad=False):
     """Run tests on all audio files in the metadata."""
     try:
-        # Set up Azure Speech
-        speech_config = setup_azure_speech()
+        speech_backend = create_speech_backend(backend)
 
         # Read metadata
         df = pd.read_csv(metadata_file)
@@ -127,7 +87,9 @@ def run_tests(metadata_file, audio_root_dir):
 
             print(f"Testing {i+1}/{total_files}: {row['filename']}")
 
-            result = test_audio_file(speech_config, filepath, row["expected_text"])
+            result = test_audio_file(
+                speech_backend, filepath, row["expected_text"], vad=vad
+            )
 
             # Add metadata to result
             for col in df.columns:
@@ -137,10 +99,11 @@ def run_tests(metadata_file, audio_root_dir):
             results.append(result)
 
             # Sleep briefly to avoid rate limiting
-            time.sleep(0.5)
+            if backend == "azure":
+                time.sleep(0.5)
 
-        # Create results dataframe
-        results_df = pd.DataFrame(results)
+        # Create results dataframe with per-file error breakdown
+        results_df = score_transcripts(pd.DataFrame(results))
 
         # Save detailed results
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -156,6 +119,8 @@ def run_tests(metadata_file, audio_root_dir):
                 sum(results_df["is_success"]) / len(results) if results else 0
             ),
             "average_wer": results_df["wer"].mean(),
+            "corpus_wer": corpus_word_error_rate(results_df),
+            "average_cer": results_df["cer"].mean(),
             "average_processing_time": results_df["processing_time"].mean(),
             "category_results": {},
         }
@@ -171,6 +136,12 @@ def run_tests(metadata_file, audio_root_dir):
                     else 0
                 ),
                 "average_wer": category_df["wer"].mean(),
+                "average_processing_time": category_df["processing_time"].mean(),
+                "audio_seconds_saved": float(
+                    (
+                        category_df["audio_seconds"] - category_df["audio_seconds_sent"]
+                    ).sum()
+                ),
             }
 
         # Save summary
@@ -188,13 +159,16 @@ def run_tests(metadata_file, audio_root_dir):
         print(f"Successful Recognitions: {summary['successful_recognitions']}")
         print(f"Overall Success Rate: {summary['success_rate']:.2%}")
         print(f"Average Word Error Rate: {summary['average_wer']:.4f}")
+        print(f"Corpus Word Error Rate: {summary['corpus_wer']:.4f}")
         print(
             f"Average Processing Time: {summary['average_processing_time']:.4f} seconds"
         )
         print("\nCategory Results:")
         for category, results in summary["category_results"].items():
             print(
-                f"  {category}: {results['success_rate']:.2%} success rate, {results['average_wer']:.4f} WER"
+                f"  {category}: {results['success_rate']:.2%} success rate, "
+                f"{results['average_wer']:.4f} WER, "
+                f"{results['audio_seconds_saved']:.1f}s audio saved"
             )
         print("=" * 60)
         print(f"Detailed results saved to: {results_file}")
@@ -208,7 +182,23 @@ def run_tests(metadata_file, audio_root_dir):
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run speech recognition tests")
+    parser.add_argument(
+        "--backend",
+        choices=["azure", "local"],
+        default="azure",
+        help="Speech backend; 'local' replays the expected transcripts offline",
+    )
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Trim leading/trailing silence locally before recognition",
+    )
+    args = parser.parse_args()
+
     metadata_file = "test_data/audio_metadata.csv"
     audio_root_dir = "test_data/audio_samples"
 
-    run_tests(metadata_file, audio_root_dir)
+    run_tests(metadata_file, audio_root_dir, backend=args.backend, vad=args.vad)
@@ -0,0 +1,128 @@
+# src/tests/test_structured_logging.py
+import os
+import sys
+import json
+import logging
+import tempfile
+import threading
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from structured_logging import (
+    configure_logging,
+    get_request_id,
+    log_event,
+    parse_module_levels,
+    request_context,
+    shutdown_logging,
+)
+
+
+class TestStructuredLogging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp.name, "chatbot.jsonl")
+        self.logger = logging.getLogger("test_structured_logging.module")
+
+    def tearDown(self):
+        shutdown_logging()
+        self.logger.setLevel(logging.NOTSET)
+        logging.getLogger().setLevel(logging.WARNING)
+        self.tmp.cleanup()
+
+    def _records(self):
+        # Stopping the listener flushes everything still queued
+        shutdown_logging()
+        with open(self.log_file, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def _configure(self, **options):
+        configure_logging(
+            console=False,
+            json_file=self.log_file,
+            module_levels={"test_structured_logging": "DEBUG"},
+            **options,
+        )
+
+    def test_json_lines_with_fields_and_request_id(self):
+        self._configure()
+        with request_context("req-1"):
+            log_event(self.logger, logging.INFO, "Intent %s", "party", confidence=0.9)
+        self.logger.info("outside")
+
+        records = self._records()
+        self.assertEqual(records[0]["message"], "Intent party")
+        self.assertEqual(records[0]["confidence"], 0.9)
+        self.assertEqual(records[0]["request_id"], "req-1")
+        self.assertEqual(records[0]["logger"], "test_structured_logging.module")
+        self.assertNotIn("request_id", records[1])
+
+    def test_module_levels_gate_records(self):
+        configure_logging(
+            console=False,
+            json_file=self.log_file,
+            module_levels={"test_structured_logging": "WARNING"},
+        )
+        calls = []
+
+        class Expensive:
+            def __str__(self):
+                calls.append(1)
+                return "expensive"
+
+        log_event(self.logger, logging.DEBUG, "debug %s", Expensive())
+        self.logger.info("info %s", Expensive())
+        self.logger.warning("kept")
+        self.assertEqual([r["message"] for r in self._records()], ["kept"])
+        self.assertEqual(calls, [])
+
+    def test_sampling_keeps_one_in_n(self):
+        self._configure()
+        for i in range(25):
+            log_event(self.logger, logging.INFO, "partial %d", i, sample_every=10)
+        records = self._records()
+        self.assertEqual(
+            [r["message"] for r in records], ["partial 0", "partial 10", "partial 20"]
+        )
+        self.assertEqual(records[0]["sample_every"], 10)
+
+    def test_exceptions_are_serialized(self):
+        self._configure()
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            self.logger.exception("failed")
+        record = self._records()[0]
+        self.assertEqual(record["level"], "ERROR")
+        self.assertIn("ValueError: boom", record["exc"])
+
+    def test_request_ids_are_per_thread(self):
+        seen = {}
+
+        def worker(name):
+            with request_context() as request_id:
+                seen[name] = (request_id, get_request_id())
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({request_id for request_id, _ in seen.values()}), 3)
+        self.assertTrue(all(a == b for a, b in seen.values()))
+        self.assertIsNone(get_request_id())
+
+    def test_parse_module_levels(self):
+        self.assertEqual(
+            parse_module_levels("language_model=debug, chatbot_azure=INFO"),
+            {"language_model": "DEBUG", "chatbot_azure": "INFO"},
+        )
+        self.assertEqual(parse_module_levels(None), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
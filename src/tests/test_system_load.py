@@ -8,7 +8,6 @@ import queue
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import matplotlib.pyplot as plt
 import psutil
 import traceback
 
@@ -196,6 +195,8 @@ def test_system_load(model_path="./fine-tuned-model", duration=60, users=5):
         )
 
         # Create visualizations
+        import matplotlib.pyplot as plt
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         # CPU and Memory Usage over time
@@ -0,0 +1,105 @@
+# src/tests/test_tokenized_cache.py
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from transformers import BertTokenizerFast
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+sys.path.insert(0, os.path.join(os.path.dirname(parent_dir), "train"))
+
+import preprocess
+from preprocess import preprocess_dataset
+
+WORDS = "baju formal untuk interview pria wanita kulit cerah gelap pesta musim panas"
+
+
+def save_tiny_tokenizer(path):
+    vocab_file = os.path.join(path, "vocab.txt")
+    with open(vocab_file, "w") as f:
+        f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]))
+        f.write("\n" + "\n".join(WORDS.split()) + "\n")
+    tokenizer = BertTokenizerFast(vocab_file=vocab_file)
+    tokenizer.save_pretrained(path)
+    return tokenizer
+
+
+def write_csv(path, queries):
+    pd.DataFrame(
+        {
+            "query": queries,
+            "response": ["ok"] * len(queries),
+            "label": list(range(len(queries))),
+            "gender": ["pria"] * len(queries),
+            "skin_tone": ["light"] * len(queries),
+        }
+    ).to_csv(path, index=False)
+
+
+class TestTokenizedCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = self.tmp.name
+        self.tokenizer_path = os.path.join(root, "tokenizer")
+        os.makedirs(self.tokenizer_path)
+        save_tiny_tokenizer(self.tokenizer_path)
+        self.cache_dir = os.path.join(root, "cache")
+        self.data_files = {
+            "train": os.path.join(root, "train.csv"),
+            "test": os.path.join(root, "test.csv"),
+        }
+        write_csv(self.data_files["train"], ["baju pesta", "baju formal pria"])
+        write_csv(self.data_files["test"], ["musim panas"])
+
+    def preprocess(self, max_length=16):
+        return preprocess_dataset(
+            data_files=self.data_files,
+            tokenizer_name=self.tokenizer_path,
+            max_length=max_length,
+            cache_dir=self.cache_dir,
+            num_proc=1,
+        )
+
+    def test_second_call_loads_from_cache(self):
+        first = self.preprocess()
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+
+        with mock.patch.object(preprocess, "load_dataset") as load_dataset:
+            second = self.preprocess()
+        load_dataset.assert_not_called()
+
+        self.assertEqual(first["train"]["input_ids"], second["train"]["input_ids"])
+        self.assertEqual(
+            sorted(second["train"].column_names),
+            ["attention_mask", "input_ids", "label"],
+        )
+
+    def test_changed_inputs_get_a_new_entry(self):
+        self.preprocess()
+        write_csv(self.data_files["train"], ["baju pesta wanita"])
+        changed = self.preprocess()
+        self.assertEqual(len(changed["train"]), 1)
+
+        self.preprocess(max_length=32)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 3)
+
+    def test_cache_can_be_disabled(self):
+        datasets = preprocess_dataset(
+            data_files=self.data_files,
+            tokenizer_name=self.tokenizer_path,
+            max_length=16,
+            cache_dir=None,
+            num_proc=1,
+        )
+        self.assertEqual(len(datasets["train"]), 2)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+# src/tests/test_tracing.py
+import os
+import sys
+import json
+import tempfile
+import threading
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import tracing
+from response_generator import ResponseGenerator
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.exporter = tracing.InMemoryExporter()
+        tracing.enable(self.exporter)
+
+    def tearDown(self):
+        tracing.disable()
+
+    def test_nested_spans_form_one_trace(self):
+        with tracing.span("turn", turn_id=1):
+            with tracing.span("classify") as s:
+                s.set_attribute("intent", "party")
+            with tracing.span("respond"):
+                with tracing.span("json"):
+                    pass
+
+        self.assertEqual(len(self.exporter.traces), 1)
+        root = self.exporter.traces[0]
+        names = [(node.name, depth) for node, depth in root.walk()]
+        self.assertEqual(
+            names, [("turn", 0), ("classify", 1), ("respond", 1), ("json", 2)]
+        )
+        self.assertEqual(root.attributes, {"turn_id": 1})
+        self.assertEqual(root.children[0].attributes, {"intent": "party"})
+        self.assertGreaterEqual(root.duration, root.children[1].duration)
+
+    def test_disabled_spans_are_shared_noops(self):
+        tracing.disable()
+        first = tracing.span("a")
+        with first as s:
+            s.set_attribute("ignored", True)
+        self.assertIs(first, tracing.span("b"))
+        self.assertIsNone(tracing.current_span())
+        self.assertEqual(self.exporter.traces, [])
+
+    def test_exception_is_recorded_and_propagates(self):
+        with self.assertRaises(ValueError):
+            with tracing.span("failing"):
+                raise ValueError("boom")
+        self.assertEqual(self.exporter.traces[0].error, "ValueError: boom")
+        self.assertIsNone(tracing.current_span())
+
+    def test_threads_get_separate_traces(self):
+        def worker():
+            with tracing.span("worker"):
+                pass
+
+        with tracing.span("main"):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(
+            sorted(trace.name for trace in self.exporter.traces), ["main", "worker"]
+        )
+
+    def test_response_generator_stages(self):
+        ResponseGenerator().generate_response(
+            {"gender": "pria", "skin_tone": "light", "occasion": "formal"}
+        )
+        durations = tracing.stage_durations(self.exporter.traces[0])
+        for stage in [
+            "response.generate",
+            "response.recommendation_lookup",
+            "response.template",
+            "clothing.select",
+            "clothing.json_dumps",
+        ]:
+            self.assertIn(stage, durations)
+        self.assertIn("clothing.select", tracing.format_trace(self.exporter.traces[0]))
+
+    def test_json_lines_exporter(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "traces.jsonl")
+            tracing.enable(tracing.JSONLinesExporter(path))
+            for i in range(2):
+                with tracing.span("turn", turn_id=i):
+                    with tracing.span("stage"):
+                        pass
+            with open(path) as f:
+                traces = [json.loads(line) for line in f]
+        self.assertEqual([t["attributes"]["turn_id"] for t in traces], [0, 1])
+        self.assertEqual(traces[0]["children"][0]["name"], "stage")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+# src/tests/test_tts_cache.py
+import os
+import sys
+import time
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import audio_player
+from audio_player import AudioPlayer
+from local_speech import silent_wav
+from tts_cache import TTSCache
+
+VOICE = "id-ID-GadisNeural"
+
+
+class TestTTSCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, "tts_cache")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key_ignores_whitespace_but_not_voice(self):
+        """Reformatted SSML hits the same entry; another voice does not."""
+        ssml = "<speak> <voice>Halo</voice> </speak>"
+        reformatted = "<speak>\n    <voice>Halo</voice>\n</speak>"
+        self.assertEqual(
+            TTSCache.make_key(ssml, VOICE), TTSCache.make_key(reformatted, VOICE)
+        )
+        self.assertNotEqual(
+            TTSCache.make_key(ssml, VOICE), TTSCache.make_key(ssml, "id-ID-ArdiNeural")
+        )
+
+    def test_memory_hit_and_miss(self):
+        cache = TTSCache(self.cache_dir)
+        self.assertIsNone(cache.get("missing"))
+        cache.put("a", b"audio-a")
+        self.assertEqual(cache.get("a"), b"audio-a")
+        self.assertEqual(cache.stats["memory_hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+        self.assertAlmostEqual(cache.hit_rate(), 0.5)
+
+    def test_disk_tier_survives_restart(self):
+        """A new cache instance finds audio written by a previous one."""
+        TTSCache(self.cache_dir).put("welcome", b"welcome-audio")
+
+        cache = TTSCache(self.cache_dir)
+        self.assertTrue(cache.contains("welcome"))
+        self.assertEqual(cache.get("welcome"), b"welcome-audio")
+        self.assertEqual(cache.stats["disk_hits"], 1)
+        # Loaded into memory on first use
+        cache.get("welcome")
+        self.assertEqual(cache.stats["memory_hits"], 1)
+
+    def test_memory_eviction_is_lru(self):
+        cache = TTSCache(self.cache_dir, max_memory_bytes=20)
+        cache.put("a", b"x" * 8)
+        cache.put("b", b"x" * 8)
+        cache.get("a")  # a is now most recently used
+        cache.put("c", b"x" * 8)
+
+        self.assertLessEqual(cache.memory_bytes, 20)
+        self.assertIn("a", cache._memory)
+        self.assertNotIn("b", cache._memory)
+
+    def test_disk_eviction_respects_budget(self):
+        cache = TTSCache(self.cache_dir, max_disk_bytes=25)
+        for i, key in enumerate(["old", "mid", "new"]):
+            cache.put(key, b"x" * 10)
+            path = os.path.join(self.cache_dir, f"{key}.wav")
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+        cache.put("newest", b"x" * 10)
+
+        remaining = sorted(os.listdir(self.cache_dir))
+        total = sum(
+            os.path.getsize(os.path.join(self.cache_dir, name)) for name in remaining
+        )
+        self.assertLessEqual(total, 25)
+        self.assertNotIn("old.wav", remaining)
+        self.assertIn("newest.wav", remaining)
+
+
+class FakeWinsound:
+    SND_FILENAME = 0x20000
+    SND_ASYNC = 0x1
+
+    def __init__(self):
+        self.calls = []
+        self.file_existed = None
+
+    def PlaySound(self, sound, flags):
+        if sound is not None:
+            self.file_existed = os.path.exists(sound)
+        self.calls.append((sound, flags))
+
+
+class TestAudioPlayerStop(unittest.TestCase):
+    def setUp(self):
+        self.player = AudioPlayer()
+        self.player._backend = "winsound"
+        self.player._winsound = self.winsound = FakeWinsound()
+
+    def test_stop_interrupts_winsound_playback(self):
+        thread = threading.Thread(target=self.player.play, args=(silent_wav(10.0),))
+        start = time.perf_counter()
+        thread.start()
+        time.sleep(0.1)
+        self.player.stop()
+        thread.join(timeout=5)
+
+        self.assertLess(time.perf_counter() - start, 2)
+        path, flags = self.winsound.calls[0]
+        self.assertTrue(self.winsound.file_existed)
+        self.assertEqual(flags, FakeWinsound.SND_FILENAME | FakeWinsound.SND_ASYNC)
+        self.assertFalse(os.path.exists(path))
+
+    def test_stop_while_the_clip_is_set_up(self):
+        mkstemp = tempfile.mkstemp
+
+        def stop_then_mkstemp(*args, **kwargs):
+            self.player.stop()
+            return mkstemp(*args, **kwargs)
+
+        with mock.patch.object(audio_player.tempfile, "mkstemp", stop_then_mkstemp):
+            start = time.perf_counter()
+            self.player.play(silent_wav(10.0))
+
+        self.assertLess(time.perf_counter() - start, 2)
+        self.assertEqual([sound for sound, _ in self.winsound.calls if sound], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# src/tests/test_turn_timing.py
+import os
+import sys
+import csv
+import time
+import tempfile
+import unittest
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from turn_timing import TurnTimer, TURN_STAGES, save_turn_timings
+from chatbot_azure import AzureFashionChatbot
+from speech_backend import LocalSpeechBackend
+from tts_cache import TTSCache
+from test_local_speech_backend import METADATA_FILE, KeywordProcessor
+
+
+class TestTurnTiming(unittest.TestCase):
+    def test_stages_are_recorded_once(self):
+        """A stage keeps its first timestamp even if marked again."""
+        timer = TurnTimer(1)
+        timer.mark("listen_start")
+        first = timer.marks["listen_start"]
+        time.sleep(0.01)
+        timer.mark("listen_start")
+        self.assertEqual(timer.marks["listen_start"], first)
+
+    def test_derived_latencies(self):
+        """Response latency runs from final transcript to first audio."""
+        timer = TurnTimer(1)
+        for stage in TURN_STAGES:
+            timer.mark(stage)
+            time.sleep(0.005)
+
+        row = timer.to_dict()
+        self.assertGreater(row["response_latency"], 0)
+        self.assertGreaterEqual(row["turn_latency"], row["response_latency"])
+        offsets = [row[stage] for stage in TURN_STAGES]
+        self.assertEqual(offsets, sorted(offsets))
+
+    def test_missing_stages_are_none(self):
+        """Turns that never reached TTS report None instead of failing."""
+        timer = TurnTimer(2)
+        timer.mark("listen_start")
+        timer.mark("stt_final")
+        row = timer.to_dict()
+        self.assertIsNone(row["tts_done"])
+        self.assertIsNone(row["response_latency"])
+
+    def test_save_turn_timings(self):
+        """Timings are written as one CSV row per turn."""
+        timers = []
+        for turn_id in range(3):
+            timer = TurnTimer(turn_id)
+            timer.mark("listen_start")
+            timers.append(timer)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = save_turn_timings(timers, results_dir=tmp_dir)
+            with open(path, newline="") as f:
+                rows = list(csv.DictReader(f))
+
+        self.assertEqual(len(rows), 3)
+        self.assertIn("response_latency", rows[0])
+
+
+class TestBargeIn(unittest.TestCase):
+    def test_stop_cancels_a_queued_reply(self):
+        chatbot = AzureFashionChatbot(
+            continuous=True,
+            backend=LocalSpeechBackend(metadata_file=METADATA_FILE, utterances=[]),
+            nlp_processor=KeywordProcessor(),
+            tts_cache=TTSCache(cache_dir=None),
+        )
+        spoken = []
+
+        def speak_chunk(text, timer):
+            spoken.append(text)
+            time.sleep(0.2)
+            return True
+
+        chatbot._speak_chunk = speak_chunk
+        chatbot.text_to_speech("Balasan pertama.", wait=False)
+        second = chatbot.text_to_speech("Balasan kedua.", wait=False)
+        # Barge in while the second reply is still waiting for the executor
+        chatbot.stop_speaking()
+        second.result(timeout=5)
+
+        self.assertNotIn("Balasan kedua.", spoken)
+        self.assertEqual(chatbot._cancel_tokens, set())
+
+if __name__ == "__main__":
+    unittest.main()
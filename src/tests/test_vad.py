@@ -0,0 +1,65 @@
+# src/tests/test_vad.py
+import os
+import sys
+import unittest
+import numpy as np
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from vad import detect_speech, trim_silence
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * 220 * t)
+
+
+def noise(seconds, level=0.001, seed=0):
+    rng = np.random.default_rng(seed)
+    return level * rng.standard_normal(int(seconds * SAMPLE_RATE))
+
+
+class TestVoiceActivityDetection(unittest.TestCase):
+    def test_trims_leading_and_trailing_silence(self):
+        speech = tone(1.0) + noise(1.0, seed=1)
+        samples = np.concatenate([noise(1.0), speech, noise(1.5)])
+
+        segment = detect_speech(samples, SAMPLE_RATE, padding_seconds=0.2)
+
+        self.assertAlmostEqual(segment.start, 0.8, delta=0.03)
+        self.assertAlmostEqual(segment.end, 2.2, delta=0.03)
+        self.assertAlmostEqual(segment.seconds_saved, 2.1, delta=0.05)
+
+    def test_quiet_speech_is_still_detected(self):
+        """Detection is relative to the noise floor, not an absolute level."""
+        silence = noise(0.5, level=0.0001)
+        samples = np.concatenate([silence, tone(1.0, amplitude=0.01), silence])
+
+        trimmed, segment = trim_silence(samples, SAMPLE_RATE, padding_seconds=0.0)
+
+        self.assertAlmostEqual(segment.duration, 1.0, delta=0.05)
+        start = int(segment.start * SAMPLE_RATE)
+        end = int(segment.end * SAMPLE_RATE)
+        self.assertEqual(len(trimmed), end - start)
+
+    def test_clicks_are_not_speech(self):
+        samples = noise(2.0)
+        samples[8000:8100] = 0.5  # ~6 ms click
+
+        segment = detect_speech(samples, SAMPLE_RATE)
+
+        self.assertEqual(segment.seconds_saved, 0.0)
+
+    def test_silence_keeps_whole_file(self):
+        segment = detect_speech(np.zeros(SAMPLE_RATE), SAMPLE_RATE)
+
+        self.assertEqual((segment.start, segment.end), (0.0, 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+# src/tests/test_voice_pipeline_offline.py
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import traceback
+import pandas as pd
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+# Import required modules
+from chatbot_azure import AzureFashionChatbot
+from local_speech import METADATA_FILE, load_audio_transcripts
+from speech_backend import LocalSpeechBackend
+from tts_cache import TTSCache
+from turn_timing import TurnTimer
+from test_local_speech_backend import KeywordProcessor
+from test_local_speech_backend import METADATA_FILE as TEST_METADATA_FILE
+
+# Recognition fails for ~5% of utterances with the default error injection
+MIN_RECOGNITION_RATE = 0.8
+
+
+def build_session_script(entries, turns, rng, category=None):
+    """Random utterances from the test audio followed by 'keluar'"""
+    if category:
+        entries = [e for e in entries if e["category"] == category]
+    script = [rng.choice(entries) for _ in range(turns)]
+    script.append({"expected_text": "keluar", "duration_seconds": 0.5})
+    return script
+
+
+def run_session(session_id, script, processor, tts_cache, backend_options, seed):
+    """Run one scripted conversation through the full voice pipeline"""
+    backend = LocalSpeechBackend(utterances=script, seed=seed, **backend_options)
+    chatbot = AzureFashionChatbot(
+        continuous=True,
+        backend=backend,
+        nlp_processor=processor,
+        tts_cache=tts_cache,
+    )
+
+    rows = []
+    try:
+        # Every scripted utterance produces exactly one final result or failure
+        for turn_id in range(1, len(script) + 1):
+            timer = TurnTimer(turn_id)
+            chatbot._current_turn = timer
+            timer.mark("listen_start")
+
+            user_input = chatbot.speech_to_text_continuous(timeout=30)
+            timer.mark("stt_final")
+            response, is_error, _ = chatbot.process_input(user_input)
+            timer.mark("nlp_done")
+
+            if response == "KELUAR":
+                break
+
+            chatbot.text_to_speech(response, is_error, timer=timer)
+
+            row = timer.to_dict()
+            row["session_id"] = session_id
+            row["recognized"] = bool(user_input)
+            row["is_error"] = is_error
+            rows.append(row)
+    finally:
+        chatbot._current_turn = None
+        chatbot.stop_listening()
+
+    return rows
+
+
+def percentile(values, q):
+    values = [v for v in values if v is not None]
+    return float(pd.Series(values).quantile(q)) if values else None
+
+
+def run_voice_pipeline_offline(
+    sessions=10,
+    turns=5,
+    time_scale=0.0,
+    recognition_latency=0.2,
+    synthesis_latency=0.1,
+    recognition_error_rate=0.05,
+    synthesis_error_rate=0.02,
+    category=None,
+    seed=42,
+    model_path="./fine-tuned-model",
+    processor=None,
+    results_dir="test_results",
+    metadata_file=METADATA_FILE,
+):
+    """
+    Run many concurrent voice sessions against the local speech backend.
+
+    No network is used: recognition replays the audio_metadata.csv
+    transcripts and synthesis produces silent audio, both with the given
+    latency and error injection. NLP runs on the real model unless a
+    `processor` is passed in.
+    """
+    try:
+        os.makedirs(results_dir, exist_ok=True)
+
+        if processor is None:
+            from language_model import IndoBERTFashionProcessor
+
+            print(f"Loading model from {model_path}...")
+            processor = IndoBERTFashionProcessor(model_path=model_path)
+        # One memory-only cache shared by all sessions, like a shared server
+        tts_cache = TTSCache(cache_dir=None)
+
+        backend_options = {
+            "time_scale": time_scale,
+            "recognition_latency": recognition_latency,
+            "synthesis_latency": synthesis_latency,
+            "recognition_error_rate": recognition_error_rate,
+            "synthesis_error_rate": synthesis_error_rate,
+            "metadata_file": metadata_file,
+        }
+        entries = load_audio_transcripts(metadata_file)
+        rng = random.Random(seed)
+        scripts = [
+            build_session_script(entries, turns, rng, category)
+            for _ in range(sessions)
+        ]
+
+        print(f"Running {sessions} sessions x {turns} turns offline...")
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            futures = [
+                executor.submit(
+                    run_session,
+                    session_id,
+                    scripts[session_id],
+                    processor,
+                    tts_cache,
+                    backend_options,
+                    seed + session_id,
+                )
+                for session_id in range(sessions)
+            ]
+            rows = []
+            failed_sessions = 0
+            for future in futures:
+                try:
+                    rows.extend(future.result())
+                except Exception as e:
+                    failed_sessions += 1
+                    print(f"Session failed: {str(e)}")
+        wall_time = time.time() - start_time
+
+        results_df = pd.DataFrame(rows)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        results_file = os.path.join(
+            results_dir, f"voice_pipeline_offline_{timestamp}.csv"
+        )
+        results_df.to_csv(results_file, index=False)
+
+        response_latency = results_df.get("response_latency", pd.Series()).tolist()
+        turn_latency = results_df.get("turn_latency", pd.Series()).tolist()
+        summary = {
+            "timestamp": timestamp,
+            "sessions": sessions,
+            "turns_per_session": turns,
+            "failed_sessions": failed_sessions,
+            "completed_turns": len(results_df),
+            "wall_time": wall_time,
+            "turns_per_second": len(results_df) / wall_time if wall_time else 0,
+            "recognition_rate": (
+                float(results_df["recognized"].mean()) if len(results_df) else 0
+            ),
+            "response_latency_p50": percentile(response_latency, 0.5),
+            "response_latency_p95": percentile(response_latency, 0.95),
+            "turn_latency_p50": percentile(turn_latency, 0.5),
+            "turn_latency_p95": percentile(turn_latency, 0.95),
+            "tts_cache_hit_rate": tts_cache.hit_rate(),
+            "backend": backend_options,
+        }
+
+        summary_file = os.path.join(
+            results_dir, f"voice_pipeline_offline_summary_{timestamp}.json"
+        )
+        with open(summary_file, "w") as f:
+            json.dump(summary, f, indent=2)
+
+        print("\n" + "=" * 60)
+        print("Offline Voice Pipeline Summary:")
+        print("-" * 60)
+        print(f"Sessions: {sessions} ({failed_sessions} failed)")
+        print(f"Completed Turns: {summary['completed_turns']}")
+        print(f"Throughput: {summary['turns_per_second']:.2f} turns/second")
+        print(f"Recognition Rate: {summary['recognition_rate']:.2%}")
+        if summary["response_latency_p50"] is not None:
+            print(
+                f"Response Latency p50/p95: {summary['response_latency_p50']:.4f}"
+                f" / {summary['response_latency_p95']:.4f} seconds"
+            )
+        print(f"TTS Cache Hit Rate: {summary['tts_cache_hit_rate']:.2%}")
+        print("=" * 60)
+        print(f"Detailed results saved to: {results_file}")
+        print(f"Summary saved to: {summary_file}")
+
+        return summary, results_df
+
+    except Exception as e:
+        print(f"Error running offline voice pipeline test: {str(e)}")
+        traceback.print_exc()
+        raise
+
+
+def test_voice_pipeline_offline():
+    # The keyword processor keeps this test independent of a trained model
+    with tempfile.TemporaryDirectory() as results_dir:
+        summary, _ = run_voice_pipeline_offline(
+            sessions=4,
+            turns=5,
+            processor=KeywordProcessor(),
+            results_dir=results_dir,
+            metadata_file=TEST_METADATA_FILE,
+        )
+    assert summary["failed_sessions"] == 0, summary
+    # A failed recognition of the closing "keluar" adds one more turn
+    assert summary["completed_turns"] >= 4 * 5, summary
+    assert summary["recognition_rate"] >= MIN_RECOGNITION_RATE, summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the voice pipeline offline with the local speech backend"
+    )
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.0,
+        help="1.0 replays audio in real time, 0 as fast as possible",
+    )
+    parser.add_argument("--recognition-latency", type=float, default=0.2)
+    parser.add_argument("--synthesis-latency", type=float, default=0.1)
+    parser.add_argument("--recognition-error-rate", type=float, default=0.05)
+    parser.add_argument("--synthesis-error-rate", type=float, default=0.02)
+    parser.add_argument("--category", default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--model-path", default="./fine-tuned-model")
+    args = parser.parse_args()
+
+    run_voice_pipeline_offline(
+        sessions=args.sessions,
+        turns=args.turns,
+        time_scale=args.time_scale,
+        recognition_latency=args.recognition_latency,
+        synthesis_latency=args.synthesis_latency,
+        recognition_error_rate=args.recognition_error_rate,
+        synthesis_error_rate=args.synthesis_error_rate,
+        category=args.category,
+        seed=args.seed,
+        model_path=args.model_path,
+    )
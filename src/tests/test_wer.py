@@ -0,0 +1,85 @@
+# src/tests/test_wer.py
+import os
+import sys
+import random
+import unittest
+import pandas as pd
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from wer import (
+    align,
+    character_error_rate,
+    corpus_word_error_rate,
+    edit_distance,
+    score_transcripts,
+    word_error_rate,
+)
+
+
+def reference_edit_distance(reference, hypothesis):
+    """Plain dynamic programming, as the speech test scripts used to do it"""
+    d = [[0] * (len(hypothesis) + 1) for _ in range(len(reference) + 1)]
+    for i in range(len(reference) + 1):
+        d[i][0] = i
+    for j in range(len(hypothesis) + 1):
+        d[0][j] = j
+    for i in range(1, len(reference) + 1):
+        for j in range(1, len(hypothesis) + 1):
+            cost = 0 if reference[i - 1] == hypothesis[j - 1] else 1
+            d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+    return d[-1][-1]
+
+
+class TestWordErrorRate(unittest.TestCase):
+    def test_matches_plain_dynamic_programming(self):
+        """The vectorized distance agrees with the textbook DP on random input."""
+        rng = random.Random(0)
+        vocabulary = ["baju", "merah", "untuk", "pesta", "kemeja", "biru"]
+        for _ in range(100):
+            reference = [rng.choice(vocabulary) for _ in range(rng.randint(0, 60))]
+            hypothesis = [rng.choice(vocabulary) for _ in range(rng.randint(0, 60))]
+            self.assertEqual(
+                edit_distance(reference, hypothesis),
+                reference_edit_distance(reference, hypothesis),
+            )
+
+    def test_word_and_character_error_rate(self):
+        self.assertEqual(word_error_rate("Saya mau baju", "saya mau baju"), 0.0)
+        self.assertAlmostEqual(word_error_rate("saya mau baju", "saya baju"), 1 / 3)
+        self.assertEqual(word_error_rate("saya mau baju", ""), 1.0)
+        self.assertEqual(word_error_rate("", "apa saja"), 0.0)
+        self.assertAlmostEqual(character_error_rate("baju", "bajo"), 0.25)
+
+    def test_alignment_counts(self):
+        """Alignment separates substitutions, insertions and deletions."""
+        alignment = align("saya mau baju merah", "saya mau kemeja merah sekali")
+
+        self.assertEqual(alignment["hits"], 3)
+        self.assertEqual(alignment["substitutions"], 1)
+        self.assertEqual(alignment["insertions"], 1)
+        self.assertEqual(alignment["deletions"], 0)
+        self.assertIn(("S", "baju", "kemeja"), alignment["operations"])
+
+        self.assertEqual(align("saya mau baju", "baju")["deletions"], 2)
+
+    def test_score_results_dataframe(self):
+        results_df = pd.DataFrame(
+            {
+                "expected_text": ["saya mau baju", "celana hitam"],
+                "recognized_text": ["saya baju", None],
+            }
+        )
+
+        scored = score_transcripts(results_df)
+
+        self.assertEqual(list(scored["deletions"]), [1, 2])
+        self.assertEqual(list(scored["reference_words"]), [3, 2])
+        self.assertAlmostEqual(corpus_word_error_rate(scored), 3 / 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,20 @@
 # Save as src/tests/update_real_world_metadata.py
 import os
+import sys
 import pandas as pd
-import wave
+
+# Add the parent directory to the path so we can import from src
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from audio_assets import get_audio_manager
 
 
 def get_audio_duration(filepath):
     """Get the duration of an audio file in seconds."""
     try:
-        with wave.open(filepath, "rb") as wav_file:
-            frames = wav_file.getnframes()
-            rate = wav_file.getframerate()
-            duration = frames / float(rate)
-            return round(duration, 1)
+        return round(get_audio_manager().duration(filepath), 1)
     except Exception as e:
         print(f"Error getting duration for {filepath}: {str(e)}")
         return 0.0
@@ -0,0 +1,253 @@
+# src/tracing.py
+import json
+import time
+import functools
+import threading
+import contextvars
+
+# Tracing is off unless enable() is called; span() then returns a shared
+# no-op object so instrumented code pays one global lookup and a call.
+_enabled = False
+_exporters = []
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """One timed stage; spans opened inside it become its children"""
+
+    def __init__(self, name, attributes=None):
+        self.name = name
+        self.attributes = dict(attributes) if attributes else {}
+        self.parent = None
+        self.children = []
+        self.start = None
+        self.end = None
+        self.start_time_ns = None
+        self.error = None
+        self._token = None
+
+    @property
+    def duration(self):
+        if self.start is None or self.end is None:
+            return None
+        return self.end - self.start
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        if self.parent is not None:
+            self.parent.children.append(self)
+        self._token = _current_span.set(self)
+        self.start_time_ns = time.time_ns()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        if self.parent is None:
+            _export(self)
+        return False
+
+    def walk(self, depth=0):
+        """Yield (span, depth) for this span and all descendants, in start order"""
+        yield self, depth
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "start_time_ns": self.start_time_ns,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+    def __repr__(self):
+        duration = self.duration
+        timing = f"{duration * 1000:.3f} ms" if duration is not None else "open"
+        return f"Span({self.name!r}, {timing})"
+
+
+def span(name, **attributes):
+    """
+    Context manager timing one pipeline stage.
+
+    Usage:
+        with tracing.span("nlp.forward", batch_size=1) as s:
+            ...
+            s.set_attribute("intent", intent_name)
+    """
+    if not _enabled:
+        return _NOOP_SPAN
+    return Span(name, attributes)
+
+
+def traced(name=None):
+    """Decorator that wraps every call of a function in a span"""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_span():
+    return _current_span.get()
+
+
+def _export(root):
+    for exporter in _exporters:
+        try:
+            exporter(root)
+        except Exception as e:
+            print(f"Error exporting trace {root.name}: {str(e)}")
+
+
+def enable(*exporters):
+    """Turn tracing on; each exporter is called with every finished root span"""
+    global _enabled
+    _exporters[:] = exporters
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    _exporters.clear()
+
+
+def is_enabled():
+    return _enabled
+
+
+def format_trace(root):
+    """Indented tree of span durations, e.g. for printing after each turn"""
+    lines = []
+    for node, depth in root.walk():
+        duration = node.duration
+        timing = f"{duration * 1000:9.3f} ms" if duration is not None else "     open"
+        line = f"{timing}  {'  ' * depth}{node.name}"
+        if node.attributes:
+            line += "  " + " ".join(f"{k}={v}" for k, v in node.attributes.items())
+        if node.error:
+            line += f"  [error: {node.error}]"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def stage_durations(root):
+    """Total seconds per span name within one trace"""
+    totals = {}
+    for node, _ in root.walk():
+        if node.duration is not None:
+            totals[node.name] = totals.get(node.name, 0.0) + node.duration
+    return totals
+
+
+class ConsoleExporter:
+    def __call__(self, root):
+        print(format_trace(root))
+
+
+class InMemoryExporter:
+    """Keeps finished traces, for tests and benchmark scripts"""
+
+    def __init__(self):
+        self.traces = []
+        self._lock = threading.Lock()
+
+    def __call__(self, root):
+        with self._lock:
+            self.traces.append(root)
+
+    def clear(self):
+        with self._lock:
+            self.traces = []
+
+
+class JSONLinesExporter:
+    """Appends one JSON document per trace to a file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, root):
+        line = json.dumps(root.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class OpenTelemetryExporter:
+    """
+    Replays finished traces into OpenTelemetry with their original timestamps.
+
+    Requires the opentelemetry-api package; configure the SDK's tracer
+    provider and span processor (OTLP, Jaeger, console ...) as usual.
+    """
+
+    def __init__(self, tracer_name="fashion_chatbot"):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                "OpenTelemetry tracing requires the opentelemetry-api package "
+                "(pip install opentelemetry-api opentelemetry-sdk)"
+            )
+        self._trace = trace
+        self._tracer = trace.get_tracer(tracer_name)
+
+    def __call__(self, root):
+        self._replay(root, None)
+
+    def _replay(self, node, parent_context):
+        start_ns = node.start_time_ns
+        end_ns = start_ns + int((node.duration or 0.0) * 1e9)
+        otel_span = self._tracer.start_span(
+            node.name,
+            context=parent_context,
+            start_time=start_ns,
+            attributes={
+                key: value if isinstance(value, (bool, int, float, str)) else str(value)
+                for key, value in node.attributes.items()
+            },
+        )
+        if node.error:
+            otel_span.set_status(
+                self._trace.Status(self._trace.StatusCode.ERROR, node.error)
+            )
+        context = self._trace.set_span_in_context(otel_span)
+        for child in node.children:
+            self._replay(child, context)
+        otel_span.end(end_time=end_ns)
@@ -0,0 +1,149 @@
+# src/tts_cache.py
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = "tts_cache"
+
+logger = logging.getLogger(__name__)
+
+
+class TTSCache:
+    """
+    Cache of synthesized audio keyed by a hash of the voice and SSML.
+
+    Recently used clips are kept in memory (LRU, bounded by bytes) and every
+    clip is also written to `cache_dir` so it survives restarts. The disk
+    tier is bounded too; the least recently used files are deleted first.
+    """
+
+    def __init__(
+        self,
+        cache_dir=DEFAULT_CACHE_DIR,
+        max_memory_bytes=32 * 1024 * 1024,
+        max_disk_bytes=256 * 1024 * 1024,
+    ):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(ssml, voice):
+        """Stable key for one voice/SSML combination"""
+        normalized = " ".join(ssml.split())
+        return hashlib.sha256(f"{voice}\n{normalized}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def get(self, key):
+        """Return the cached audio bytes for a key, or None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._memory[key]
+
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    audio_data = f.read()
+                # Refresh the modification time so disk eviction is LRU
+                os.utime(path, None)
+            except OSError:
+                audio_data = None
+
+            if audio_data:
+                with self._lock:
+                    self.stats["disk_hits"] += 1
+                    self._store_in_memory(key, audio_data)
+                return audio_data
+
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def contains(self, key):
+        """Check for a key without loading it or touching the statistics"""
+        with self._lock:
+            if key in self._memory:
+                return True
+        return bool(self.cache_dir) and os.path.exists(self._path(key))
+
+    def put(self, key, audio_data):
+        """Store audio bytes in memory and on disk"""
+        if not audio_data:
+            return
+
+        with self._lock:
+            self.stats["stores"] += 1
+            self._store_in_memory(key, audio_data)
+
+        if self.cache_dir:
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(audio_data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.error("Error writing TTS cache file %s: %s", path, e)
+                return
+            self._evict_disk()
+
+    def _store_in_memory(self, key, audio_data):
+        # Caller must hold self._lock
+        if len(audio_data) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = audio_data
+        self._memory_bytes += len(audio_data)
+
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _evict_disk(self):
+        """Delete the least recently used files until the disk budget is met"""
+        files = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".wav"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    @property
+    def memory_bytes(self):
+        return self._memory_bytes
+
+    def hit_rate(self):
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        total = hits + self.stats["misses"]
+        return hits / total if total else 0.0
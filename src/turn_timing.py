@@ -0,0 +1,72 @@
+# src/turn_timing.py
+import os
+import csv
+import time
+import threading
+
+# Stages of one conversation turn, in pipeline order
+TURN_STAGES = [
+    "listen_start",
+    "speech_start",
+    "stt_final",
+    "nlp_done",
+    "tts_start",
+    "tts_first_audio",
+    "tts_done",
+]
+
+
+class TurnTimer:
+    """Records when each stage of a conversation turn happened"""
+
+    def __init__(self, turn_id):
+        self.turn_id = turn_id
+        self.start = time.perf_counter()
+        self.marks = {}
+        self.barge_in = False
+        self._lock = threading.Lock()
+
+    def mark(self, stage):
+        """Record the first time a stage is reached"""
+        with self._lock:
+            if stage not in self.marks:
+                self.marks[stage] = time.perf_counter()
+
+    def elapsed(self, from_stage, to_stage):
+        """Seconds between two recorded stages, or None if either is missing"""
+        if from_stage not in self.marks or to_stage not in self.marks:
+            return None
+        return self.marks[to_stage] - self.marks[from_stage]
+
+    def to_dict(self):
+        """Stage offsets from turn start plus the derived latencies, in seconds"""
+        row = {"turn_id": self.turn_id, "barge_in": self.barge_in}
+        for stage in TURN_STAGES:
+            offset = self.marks.get(stage)
+            row[stage] = round(offset - self.start, 4) if offset is not None else None
+
+        row["stt_latency"] = self.elapsed("speech_start", "stt_final")
+        row["nlp_latency"] = self.elapsed("stt_final", "nlp_done")
+        # What the user perceives: end of their speech to first audio of the reply
+        row["response_latency"] = self.elapsed("stt_final", "tts_first_audio")
+        row["tts_time_to_first_audio"] = self.elapsed("tts_start", "tts_first_audio")
+        row["turn_latency"] = self.elapsed("listen_start", "tts_done")
+        return row
+
+
+def save_turn_timings(timers, results_dir="test_results", filename=None):
+    """Write one CSV row per turn and return the file path"""
+    os.makedirs(results_dir, exist_ok=True)
+    if filename is None:
+        filename = f"turn_timings_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+    path = os.path.join(results_dir, filename)
+
+    rows = [timer.to_dict() for timer in timers]
+    if not rows:
+        return path
+
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
@@ -1,45 +1,49 @@
 # src/update_audio_metadata.py
 import os
-import csv
-import wave
-from pydub import AudioSegment
 import pandas as pd
+from audio_assets import get_audio_manager
 
 
 def get_audio_duration(filepath):
     """Get the duration of an audio file in seconds."""
     try:
-        with wave.open(filepath, "rb") as wav_file:
-            frames = wav_file.getnframes()
-            rate = wav_file.getframerate()
-            duration = frames / float(rate)
-            return round(duration, 1)
-    except:
-        try:
-            # Try with pydub if wave module fails
-            audio = AudioSegment.from_file(filepath)
-            duration = len(audio) / 1000.0
-            return round(duration, 1)
-        except Exception as e:
-            print(f"Error getting duration for {filepath}: {str(e)}")
-            return 0.0
-
-
-def update_metadata_durations(metadata_file, audio_root_dir):
-    """Update the duration_seconds column in the metadata CSV file."""
+        return round(get_audio_manager().duration(filepath), 1)
+    except Exception as e:
+        print(f"Error getting duration for {filepath}: {str(e)}")
+        return 0.0
+
+
+def update_metadata_durations(metadata_file, audio_root_dir, include_levels=False):
+    """
+    Update the duration_seconds column in the metadata CSV file.
+
+    With include_levels, rms_dbfs and snr_db columns are filled in as well.
+    """
     try:
         # Read existing metadata
         df = pd.read_csv(metadata_file)
+        manager = get_audio_manager()
 
         # Update durations
         for i, row in df.iterrows():
             filepath = os.path.join(audio_root_dir, row["filename"])
 
-            if os.path.exists(filepath):
-                duration = get_audio_duration(filepath)
-                df.at[i, "duration_seconds"] = duration
-            else:
+            if not os.path.exists(filepath):
                 print(f"Warning: File not found - {filepath}")
+                continue
+
+            try:
+                asset = manager.load(filepath)
+            except Exception as e:
+                print(f"Error decoding {filepath}: {str(e)}")
+                continue
+
+            df.at[i, "duration_seconds"] = round(asset.duration, 1)
+            if include_levels:
+                df.at[i, "rms_dbfs"] = round(asset.rms_dbfs(), 1)
+                df.at[i, "snr_db"] = round(asset.snr_db(), 1)
+
+        manager.save_index()
 
         # Save updated metadata
         df.to_csv(metadata_file, index=False)
@@ -50,7 +54,19 @@ def update_metadata_durations(metadata_file, audio_root_dir):
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Update audio metadata")
+    parser.add_argument(
+        "--levels",
+        action="store_true",
+        help="Also record RMS level (dBFS) and estimated SNR (dB) per file",
+    )
+    args = parser.parse_args()
+
     metadata_file = "test_data/audio_metadata.csv"
     audio_root_dir = "test_data/audio_samples"
 
-    update_metadata_durations(metadata_file, audio_root_dir)
+    update_metadata_durations(
+        metadata_file, audio_root_dir, include_levels=args.levels
+    )
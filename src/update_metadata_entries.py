@@ -1,17 +1,13 @@
 # src/update_metadata_entries.py
 import os
 import pandas as pd
-import wave
+from audio_assets import get_audio_manager
 
 
 def get_audio_duration(filepath):
     """Get the duration of an audio file in seconds."""
     try:
-        with wave.open(filepath, "rb") as wav_file:
-            frames = wav_file.getnframes()
-            rate = wav_file.getframerate()
-            duration = frames / float(rate)
-            return round(duration, 1)
+        return round(get_audio_manager().duration(filepath), 1)
     except Exception as e:
         print(f"Error getting duration for {filepath}: {str(e)}")
         return 0.0
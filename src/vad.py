@@ -0,0 +1,95 @@
+# src/vad.py
+import numpy as np
+
+FRAME_SECONDS = 0.02
+
+
+class SpeechSegment:
+    """Where speech starts and ends in an audio file, in seconds"""
+
+    def __init__(self, start, end, original_duration):
+        self.start = start
+        self.end = end
+        self.original_duration = original_duration
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+    @property
+    def seconds_saved(self):
+        return self.original_duration - self.duration
+
+    def __repr__(self):
+        return (
+            f"SpeechSegment(start={self.start:.2f}, end={self.end:.2f}, "
+            f"original_duration={self.original_duration:.2f})"
+        )
+
+
+def frame_levels_db(samples, sample_rate, frame_seconds=FRAME_SECONDS):
+    """Level of each frame in dBFS"""
+    samples = np.asarray(samples, dtype=np.float64)
+    frame_length = max(int(sample_rate * frame_seconds), 1)
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        return np.zeros(0)
+    frames = samples[: frame_count * frame_length].reshape(frame_count, -1)
+    return 10 * np.log10(np.square(frames).mean(axis=1) + 1e-12)
+
+
+def detect_speech(
+    samples,
+    sample_rate,
+    frame_seconds=FRAME_SECONDS,
+    margin_db=12.0,
+    min_level_db=-65.0,
+    min_speech_seconds=0.06,
+    padding_seconds=0.2,
+):
+    """
+    Energy-based voice activity detection.
+
+    Frames louder than the noise floor (10th percentile level) plus
+    `margin_db` count as speech; runs shorter than `min_speech_seconds` are
+    ignored as clicks. The segment from the first to the last speech frame is
+    widened by `padding_seconds` on both sides so word onsets are not clipped.
+    If no speech is found the whole file is kept.
+
+    Returns:
+        SpeechSegment
+    """
+    duration = len(samples) / float(sample_rate)
+    levels = frame_levels_db(samples, sample_rate, frame_seconds)
+    if len(levels) == 0:
+        return SpeechSegment(0.0, duration, duration)
+
+    threshold = max(np.percentile(levels, 10) + margin_db, min_level_db)
+    voiced = levels > threshold
+
+    # Keep only runs of voiced frames that are long enough to be speech
+    min_frames = max(int(round(min_speech_seconds / frame_seconds)), 1)
+    run_lengths = np.convolve(voiced, np.ones(min_frames, dtype=int), mode="valid")
+    run_starts = np.flatnonzero(run_lengths == min_frames)
+    if len(run_starts) == 0:
+        return SpeechSegment(0.0, duration, duration)
+
+    first_frame = run_starts[0]
+    last_frame = run_starts[-1] + min_frames
+    start = max(first_frame * frame_seconds - padding_seconds, 0.0)
+    end = min(last_frame * frame_seconds + padding_seconds, duration)
+    return SpeechSegment(start, end, duration)
+
+
+def trim_silence(samples, sample_rate, **options):
+    """Samples of the detected speech segment, plus the segment itself"""
+    segment = detect_speech(samples, sample_rate, **options)
+    start = int(segment.start * sample_rate)
+    end = int(segment.end * sample_rate)
+    return samples[start:end], segment
+
+
+def to_pcm16(samples):
+    """Float samples in [-1, 1] as little-endian 16-bit PCM bytes"""
+    clipped = np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0)
+    return (clipped * 32767).astype("<i2").tobytes()
@@ -0,0 +1,176 @@
+# src/wer.py
+import numpy as np
+
+try:
+    from rapidfuzz.distance import Levenshtein as _rapidfuzz_levenshtein
+except ImportError:
+    _rapidfuzz_levenshtein = None
+
+
+# Below this hypothesis length NumPy call overhead outweighs vectorization
+VECTORIZE_MIN_LENGTH = 20
+
+
+def _words(text):
+    return text.lower().split() if text else []
+
+
+def _characters(text):
+    return list(" ".join(_words(text)))
+
+
+def _encode(reference, hypothesis):
+    """Map tokens to integers so rows can be compared with NumPy"""
+    vocabulary = {}
+    ref = np.array([vocabulary.setdefault(t, len(vocabulary)) for t in reference])
+    hyp = np.array([vocabulary.setdefault(t, len(vocabulary)) for t in hypothesis])
+    return ref, hyp
+
+
+def _next_row(previous, ref_token, hyp, i):
+    """
+    One row of the Levenshtein matrix, computed without a Python loop over
+    the hypothesis. Deletions and substitutions only depend on the previous
+    row; insertions are a running minimum along the row:
+    row[j] = min over k <= j of (candidates[k] + j - k).
+    """
+    candidates = np.empty_like(previous)
+    candidates[0] = i
+    deletion = previous[1:] + 1
+    substitution = previous[:-1] + (hyp != ref_token)
+    np.minimum(deletion, substitution, out=candidates[1:])
+    offsets = np.arange(len(previous))
+    return offsets + np.minimum.accumulate(candidates - offsets)
+
+
+def _python_distance(reference, hypothesis):
+    """Two-row dynamic programming; fastest for sentence-length input"""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_token in enumerate(reference, start=1):
+        current = [i]
+        for j, hyp_token in enumerate(hypothesis, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,  # deletion
+                    current[j - 1] + 1,  # insertion
+                    previous[j - 1] + (ref_token != hyp_token),  # substitution
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def edit_distance(reference, hypothesis):
+    """Minimum substitutions + insertions + deletions between two token lists"""
+    if _rapidfuzz_levenshtein is not None:
+        return _rapidfuzz_levenshtein.distance(reference, hypothesis)
+    if not reference or not hypothesis:
+        return max(len(reference), len(hypothesis))
+    if len(hypothesis) < VECTORIZE_MIN_LENGTH:
+        return _python_distance(reference, hypothesis)
+
+    ref, hyp = _encode(reference, hypothesis)
+    row = np.arange(len(hyp) + 1)
+    for i, ref_token in enumerate(ref, start=1):
+        row = _next_row(row, ref_token, hyp, i)
+    return int(row[-1])
+
+
+def word_error_rate(reference, hypothesis):
+    """Calculate Word Error Rate between reference and hypothesis."""
+    reference_words = _words(reference)
+    if not reference_words:
+        return 0.0
+    return edit_distance(reference_words, _words(hypothesis)) / len(reference_words)
+
+
+def character_error_rate(reference, hypothesis):
+    """Character Error Rate over the lowercased, whitespace-normalized text"""
+    reference_chars = _characters(reference)
+    if not reference_chars:
+        return 0.0
+    return edit_distance(reference_chars, _characters(hypothesis)) / len(
+        reference_chars
+    )
+
+
+def align(reference, hypothesis):
+    """
+    Word alignment between reference and hypothesis.
+
+    Returns:
+        dict: Counts of hits, substitutions, insertions and deletions, plus
+              "operations", a list of (op, reference_word, hypothesis_word)
+              tuples where op is "=", "S", "I" or "D"
+    """
+    reference_words = _words(reference)
+    hypothesis_words = _words(hypothesis)
+    ref, hyp = _encode(reference_words, hypothesis_words)
+
+    d = np.empty((len(ref) + 1, len(hyp) + 1), dtype=np.int64)
+    d[0] = np.arange(len(hyp) + 1)
+    for i, ref_token in enumerate(ref, start=1):
+        d[i] = _next_row(d[i - 1], ref_token, hyp, i)
+
+    operations = []
+    i, j = len(ref), len(hyp)
+    while i > 0 or j > 0:
+        diagonal = d[i - 1, j - 1] if i > 0 and j > 0 else None
+        if diagonal is not None and ref[i - 1] == hyp[j - 1] and d[i, j] == diagonal:
+            operations.append(("=", reference_words[i - 1], hypothesis_words[j - 1]))
+            i, j = i - 1, j - 1
+        elif diagonal is not None and d[i, j] == diagonal + 1:
+            operations.append(("S", reference_words[i - 1], hypothesis_words[j - 1]))
+            i, j = i - 1, j - 1
+        elif i > 0 and d[i, j] == d[i - 1, j] + 1:
+            operations.append(("D", reference_words[i - 1], None))
+            i -= 1
+        else:
+            operations.append(("I", None, hypothesis_words[j - 1]))
+            j -= 1
+    operations.reverse()
+
+    counts = {op: sum(1 for o in operations if o[0] == op) for op in "=SID"}
+    return {
+        "hits": counts["="],
+        "substitutions": counts["S"],
+        "insertions": counts["I"],
+        "deletions": counts["D"],
+        "operations": operations,
+    }
+
+
+def score_transcripts(
+    results_df, reference_col="expected_text", hypothesis_col="recognized_text"
+):
+    """
+    Add error analysis columns to a results DataFrame.
+
+    Adds cer, substitutions, insertions, deletions and reference_words; the
+    existing wer column is left alone.
+    """
+    rows = []
+    for reference, hypothesis in zip(
+        results_df[reference_col].fillna(""), results_df[hypothesis_col].fillna("")
+    ):
+        alignment = align(reference, hypothesis)
+        rows.append(
+            {
+                "cer": character_error_rate(reference, hypothesis),
+                "substitutions": alignment["substitutions"],
+                "insertions": alignment["insertions"],
+                "deletions": alignment["deletions"],
+                "reference_words": len(_words(reference)),
+            }
+        )
+    if not rows:
+        return results_df
+    columns = {column: [row[column] for row in rows] for column in rows[0]}
+    return results_df.assign(**columns)
+
+
+def corpus_word_error_rate(results_df):
+    """Total word errors over total reference words for a scored DataFrame"""
+    errors = results_df[["substitutions", "insertions", "deletions"]].to_numpy().sum()
+    words = results_df["reference_words"].sum()
+    return float(errors / words) if words else 0.0
@@ -0,0 +1,177 @@
+# train/benchmark_padding.py
+import os
+import json
+import time
+import argparse
+from datetime import datetime
+
+import torch
+from torch.utils.data import DataLoader, RandomSampler
+from transformers import (
+    AutoModelForSequenceClassification,
+    AutoTokenizer,
+    default_data_collator,
+)
+from transformers.trainer_pt_utils import LengthGroupedSampler
+
+from preprocess import dynamic_padding_collator, preprocess_dataset
+
+RESULTS_DIR = "test_results"
+
+
+def run_epoch(
+    model,
+    dataset,
+    collator,
+    batch_size=8,
+    group_by_length=False,
+    learning_rate=1e-5,
+    seed=42,
+    max_steps=None,
+):
+    """
+    One training epoch over `dataset`, the way Trainer batches it: a random
+    sampler, or LengthGroupedSampler when group_by_length is set.
+
+    Returns:
+        dict: seconds, steps, examples, real (non-pad) and padded token
+              counts, and tokens per second of both
+    """
+    generator = torch.Generator().manual_seed(seed)
+    if group_by_length:
+        lengths = [len(ids) for ids in dataset["input_ids"]]
+        sampler = LengthGroupedSampler(batch_size, lengths=lengths, generator=generator)
+    else:
+        sampler = RandomSampler(dataset, generator=generator)
+    loader = DataLoader(
+        dataset, batch_size=batch_size, sampler=sampler, collate_fn=collator
+    )
+    optimizer = torch.optim.AdamW(model.parameters(), lr=learning_rate)
+
+    model.train()
+    steps = examples = real_tokens = padded_tokens = 0
+    start = time.perf_counter()
+    for batch in loader:
+        loss = model(**batch).loss
+        loss.backward()
+        optimizer.step()
+        optimizer.zero_grad()
+
+        steps += 1
+        examples += len(batch["input_ids"])
+        real_tokens += int(batch["attention_mask"].sum())
+        padded_tokens += batch["input_ids"].numel()
+        if max_steps and steps >= max_steps:
+            break
+    seconds = time.perf_counter() - start
+
+    return {
+        "seconds": seconds,
+        "steps": steps,
+        "examples": examples,
+        "real_tokens": real_tokens,
+        "padded_tokens": padded_tokens,
+        "padding_fraction": 1 - real_tokens / padded_tokens,
+        "tokens_per_second": real_tokens / seconds,
+        "padded_tokens_per_second": padded_tokens / seconds,
+    }
+
+
+def benchmark_padding(
+    model_path="indobert-base-p2",
+    batch_size=8,
+    max_length=128,
+    max_steps=None,
+    num_labels=20,
+):
+    """
+    The same epoch three ways, each from the same initial weights:
+    padded to max_length (the old preprocessing), dynamically padded in
+    random order, and dynamically padded with length-grouped batches.
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    data_files = {"train": "train/train_dataset.csv", "test": "train/test_dataset.csv"}
+    fixed = preprocess_dataset(
+        data_files, model_path, max_length, padding="max_length"
+    )["train"]
+    dynamic = preprocess_dataset(data_files, model_path, max_length)["train"]
+    dynamic_collator = dynamic_padding_collator(tokenizer)
+
+    runs = {
+        "fixed_max_length": (fixed, default_data_collator, False),
+        "dynamic": (dynamic, dynamic_collator, False),
+        "dynamic_grouped": (dynamic, dynamic_collator, True),
+    }
+    results = {}
+    for name, (dataset, collator, group_by_length) in runs.items():
+        torch.manual_seed(0)
+        model = AutoModelForSequenceClassification.from_pretrained(
+            model_path, num_labels=num_labels, ignore_mismatched_sizes=True
+        )
+        print(f"Running {name}...")
+        results[name] = run_epoch(
+            model,
+            dataset,
+            collator,
+            batch_size=batch_size,
+            group_by_length=group_by_length,
+            max_steps=max_steps,
+        )
+        print(
+            f"  {results[name]['seconds']:.1f} s, "
+            f"{results[name]['tokens_per_second']:.0f} tokens/s, "
+            f"{results[name]['padding_fraction']:.1%} padding"
+        )
+
+    baseline = results["fixed_max_length"]
+    for result in results.values():
+        result["speedup"] = baseline["seconds"] / result["seconds"]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Training epoch time with fixed vs dynamic padding"
+    )
+    parser.add_argument("--model-path", default="indobert-base-p2")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--max-length", type=int, default=128)
+    parser.add_argument(
+        "--max-steps", type=int, default=None, help="Stop each run early"
+    )
+    parser.add_argument("--results-dir", default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    print(f"Device: cpu, threads: {torch.get_num_threads()}")
+    results = benchmark_padding(
+        args.model_path, args.batch_size, args.max_length, args.max_steps
+    )
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(args.results_dir, f"padding_benchmark_{timestamp}.json")
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "model_path": args.model_path,
+                "batch_size": args.batch_size,
+                "max_length": args.max_length,
+                "threads": torch.get_num_threads(),
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+    print(f"\n{'run':<18} {'seconds':>9} {'tokens/s':>9} {'padding':>8} {'speedup':>8}")
+    for name, result in results.items():
+        print(
+            f"{name:<18} {result['seconds']:>9.1f} "
+            f"{result['tokens_per_second']:>9.0f} "
+            f"{result['padding_fraction']:>8.1%} {result['speedup']:>7.2f}x"
+        )
+    print(f"\nResults saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
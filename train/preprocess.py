@@ -1,44 +1,232 @@
 # train/preprocess.py
-from datasets import load_dataset
-from transformers import AutoTokenizer
+import os
+import sys
+import json
+import shutil
+import hashlib
+import inspect
+import torch
+from datasets import DatasetDict, load_dataset
+from transformers import AutoTokenizer, DataCollatorWithPadding, TrainingArguments
 
+# Add src to the path so we can import the joint model's label definitions
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(current_dir), "src"))
 
-def preprocess_dataset():
-    # Load your dataset
-    dataset = load_dataset(
-        "csv",
-        data_files={
-            "train": "train/train_dataset.csv",
-            "test": "train/test_dataset.csv",
+# Tokenized datasets are saved here, one directory per cache key
+CACHE_DIR = os.environ.get("TOKENIZED_CACHE_DIR", "data/cache/tokenized")
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _tokenizer_fingerprint(tokenizer):
+    """Identifies the vocabulary and settings, not just the tokenizer's name"""
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        content = backend.to_str()
+    else:
+        content = json.dumps(tokenizer.get_vocab(), sort_keys=True)
+    return hashlib.sha256(
+        f"{type(tokenizer).__name__}\n{content}".encode("utf-8")
+    ).hexdigest()
+
+
+def cache_key(data_files, tokenizer, max_length, **extra):
+    """Hash of the CSV contents, the tokenizer, max_length and anything else"""
+    description = {
+        "files": {
+            split: _file_hash(path) for split, path in sorted(data_files.items())
         },
+        "tokenizer": _tokenizer_fingerprint(tokenizer),
+        "max_length": max_length,
+        **extra,
+    }
+    encoded = json.dumps(description, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def cached_tokenize(key, build, cache_dir=CACHE_DIR):
+    """
+    Load the DatasetDict saved under `key`, or build() and save it.
+
+    The dataset is written to a temporary directory and renamed, so an
+    interrupted run never leaves a half-written cache entry behind.
+    """
+    if not cache_dir:
+        return build()
+    path = os.path.join(cache_dir, key)
+    if os.path.isdir(path):
+        print(f"Loading tokenized dataset from cache: {path}")
+        return DatasetDict.load_from_disk(path)
+
+    datasets = build()
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    datasets.save_to_disk(tmp_path)
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        # Another run saved the same key first
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    print(f"Tokenized dataset cached at: {path}")
+    return datasets
+
+
+def _default_num_proc():
+    return min(4, os.cpu_count() or 1)
+
+
+def dynamic_padding_collator(tokenizer):
+    """
+    Pads each batch to its longest query instead of max_length. On GPU the
+    length is rounded up to a multiple of 8 for fp16 tensor cores.
+    """
+    return DataCollatorWithPadding(
+        tokenizer, pad_to_multiple_of=8 if torch.cuda.is_available() else None
     )
 
+
+def length_grouping_args():
+    """
+    TrainingArguments keywords for length-grouped batches: queries of similar
+    length share a batch, so dynamic padding adds few pad tokens. transformers
+    5 renamed group_by_length to train_sampling_strategy.
+    """
+    fields = getattr(TrainingArguments, "__dataclass_fields__", {})
+    if "train_sampling_strategy" in fields:
+        return {"train_sampling_strategy": "group_by_length"}
+    return {"group_by_length": True}
+
+
+def preprocess_dataset(
+    data_files=None,
+    tokenizer_name="indobert-base-p2",
+    max_length=128,
+    cache_dir=CACHE_DIR,
+    num_proc=None,
+    padding=False,
+):
+    """
+    Tokenized train/test datasets, from the cache when the CSVs, tokenizer
+    and max_length are unchanged. On a miss, tokenization runs in `num_proc`
+    processes.
+
+    Queries are left unpadded (padding=False) for dynamic_padding_collator;
+    pass padding="max_length" for fixed-length rows.
+    """
+    data_files = data_files or {
+        "train": "train/train_dataset.csv",
+        "test": "train/test_dataset.csv",
+    }
+
     # Initialize tokenizer
-    tokenizer = AutoTokenizer.from_pretrained("indobert-base-p2")
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+
+    def build():
+        # Load your dataset
+        dataset = load_dataset("csv", data_files=data_files)
 
-    # Preprocess function
-    def preprocess_function(examples):
-        return tokenizer(
-            examples["query"], truncation=True, padding="max_length", max_length=128
+        # Preprocess function
+        def preprocess_function(examples):
+            return tokenizer(
+                examples["query"],
+                truncation=True,
+                padding=padding,
+                max_length=max_length,
+            )
+
+        # Apply preprocessing
+        tokenized_datasets = dataset.map(
+            preprocess_function,
+            batched=True,
+            num_proc=num_proc or _default_num_proc(),
+            remove_columns=["query", "response"],  # Remove only query and response
         )
 
-    # Apply preprocessing
-    tokenized_datasets = dataset.map(
-        preprocess_function,
-        batched=True,
-        remove_columns=["query", "response"],  # Remove only query and response columns
-    )
+        # Make sure all features have the same length
+        return tokenized_datasets.remove_columns(
+            [
+                col
+                for col in tokenized_datasets["train"].column_names
+                if col not in ["input_ids", "attention_mask", "label"]
+            ]
+        )
 
-    # Make sure all features have the same length
-    tokenized_datasets = tokenized_datasets.remove_columns(
-        [
-            col
-            for col in tokenized_datasets["train"].column_names
-            if col not in ["input_ids", "attention_mask", "label"]
-        ]
-    )
+    key = cache_key(data_files, tokenizer, max_length, kind="intent", padding=padding)
+    return cached_tokenize(key, build, cache_dir)
 
-    return tokenized_datasets
+
+def preprocess_joint_dataset(
+    data_file="data/processed/combined_enhanced_dataset.csv",
+    test_size=0.2,
+    seed=42,
+    tokenizer_name="indobert-base-p2",
+    max_length=128,
+    cache_dir=CACHE_DIR,
+    num_proc=None,
+    padding=False,
+):
+    """
+    Tokenized train/test split with the intent label plus one label column per
+    joint model head (gender_labels, skin_tone_labels, ...). Unpadded by
+    default, like preprocess_dataset.
+    """
+    from joint_model import slot_targets
+
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+
+    def build():
+        dataset = load_dataset("csv", data_files=data_file)["train"]
+        dataset = dataset.train_test_split(test_size=test_size, seed=seed)
+
+        def preprocess_function(examples):
+            encoded = tokenizer(
+                examples["query"],
+                truncation=True,
+                padding=padding,
+                max_length=max_length,
+            )
+            targets = [
+                slot_targets(label, gender, skin_tone, query)
+                for label, gender, skin_tone, query in zip(
+                    examples["label"],
+                    examples["gender"],
+                    examples["skin_tone"],
+                    examples["query"],
+                )
+            ]
+            for column in targets[0]:
+                encoded[column] = [row[column] for row in targets]
+            return encoded
+
+        return dataset.map(
+            preprocess_function,
+            batched=True,
+            num_proc=num_proc or _default_num_proc(),
+            remove_columns=["query", "response", "gender", "skin_tone"],
+        )
+
+    # The slot targets are derived in code, so a change to it is a new key
+    targets_source = hashlib.sha256(
+        inspect.getsource(slot_targets).encode("utf-8")
+    ).hexdigest()
+    key = cache_key(
+        {"data": data_file},
+        tokenizer,
+        max_length,
+        kind="joint",
+        padding=padding,
+        test_size=test_size,
+        seed=seed,
+        targets=targets_source,
+    )
+    return cached_tokenize(key, build, cache_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+# train/train_joint_model.py
+import torch
+from transformers import AutoTokenizer, Trainer, TrainingArguments
+from preprocess import (
+    dynamic_padding_collator,
+    length_grouping_args,
+    preprocess_joint_dataset,
+)
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
+from joint_model import INTENT_LABELS, SLOT_LABELS, JointIntentSlotModel
+import logging
+import os
+
+# Order of the logits in the model output (and so in pred.predictions)
+HEADS = ["intent"] + list(SLOT_LABELS)
+LABEL_NAMES = ["labels"] + [f"{head}_labels" for head in SLOT_LABELS]
+
+
+def setup_logging():
+    os.makedirs("./results_joint", exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler("./results_joint/trainer_log.txt"),
+            logging.StreamHandler(),
+        ],
+    )
+    return logging.getLogger(__name__)
+
+
+def compute_metrics(pred):
+    """Accuracy of every head, plus weighted F1 of the intent head"""
+    metrics = {}
+    for head, logits, labels in zip(HEADS, pred.predictions, pred.label_ids):
+        preds = logits.argmax(-1)
+        metrics[f"{head}_accuracy"] = accuracy_score(labels, preds)
+        if head == "intent":
+            precision, recall, f1, _ = precision_recall_fscore_support(
+                labels, preds, average="weighted", zero_division=0
+            )
+            metrics.update({"f1": f1, "precision": precision, "recall": recall})
+    metrics["accuracy"] = metrics["intent_accuracy"]
+    metrics["slot_accuracy"] = sum(
+        metrics[f"{head}_accuracy"] for head in SLOT_LABELS
+    ) / len(SLOT_LABELS)
+    return metrics
+
+
+def train_joint_model(
+    base_model="indobert-base-p2", output_dir="./fine-tuned-joint-model"
+):
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    print(f"Using device: {device}")
+
+    logger = setup_logging()
+    logger.info("Starting joint intent + slot training...")
+
+    tokenized_datasets = preprocess_joint_dataset()
+    tokenizer = AutoTokenizer.from_pretrained(base_model)
+
+    # One encoder, an intent head and one head per parameter
+    model = JointIntentSlotModel.from_encoder(
+        base_model, num_intents=len(INTENT_LABELS)
+    )
+    model.to(device)
+
+    training_args = TrainingArguments(
+        output_dir="./results_joint",
+        eval_strategy="steps",
+        eval_steps=20,
+        learning_rate=2e-5,
+        per_device_train_batch_size=8,
+        per_device_eval_batch_size=8,
+        num_train_epochs=10,
+        weight_decay=0.01,
+        load_best_model_at_end=True,
+        metric_for_best_model="accuracy",
+        greater_is_better=True,
+        save_total_limit=2,
+        logging_steps=10,
+        warmup_steps=100,
+        fp16=torch.cuda.is_available(),
+        gradient_accumulation_steps=4,
+        max_grad_norm=1.0,
+        label_names=LABEL_NAMES,
+        **length_grouping_args(),
+    )
+
+    trainer = Trainer(
+        model=model,
+        args=training_args,
+        train_dataset=tokenized_datasets["train"],
+        eval_dataset=tokenized_datasets["test"],
+        data_collator=dynamic_padding_collator(tokenizer),
+        compute_metrics=compute_metrics,
+    )
+
+    print("Starting training...")
+    trainer.train()
+
+    print("\nEvaluating model...")
+    eval_results = trainer.evaluate()
+    print(f"\nEvaluation Results: {eval_results}")
+
+    print("\nSaving model...")
+    model.save_pretrained(output_dir)
+    tokenizer.save_pretrained(output_dir)
+    print(f"Joint model and tokenizer saved to {output_dir}")
+
+    logger.info(f"Training complete. Evaluation results: {eval_results}")
+
+
+if __name__ == "__main__":
+    train_joint_model()
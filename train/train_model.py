@@ -6,7 +6,11 @@ from transformers import (
     Trainer,
     TrainingArguments,
 )
-from preprocess import preprocess_dataset
+from preprocess import (
+    dynamic_padding_collator,
+    length_grouping_args,
+    preprocess_dataset,
+)
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 import numpy as np
 import logging
@@ -46,6 +50,7 @@ def train_model():
 
     # Load preprocessed dataset
     tokenized_datasets = preprocess_dataset()
+    tokenizer = AutoTokenizer.from_pretrained("indobert-base-p2")
 
     # Load model with the correct number of labels
     model = AutoModelForSequenceClassification.from_pretrained(
@@ -78,6 +83,8 @@ def train_model():
         # Added for better GPU utilization
         max_grad_norm=1.0,
         gradient_checkpointing=True,  # Trade computation for memory
+        # Batch queries of similar length; the collator pads to the longest
+        **length_grouping_args(),
     )
 
     # Initialize Trainer
@@ -86,6 +93,7 @@ def train_model():
         args=training_args,
         train_dataset=tokenized_datasets["train"],
         eval_dataset=tokenized_datasets["test"],
+        data_collator=dynamic_padding_collator(tokenizer),
         compute_metrics=compute_metrics,
     )
 
@@ -101,7 +109,6 @@ def train_model():
     # Save the model and tokenizer
     print("\nSaving model...")
     model.save_pretrained("./fine-tuned-model")
-    tokenizer = AutoTokenizer.from_pretrained("indobert-base-p2")
     tokenizer.save_pretrained("./fine-tuned-model")
     print("Model and tokenizer saved successfully!")
 
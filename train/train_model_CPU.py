@@ -7,7 +7,11 @@ from transformers import (
     Trainer,
     TrainingArguments,
 )
-from preprocess import preprocess_dataset
+from preprocess import (
+    dynamic_padding_collator,
+    length_grouping_args,
+    preprocess_dataset,
+)
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 import numpy as np
 from torch.nn import CrossEntropyLoss
@@ -47,6 +51,7 @@ class CustomTrainer(Trainer):
 
 def train_model():
     tokenized_datasets = preprocess_dataset()
+    tokenizer = AutoTokenizer.from_pretrained("indobert-base-p2")
     train_df = pd.read_csv("train/train_dataset.csv")
     class_weights = torch.ones(20)
 
@@ -79,6 +84,7 @@ def train_model():
         logging_steps=10,
         warmup_steps=100,
         fp16=True,
+        **length_grouping_args(),
     )
 
     trainer = CustomTrainer(
@@ -86,6 +92,7 @@ def train_model():
         args=training_args,
         train_dataset=tokenized_datasets["train"],
         eval_dataset=tokenized_datasets["test"],
+        data_collator=dynamic_padding_collator(tokenizer),
         compute_metrics=compute_metrics,
         class_weights=class_weights,
     )
@@ -99,7 +106,6 @@ def train_model():
 
     print("\nSaving model...")
     model.save_pretrained("./fine-tuned-model")
-    tokenizer = AutoTokenizer.from_pretrained("indobert-base-p2")
     tokenizer.save_pretrained("./fine-tuned-model")
     print("Model and tokenizer saved successfully!")
 
@@ -11,7 +11,11 @@ from transformers import (
     Trainer,
     TrainingArguments,
 )
-from preprocess import preprocess_dataset
+from preprocess import (
+    dynamic_padding_collator,
+    length_grouping_args,
+    preprocess_dataset,
+)
 from sklearn.metrics import (
     accuracy_score,
     precision_recall_fscore_support,
@@ -461,6 +465,7 @@ def train_model():
 
     # Load preprocessed dataset
     tokenized_datasets = preprocess_dataset()
+    tokenizer = AutoTokenizer.from_pretrained("indobert-base-p2")
 
     # Plot dataset statistics
     plot_label_distribution(tokenized_datasets, run_dir)
@@ -495,6 +500,8 @@ def train_model():
         dataloader_num_workers=4,
         max_grad_norm=1.0,
         gradient_checkpointing=True,
+        # Batch queries of similar length; the collator pads to the longest
+        **length_grouping_args(),
     )
 
     # Create metrics callback
@@ -506,6 +513,7 @@ def train_model():
         args=training_args,
         train_dataset=tokenized_datasets["train"],
         eval_dataset=tokenized_datasets["test"],
+        data_collator=dynamic_padding_collator(tokenizer),
         compute_metrics=compute_metrics,
         callbacks=[metrics_callback],
     )
@@ -542,7 +550,6 @@ def train_model():
     os.makedirs(model_dir, exist_ok=True)
     print(f"\nSaving model to {model_dir}...")
     model.save_pretrained(model_dir)
-    tokenizer = AutoTokenizer.from_pretrained("indobert-base-p2")
     tokenizer.save_pretrained(model_dir)
     print("Model and tokenizer saved successfully!")
 